@@ -1,10 +1,14 @@
 # ab_sim/app/build.py
+import weakref
 from collections.abc import Mapping
 from dataclasses import dataclass
 
 from ab_sim.app.controllers.demand import DemandHandler
+from ab_sim.app.controllers.dispatch import DispatchHandler
 from ab_sim.app.controllers.fleet import FleetHandler
 from ab_sim.app.controllers.idle import IdleHandler
+from ab_sim.app.controllers.pooling import PoolingHandler
+from ab_sim.app.controllers.rider_arrivals import RiderArrivalController
 from ab_sim.app.controllers.trips import TripHandler
 from ab_sim.app.events import EndOfDay
 from ab_sim.app.wiring import wire
@@ -16,14 +20,23 @@ from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
 from ab_sim.domain.state import WorldState
 from ab_sim.io.kernel_logging import KernelLogging  # JSON logs
 from ab_sim.io.recorder import JsonlSink, Recorder
+from ab_sim.policy.pooling import PoolingInsertionPolicy
 from ab_sim.runtime.policy_factory import (
+    make_dispatch_policy,
     make_dwell_policy,
     make_idle_policy,
     make_matching_policy,
     make_pricing_policy,
+    make_rebalancing_policy,
 )
-from ab_sim.runtime.services_factory import make_travel_time
+from ab_sim.runtime.services_factory import (
+    make_demand_forecast,
+    make_rider_arrivals,
+    make_travel_time,
+)
+from ab_sim.services.demand_forecast import DemandForecaster
 from ab_sim.services.travel_time import TravelTimeService
+from ab_sim.services.zone_counters import ZoneCounters
 from ab_sim.sim.clock import DAY, SimClock
 from ab_sim.sim.hooks import NoopHooks
 from ab_sim.sim.kernel import Kernel
@@ -41,15 +54,40 @@ class App:
     demand: DemandHandler
     mechanics: Mechanics
     fleet: FleetHandler
+    arrivals: RiderArrivalController | None = None
+    counters: ZoneCounters | None = None
+    forecast: DemandForecaster | None = None
+
+    def close(self) -> None:
+        """Stop background work (route prefetch threads); also runs when the App is collected."""
+        self.mechanics.close()
+
+    def __enter__(self):
+        return self
 
+    def __exit__(self, *exc):
+        self.close()
 
-def build(cfg: ScenarioModel | Mapping, *, worker: int = 0, use_logging: bool = True) -> App:
+
+def build(
+    cfg: ScenarioModel | Mapping,
+    *,
+    worker: int = 0,
+    use_logging: bool = True,
+    graphs: Mapping | None = None,  # prebuilt/shared graphs for GraphByName refs
+) -> App:
     # 0) Validate config
     model = cfg if isinstance(cfg, ScenarioModel) else ScenarioModel.model_validate(cfg)
 
     # 1) Clock & RNG
     clock = SimClock.utc_epoch(*model.sim.epoch)  # e.g., [2024, 1, 1, 0, 0, 0]
-    rng_registry = RNGRegistry(model.sim.seed, scenario=model.name, worker=worker)
+    rng_registry = RNGRegistry(
+        model.sim.seed,
+        scenario=model.name,
+        worker=worker,
+        common=model.sim.common_random_numbers,
+        antithetic=model.sim.antithetic,
+    )
 
     # 2) Kernel (with hooks)
 
@@ -73,18 +111,57 @@ def build(cfg: ScenarioModel | Mapping, *, worker: int = 0, use_logging: bool =
 
     # 3) World & policies
     world = WorldState(capacity=model.world.capacity, geo=model.world.geo)
-    matching_policy = make_matching_policy(model.matching, world=world)
     dwell_policy = make_dwell_policy(model.dwell, rng_registry=rng_registry)
     idle_policy = make_idle_policy(model.idle)
-    pricing_policy = make_pricing_policy(model.pricing)
 
-    mechanics = build_mechanics(model.mechanics, rng_registry=rng_registry)
+    mechanics = build_mechanics(
+        model.mechanics, rng_registry=rng_registry, graphs=graphs, clock=clock
+    )
 
     # 3.5) Services
-    travel_time: TravelTimeService = make_travel_time(model.travel_time, mechanics=mechanics)
+    travel_time: TravelTimeService = make_travel_time(
+        model.travel_time, mechanics=mechanics, clock=clock
+    )
+    matching_policy = make_matching_policy(
+        model.matching, world=world, mechanics=mechanics, clock=clock, travel_time=travel_time
+    )
+
+    forecast = None
+    if model.forecast is not None:
+        forecast = make_demand_forecast(model.forecast, mechanics=mechanics, clock=clock)
+
+    # per-zone idle / open-request counters, for the policies that read them
+    counters = None
+    if mechanics.zones is not None and (
+        model.rebalancing is not None or model.pricing.kind == "surge"
+    ):
+        counters = ZoneCounters(mechanics.zones)
+        world.idle_watchers.append(counters)
+
+    pricing_policy = make_pricing_policy(model.pricing, counters=counters)
+    rebalancer = None
+    if model.rebalancing is not None:
+        rebalancer = make_rebalancing_policy(
+            model.rebalancing, world, mechanics=mechanics, counters=counters, forecast=forecast
+        )
 
     # 4) Handlers (inject deps explicitly)
-    demand = DemandHandler(world=world, mechanics=mechanics, rng=rng_registry.stream("demand"))
+    demand = DemandHandler(
+        world=world,
+        mechanics=mechanics,
+        rng=rng_registry.stream("demand"),
+        matching=matching_policy,
+    )
+    if model.dispatch is not None:
+        dispatch_policy = make_dispatch_policy(
+            model.dispatch, world, rng_registry=rng_registry, mechanics=mechanics, clock=clock
+        )
+        if isinstance(dispatch_policy, PoolingInsertionPolicy):
+            demand.pool = PoolingHandler(
+                world, dispatch_policy, demand, mechanics=mechanics, pricing=pricing_policy
+            )
+        else:
+            demand.dispatch = DispatchHandler(world, dispatch_policy, kernel, demand)
 
     idle = IdleHandler(
         world=world,
@@ -93,6 +170,7 @@ def build(cfg: ScenarioModel | Mapping, *, worker: int = 0, use_logging: bool =
         travel_time=travel_time,
         mechanics=mechanics,
         clock=clock,
+        rebalancer=rebalancer,
     )
 
     fleet = FleetHandler(world=world, rng=rng_registry.stream("supply"), mechanics=mechanics)
@@ -108,15 +186,55 @@ def build(cfg: ScenarioModel | Mapping, *, worker: int = 0, use_logging: bool =
         mechanics=mechanics,
     )
 
+    arrivals = (
+        make_rider_arrivals(
+            model.demand, clock=clock, rng=rng_registry.stream("arrivals"), mechanics=mechanics
+        )
+        if model.demand
+        else None
+    )
+
     # 5) Wiring
 
-    wire(kernel, trips=trips, idle=idle, demand=demand, fleet=fleet)
+    wire(
+        kernel,
+        trips=trips,
+        idle=idle,
+        demand=demand,
+        fleet=fleet,
+        arrivals=arrivals,
+        counters=counters,
+        forecast=forecast,
+    )
 
     # 6) Seed housekeeping timers (e.g., end-of-day rollup)
     t0 = 0.0
     kernel.schedule(EndOfDay(t=t0 + DAY, day_index=0, task_id=0))
-
-    # 7) (Optional) seed demand arrivals here, or in a DemandSeeder that pushes RiderArrival events
-    # DemandSeeder(clock, rng, inputs).seed(kernel, start=t0, end=cfg.sim.duration)
-
-    return App(kernel, clock, rng_registry, world, trips, idle, demand, mechanics, fleet)
+    for ev in demand.seed_batch(t0, float(model.sim.duration)):
+        kernel.schedule(ev)
+    for ev in idle.seed_rebalance(t0, float(model.sim.duration)):
+        kernel.schedule(ev)
+    for ev in trips.seed_pricing(t0, float(model.sim.duration)):
+        kernel.schedule(ev)
+
+    # 7) Seed demand arrivals (one pending event; the controller feeds the rest lazily)
+    if arrivals:
+        for ev in arrivals.seed(t0, float(model.sim.duration)):
+            kernel.schedule(ev)
+
+    app = App(
+        kernel,
+        clock,
+        rng_registry,
+        world,
+        trips,
+        idle,
+        demand,
+        mechanics,
+        fleet,
+        arrivals,
+        counters,
+        forecast,
+    )
+    weakref.finalize(app, mechanics.close)
+    return app
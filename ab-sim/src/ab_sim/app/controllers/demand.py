@@ -2,6 +2,7 @@
 from collections import deque
 
 from ab_sim.app.events import (
+    BatchMatchTick,
     RiderArrivePickup,
     RiderCancel,
     RiderRequestPlaced,
@@ -9,22 +10,30 @@ from ab_sim.app.events import (
     RiderTimeout,
     TripAssigned,
 )
+from ab_sim.app.protocols import BatchMatchingPolicy
 from ab_sim.domain.state import Rider, TripState, WorldState
 
 
 class DemandHandler:
-    def __init__(self, world: WorldState, rng, mechanics):
+    def __init__(self, world: WorldState, rng, mechanics, matching=None):
         self.world = world
         self.rng = rng
         self.mechanics = mechanics
         self.queue = deque()  # rider_ids in FIFO (replace with spatial/priority later)
+        self.matching = matching
+        # batch matching: riders wait for the next BatchMatchTick instead of the first
+        # idle driver; riders promised to a still-busy driver wait in `reserved`
+        self.batch = matching if isinstance(matching, BatchMatchingPolicy) else None
+        self.batch_until = float("inf")
+        self.reserved: dict[int, int] = {}  # driver_id -> rider_id
+        self.dispatch = None  # DispatchHandler: trips are offered instead of assigned
+        self.pool = None  # PoolingHandler: trips are inserted into shared vehicle schedules
 
-    #! TODO replace with actual sampler
     def sample_request(self, now_s, dow, hour):
-        o = self.mechanics.space.sample_origin(self.rng)
-        d = self.mechanics.space.sample_destination(self.rng)
-        o_snap, walk_seg = self.mechanics.space.snap(o, kind="rider")
-        d_snap, _ = self.mechanics.space.snap(d, kind="rider")
+        o = self.mechanics.od_sampler.sample_origin(self.rng)
+        d = self.mechanics.od_sampler.sample_destination(self.rng)
+        o_snap, walk_seg = self.mechanics.snap(o, kind="rider")
+        d_snap, _ = self.mechanics.snap(d, kind="rider")
         # return an object your event uses; include walk_seg if you log walk-to-pickup
         return o_snap, d_snap, walk_seg
 
@@ -33,7 +42,7 @@ class DemandHandler:
         self.world.riders[r.id] = r
         # Create trip record (no driver yet)
         self.world.trips[r.id] = TripState(
-            rider_id=r.id, driver_id=-1, origin=r.pickup, dest=r.dropoff
+            rider_id=r.id, driver_id=-1, origin=r.pickup, dest=r.dropoff, requested_t=ev.t
         )
         out: list[object] = []
         # Model walking (or instantaneous presence)
@@ -43,20 +52,31 @@ class DemandHandler:
             self.world.trips[r.id].rider_at_pickup_t = ev.t
 
         # Try to match immediately
-        d = self.world.get_idle_driver()
+        direct = self.batch is None and self.dispatch is None and self.pool is None
+        d = self._select(self.world.trips[r.id], ev.t) if direct else None
         if d:
-            d.task_id += 1
-            self.world.trips[r.id].driver_id = d.id
-            out.append(TripAssigned(t=ev.t, driver_id=d.id, rider_id=r.id, task_id=d.task_id))
+            out += self.assign(ev.t, d, r.id)
+        elif self.pool is not None:
+            pooled = self.pool.request(ev.t, r.id)
+            if pooled is None:
+                self.queue.append(r.id)
+            out += pooled or []
+            out.append(RiderTimeout(t=ev.t + r.max_wait_s, rider_id=r.id))
         else:
-            self.queue.append(r.id)
+            offers = self.dispatch.offer(ev.t, r.id) if self.dispatch is not None else []
+            if not offers:
+                self.queue.append(r.id)
+            out += offers
             out.append(RiderTimeout(t=ev.t + r.max_wait_s, rider_id=r.id))
         return out
 
     def on_rider_timeout(self, ev: RiderTimeout):
-        # If still queued and not boarded → cancel request
-        if ev.rider_id in self.queue:
+        # If still queued (or promised to a busy driver) and not boarded → cancel request
+        queued = ev.rider_id in self.queue
+        if queued:
             self.queue.remove(ev.rider_id)
+        offered = self.dispatch is not None and self.dispatch.withdraw(ev.rider_id)
+        if queued or offered or self._unreserve(ev.rider_id):
             # drop trip state; rider not served
             self.world.trips.pop(ev.rider_id, None)
             self.world.riders.pop(ev.rider_id, None)
@@ -69,6 +89,12 @@ class DemandHandler:
                 self.queue.remove(ev.rider_id)
             except ValueError:
                 pass
+        self._unreserve(ev.rider_id)
+        if self.dispatch is not None:
+            self.dispatch.withdraw(ev.rider_id)
+        trip = self.world.trips.get(ev.rider_id)
+        if trip is not None and trip.boarded:
+            return []  # too late to cancel (e.g. a pickup deadline firing mid-ride)
         self.world.trips.pop(ev.rider_id, None)
         self.world.riders.pop(ev.rider_id, None)
         return []
@@ -79,17 +105,81 @@ class DemandHandler:
             self.queue.appendleft(ev.rider_id)
         return []
 
-    def try_match_from_queue(self, now: float) -> list[object]:
+    def try_match_from_queue(self, now: float, driver_id: int | None = None) -> list[object]:
         """Call this when a driver becomes idle to match the oldest queued rider."""
         out: list[object] = []
-        if not self.queue:
+        if self.batch is not None:
+            # batch mode: only a rider promised to this driver is served right away
+            rid = self.reserved.pop(driver_id, None)
+            if rid is None or rid not in self.world.trips:
+                return out
+            return self.assign(now, self.world.take_idle(driver_id), rid)
+        if self.pool is not None:
+            # a vehicle with riders aboard may still fit the oldest queued rider in
+            for rid in self.queue:
+                pooled = self.pool.request(now, rid)
+                if pooled is not None:
+                    self.queue.remove(rid)
+                    return pooled
+            return out
+        if not self.world.idle_driver_ids:
             return out
-        d = self.world.get_idle_driver()
-        if not d:
+        if self.dispatch is not None:
+            # offer the oldest queued rider some driver has not passed on yet
+            for rid in self.queue:
+                offers = self.dispatch.offer(now, rid)
+                if offers:
+                    self.queue.remove(rid)
+                    return offers
             return out
-        rid = self.queue.popleft()
+        # oldest queued rider some idle driver can serve (any rider, for nearest_assign)
+        for rid in self.queue:
+            d = self._select(self.world.trips[rid], now)
+            if d:
+                self.queue.remove(rid)
+                return self.assign(now, d, rid)
+        return out
+
+    def _select(self, trip: TripState, now: float):
+        """Idle driver for this trip, taken out of the idle pool (None: nobody suitable)."""
+        if self.matching is None:
+            return self.world.get_idle_driver()
+        return self.matching.select_driver(trip, now)
+
+    def assign(self, now: float, d, rid: int) -> list[object]:
         trip = self.world.trips[rid]
         trip.driver_id = d.id
         d.task_id += 1
-        out.append(TripAssigned(t=now, driver_id=d.id, rider_id=rid, task_id=d.task_id))
+        self.mechanics.prefetch(d.loc, trip.origin)
+        return [TripAssigned(t=now, driver_id=d.id, rider_id=rid, task_id=d.task_id)]
+
+    def _unreserve(self, rider_id: int) -> bool:
+        for did, rid in self.reserved.items():
+            if rid == rider_id:
+                del self.reserved[did]
+                return True
+        return False
+
+    # ---------- batch matching ----------
+
+    def seed_batch(self, t0: float, t_end: float) -> list[object]:
+        """First BatchMatchTick; ticks repeat every interval_s up to t_end."""
+        if self.batch is None:
+            return []
+        self.batch_until = t_end
+        return [BatchMatchTick(t=t0 + self.batch.interval_s)]
+
+    def on_batch_match_tick(self, ev: BatchMatchTick):
+        out: list[object] = []
+        if self.queue:
+            pairs = self.batch.assign(self.queue, ev.t, exclude=self.reserved)
+            matched = {rid for rid, _ in pairs}
+            self.queue = deque(rid for rid in self.queue if rid not in matched)
+            for rid, did in pairs:
+                if did in self.world.idle_driver_ids:
+                    out += self.assign(ev.t, self.world.take_idle(did), rid)
+                else:  # finishing a dropoff: picks this rider up once idle
+                    self.reserved[did] = rid
+        if ev.t + self.batch.interval_s <= self.batch_until:
+            out.append(BatchMatchTick(t=ev.t + self.batch.interval_s))
         return out
@@ -0,0 +1,96 @@
+# ab_sim/app/controllers/dispatch.py
+from dataclasses import dataclass
+
+from ab_sim.app.events import OfferAccepted, OfferExpired
+from ab_sim.app.protocols import DispatchPolicy
+from ab_sim.domain.state import WorldState
+from ab_sim.sim.kernel import Kernel
+
+
+@dataclass
+class _Pending:
+    offer_id: int
+    expire: OfferExpired
+    accept: OfferAccepted | None = None
+    driver_id: int | None = None  # the winner, held out of the idle pool until it answers
+
+
+class DispatchHandler:
+    """
+    Offer-based matching: a rider's trip is offered to drivers chosen by the dispatch
+    policy instead of being assigned outright. The driver who will accept first is held
+    out of the idle pool while it answers; everyone else keeps circulating. The round's
+    expiry and acceptance are kernel events that get cancelled once they are moot (the
+    offer was taken, the rider left), so dead offers leave nothing in the queue.
+    Riders nobody accepts are offered again to drivers who have not declined them yet,
+    or wait in the demand queue for the next available driver.
+    """
+
+    def __init__(self, world: WorldState, policy: DispatchPolicy, kernel: Kernel, demand):
+        self.world, self.policy, self.kernel, self.demand = world, policy, kernel, demand
+        self.pending: dict[int, _Pending] = {}  # rider_id -> open offer round
+        self.declined: dict[int, set[int]] = {}  # rider_id -> drivers that passed on it
+        self._next_offer = 0
+
+    def offer(self, now: float, rider_id: int) -> list[object]:
+        """Start an offer round; [] when no driver is in reach (the rider stays queued)."""
+        trip = self.world.trips.get(rider_id)
+        if trip is None or rider_id in self.pending:
+            return []
+        rnd = self.policy.offer(trip, now, exclude=self.declined.get(rider_id, ()))
+        if rnd is None:
+            return []
+        self._next_offer += 1
+        oid = self._next_offer
+        expire = OfferExpired(t=now + self.policy.timeout_s, rider_id=rider_id, offer_id=oid)
+        p = _Pending(oid, expire)
+        self.pending[rider_id] = p
+        self.declined.setdefault(rider_id, set()).update(
+            did for did in rnd.driver_ids if did != rnd.winner
+        )
+        if rnd.winner is None:
+            return [expire]
+        d = self.world.take_idle(rnd.winner)
+        if d.motion is not None:  # stop a reposition leg while it answers
+            d.loc = d.pos_at(now)
+            d.clear_motion()
+            d.task_id += 1  # its pending arrival is void
+            d.state = "idle"
+        p.driver_id = rnd.winner
+        p.accept = OfferAccepted(
+            t=now + rnd.accept_s, rider_id=rider_id, driver_id=rnd.winner, offer_id=oid
+        )
+        return [p.accept, expire]
+
+    def withdraw(self, rider_id: int) -> bool:
+        """The rider left: cancel its open round and free the held driver (True if any)."""
+        self.declined.pop(rider_id, None)
+        p = self.pending.pop(rider_id, None)
+        if p is None:
+            return False
+        self.kernel.cancel(p.expire)
+        if p.accept is not None:
+            self.kernel.cancel(p.accept)
+            self.world.return_idle(self.world.drivers[p.driver_id])
+        return True
+
+    # ---------- kernel handlers ----------
+
+    def on_offer_accepted(self, ev: OfferAccepted):
+        p = self.pending.get(ev.rider_id)
+        if p is None or p.offer_id != ev.offer_id:
+            return []
+        del self.pending[ev.rider_id]
+        self.kernel.cancel(p.expire)
+        self.declined.pop(ev.rider_id, None)
+        return self.demand.assign(ev.t, self.world.drivers[ev.driver_id], ev.rider_id)
+
+    def on_offer_expired(self, ev: OfferExpired):
+        p = self.pending.get(ev.rider_id)
+        if p is None or p.offer_id != ev.offer_id:
+            return []
+        del self.pending[ev.rider_id]
+        out = self.offer(ev.t, ev.rider_id)
+        if not out:
+            self.demand.queue.append(ev.rider_id)
+        return out
@@ -14,8 +14,7 @@ class FleetHandler:
         self.world.add_driver(Driver(id=ev.driver_id, loc=ev.loc))
         return [DriverAvailable(t=ev.t, driver_id=ev.driver_id)]
 
-    #! todo update
     def spawn_driver_location(self):
-        p = self.mechanics.space.sample_origin(self.rng)
-        p_snap, _ = self.mechanics.space.snap(p, kind="vehicle")
+        p = self.mechanics.od_sampler.sample_origin(self.rng)
+        p_snap, _ = self.mechanics.snap(p, kind="vehicle")
         return p_snap
@@ -1,6 +1,6 @@
 # ab_sim/app/controllers/idle.py
 from ab_sim.app.controllers.demand import DemandHandler
-from ab_sim.app.events import DriverAvailable, DriverLegArrive
+from ab_sim.app.events import DriverAvailable, DriverLegArrive, RebalanceTick
 from ab_sim.domain.entities.geography import Point
 from ab_sim.domain.mechanics.mechanics_core import Mechanics
 from ab_sim.domain.state import WorldState
@@ -18,6 +18,7 @@ class IdleHandler:
         mechanics: Mechanics,
         clock: SimClock,
         travel_time: TravelTimeService | None = None,
+        rebalancer=None,
     ):
         self.world = world
         self.idle = idle
@@ -25,19 +26,41 @@ class IdleHandler:
         self.mechanics = mechanics
         self.travel_time = travel_time
         self.clock = clock
+        self.rebalancer = rebalancer  # e.g. ZoneRebalancingPolicy, run on RebalanceTick
+        self.rebalance_until = float("inf")
 
     def on_trip_completed(self, ev):
         # driver has already been returned to idle by TripHandler
         # try to match queued demand immediately
-        return self.demand.try_match_from_queue(now=ev.t)
+        return self.demand.try_match_from_queue(now=ev.t, driver_id=ev.driver_id)
 
     def on_driver_available(self, ev: DriverAvailable):
         # driver just became idle now → try to serve the queue
-        return self.demand.try_match_from_queue(now=ev.t)
+        return self.demand.try_match_from_queue(now=ev.t, driver_id=ev.driver_id)
 
     def on_idle_timeout(self, ev):
         return []
 
+    # ---------- rebalancing ----------
+
+    def seed_rebalance(self, t0: float, t_end: float) -> list[object]:
+        """First RebalanceTick; ticks repeat every interval_s up to t_end."""
+        if self.rebalancer is None:
+            return []
+        self.rebalance_until = t_end
+        return [RebalanceTick(t=t0 + self.rebalancer.interval_s)]
+
+    def on_rebalance_tick(self, ev: RebalanceTick):
+        out: list[object] = []
+        counters = self.rebalancer.counters
+        for did, target in self.rebalancer.plan(ev.t):
+            out += self.maybe_reposition(ev.t, did, target)
+            if self.world.drivers[did].state == "to_reposition":
+                counters.add(did, target)  # counted where it is headed; idle_grid keeps the origin
+        if ev.t + self.rebalancer.interval_s <= self.rebalance_until:
+            out.append(RebalanceTick(t=ev.t + self.rebalancer.interval_s))
+        return out
+
     def maybe_reposition(self, now: float, driver_id: int, target: Point):
         """
         Start (or replace) a reposition leg using the mechanics plan.
@@ -52,7 +75,7 @@ class IdleHandler:
             d.task_id += 1
 
         # Try snapping to target
-        snapped_target, _ = self.mechanics.od_sampler.snap(target, kind="vehicle")
+        snapped_target, _ = self.mechanics.snap(target, kind="vehicle")
 
         # build plan
         plan = self.mechanics.move_plan(d.loc, snapped_target, now, **self.clock.dow_hour_at(now))
@@ -61,6 +84,7 @@ class IdleHandler:
             d.loc = snapped_target
             d.clear_motion()
             d.state = "idle"
+            self.world.relocate_idle(d)
             return []
 
         d.state = "to_reposition"
@@ -0,0 +1,137 @@
+# ab_sim/app/controllers/pooling.py
+from ab_sim.app.events import (
+    DriverAvailable,
+    PoolStopArrive,
+    RiderArrivePickup,
+    TripBoarded,
+    TripCompleted,
+)
+from ab_sim.domain.state import WorldState
+from ab_sim.policy.pooling import PoolingInsertionPolicy
+
+
+class PoolingHandler:
+    """
+    Drives pooled vehicles through the stop sequences a PoolingInsertionPolicy plans.
+
+    Every driver joins the policy when its shift starts. A request is inserted into the
+    best vehicle's schedule or, if nobody can take it, waits in the demand queue and is
+    retried whenever a vehicle serves a stop. Each vehicle has one pending
+    PoolStopArrive, for the head of its schedule at the planned arrival time; it is
+    re-issued under a new task_id only when an insertion changes that head (the policy
+    never inserts ahead of a leg already being driven). A vehicle reaching a rider who
+    is still walking waits there for RiderArrivePickup: pickups are planned no sooner
+    than the rider's expected arrival, and a vehicle that waits anyway has its schedule
+    held at the pickup, so insertions never see a stale arrival time. Vehicles jump
+    from stop to stop (Driver.loc is the last stop served); one with no stops left is
+    back in the idle pool.
+    Fares use the direct trip distance and the surge quote taken at insertion.
+    """
+
+    def __init__(
+        self,
+        world: WorldState,
+        policy: PoolingInsertionPolicy,
+        demand,
+        *,
+        mechanics,
+        pricing=None,
+    ):
+        self.world, self.policy, self.demand = world, policy, demand
+        self.mechanics, self.pricing = mechanics, pricing
+        self.waiting: dict[int, int] = {}  # rider_id -> vehicle waiting at its pickup
+        self._head: dict[int, object] = {}  # driver_id -> stop its pending arrival is for
+
+    def request(self, now: float, rider_id: int) -> list[object] | None:
+        """Insert the rider's trip into some vehicle (None: nobody can take it now)."""
+        trip = self.world.trips.get(rider_id)
+        if trip is None:
+            return None
+        rider = self.world.riders.get(rider_id)
+        ins = self.policy.assign(
+            rider_id,
+            trip.origin,
+            trip.dest,
+            now,
+            requested_t=trip.requested_t,
+            max_wait_s=rider.max_wait_s if rider is not None else None,
+            ready_t=self._ready_t(trip, rider),
+        )
+        if ins is None:
+            return None
+        quote = getattr(self.pricing, "quote", None)
+        if quote is not None and trip.surge_multiplier is None:
+            trip.surge_multiplier = quote(trip, now)
+        return self._next_stop(now, ins.driver_id)
+
+    @staticmethod
+    def _ready_t(trip, rider) -> float | None:
+        """When the rider will be at the pickup (None: unknown)."""
+        if trip.rider_at_pickup_t is not None:
+            return trip.rider_at_pickup_t
+        if rider is None or trip.requested_t is None:
+            return None
+        return trip.requested_t + rider.walk_s
+
+    def _next_stop(self, now: float, driver_id: int) -> list[object]:
+        sched = self.policy.schedules[driver_id]
+        head = sched.stops[0] if sched.stops else None
+        if head is self._head.get(driver_id):
+            return []
+        d = self.world.drivers[driver_id]
+        d.task_id += 1  # the previous arrival (if any) is void
+        self._head[driver_id] = head
+        if head is None:
+            self.world.return_idle(d)
+            return [DriverAvailable(t=now, driver_id=driver_id)]
+        if driver_id in self.world.idle_driver_ids:
+            self.world.take_idle(driver_id)
+        d.state = "to_pickup" if head.kind == "pickup" else "to_dropoff"
+        t_arr = max(now, sched.arr[0])
+        return [PoolStopArrive(t=t_arr, driver_id=driver_id, task_id=d.task_id)]
+
+    # ---------- kernel handlers ----------
+
+    def on_driver_start_shift(self, ev):
+        d = self.world.drivers[ev.driver_id]
+        self.policy.add_vehicle(d.id, d.loc, ev.t)
+        self._head[d.id] = None
+        return []
+
+    def on_stop_arrive(self, ev: PoolStopArrive):
+        d = self.world.drivers[ev.driver_id]
+        if ev.task_id != d.task_id:
+            return []
+        head = self.policy.schedules[d.id].stops[0]
+        trip = self.world.trips.get(head.rider_id)  # None: the rider cancelled
+        if head.kind == "pickup" and trip is not None and trip.rider_at_pickup_t is None:
+            self.waiting[head.rider_id] = d.id  # rider still walking
+            ready = self._ready_t(trip, self.world.riders.get(head.rider_id))
+            self.policy.hold(d.id, max(ev.t, ready if ready is not None else ev.t))
+            return []
+
+        stop = self.policy.served(d.id, ev.t)
+        d.loc = stop.at
+        out: list[object] = []
+        if trip is not None and stop.kind == "pickup":
+            trip.driver_id = d.id
+            trip.driver_at_pickup_t = trip.boarding_started_t = ev.t
+            trip.boarded = True
+            out.append(TripBoarded(t=ev.t, rider_id=stop.rider_id, driver_id=d.id))
+        elif trip is not None:
+            if self.pricing is not None:
+                dist = self.mechanics.distance_m(trip.origin, trip.dest)
+                trip.fare = self.pricing.fare(d, trip, ev.t, distance_m=dist)
+            out.append(
+                TripCompleted(t=ev.t, rider_id=stop.rider_id, driver_id=d.id, fare=trip.fare)
+            )
+        out += self._next_stop(ev.t, d.id)
+        return out + self.demand.try_match_from_queue(ev.t)
+
+    def on_rider_arrive_pickup(self, ev: RiderArrivePickup):
+        did = self.waiting.pop(ev.rider_id, None)
+        if did is None:
+            return []
+        self.policy.hold(did, ev.t)
+        d = self.world.drivers[did]
+        return [PoolStopArrive(t=ev.t, driver_id=did, task_id=d.task_id)]
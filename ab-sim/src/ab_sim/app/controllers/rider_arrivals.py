@@ -0,0 +1,76 @@
+# ab_sim/app/controllers/rider_arrivals.py
+from ab_sim.app.events import RiderRequestPlaced
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.mechanics.mechanics_demand_generators import (
+    DayAheadDemandGenerator,
+    DemandBatch,
+)
+from ab_sim.services.snapping import SnapService
+from ab_sim.sim.clock import DAY
+
+
+class RiderArrivalController:
+    """
+    Lazy event source over day-ahead demand batches.
+    Each day is generated in one vectorized call; requests are fed to the kernel one at a
+    time (the next RiderRequestPlaced is emitted when the previous one is dispatched), so
+    the event queue holds a single pending arrival regardless of daily volume.
+    With a snapper, each day's origins/destinations are snapped in one batched query.
+    """
+
+    def __init__(
+        self,
+        generator: DayAheadDemandGenerator,
+        *,
+        first_rider_id: int = 0,
+        snapper: SnapService | None = None,
+    ):
+        self.generator = generator
+        self.snapper = snapper
+        self.next_rider_id = first_rider_id
+        self.batch: DemandBatch | None = None
+        self._i = 0
+        self._day_end = 0.0
+        self._until = 0.0
+        self._pending: RiderRequestPlaced | None = None
+
+    def seed(self, t_start: float, until: float) -> list[RiderRequestPlaced]:
+        """Start feeding arrivals in [t_start, until); returns the first event to schedule."""
+        self._day_end, self._until = t_start, until
+        self.batch, self._i = None, 0
+        ev = self._next_event()
+        return [ev] if ev else []
+
+    def _next_event(self) -> RiderRequestPlaced | None:
+        while self.batch is None or self._i >= len(self.batch):
+            if self._day_end >= self._until:
+                self._pending = None
+                return None
+            t0, t1 = self._day_end, min(self._day_end + DAY, self._until)
+            self.batch, self._i, self._day_end = self._snap(self.generator.generate(t0, t1)), 0, t1
+        b, i = self.batch, self._i
+        self._i += 1
+        rid = self.next_rider_id
+        self.next_rider_id += 1
+        self._pending = RiderRequestPlaced(
+            t=float(b.t[i]),
+            rider_id=rid,
+            pickup=Point(float(b.origin[i, 0]), float(b.origin[i, 1])),
+            dropoff=Point(float(b.dest[i, 0]), float(b.dest[i, 1])),
+            max_wait_s=float(b.max_wait_s[i]),
+            walk_s=float(b.walk_s[i]),
+        )
+        return self._pending
+
+    def _snap(self, b: DemandBatch) -> DemandBatch:
+        if self.snapper is not None and len(b):
+            b.origin = self.snapper.snap_many(b.origin).xy
+            b.dest = self.snapper.snap_many(b.dest).xy
+        return b
+
+    def on_rider_request(self, ev: RiderRequestPlaced):
+        # only advance on our own arrivals; requests from other sources pass through
+        if ev is not self._pending:
+            return []
+        nxt = self._next_event()
+        return [nxt] if nxt else []
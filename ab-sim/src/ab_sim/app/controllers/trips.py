@@ -13,6 +13,7 @@ from ab_sim.app.events import (
     DriverLegArrive,
     DriverWaitTimeout,
     PickupDeadline,
+    PricingTick,
     RiderArrivePickup,
     RiderCancel,
     RiderRequeue,
@@ -21,7 +22,6 @@ from ab_sim.app.events import (
     TripCompleted,
 )
 from ab_sim.domain.entities.driver import Driver
-from ab_sim.domain.entities.motion import MovePlan, MoveTask
 from ab_sim.domain.mechanics.mechanics_core import Mechanics
 from ab_sim.domain.state import TripState, WorldState
 from ab_sim.policy.matching import MatchingPolicy
@@ -51,6 +51,8 @@ class TripHandler:
         self.mechanics = mechanics
         self.clock = clock
         self.rng = rng
+        self.pricing = pricing
+        self.pricing_until = float("inf")
         self.max_driver_wait_s = max_driver_wait_s
         self.dwell = dwell
         self._rider_cancel_emitted: set[int] = set()  # rider_id → cancel already emitted
@@ -81,9 +83,17 @@ class TripHandler:
     def estimate_trip_eta(self, driver: Driver, trip: TripState, now_s: float, *_):
         return self.travel_time.duration_to_dropoff(driver, trip, now_s)
 
-    def path_for_pricing(self, pickup, dropoff):
-        path = self.mechanics.route(pickup, dropoff)
-        return path.total_length_m, path
+    def fare_distance_m(self, trip: TripState) -> float:
+        # reuse the dropoff leg's route; only route again if the trip never departed
+        if trip.route_length_m is not None:
+            return trip.route_length_m
+        return self.mechanics.distance_m(trip.origin, trip.dest)
+
+    def _start_leg(self, d: Driver, dest, now: float, leg: str) -> float:
+        """Plan one leg (single route + traversal), set it as the driver's motion, return t_arr."""
+        plan = self.travel_time.leg_plan(d.loc, dest, now, leg=leg, **self.clock.dow_hour_at(now))
+        d.motion = plan
+        return max(now, plan.end_t)
 
     # ------------ causal event handlers --------------
 
@@ -137,21 +147,19 @@ class TripHandler:
         trip.driver_id = d.id
 
         self.world.active_task[(d.id, d.task_id)] = trip.rider_id
+        quote = getattr(self.pricing, "quote", None)
+        if quote is not None and trip.surge_multiplier is None:
+            trip.surge_multiplier = quote(trip, ev.t)
 
         with suppress(Exception):
             self.world.idle.discard(d.id)
 
         d.state = "to_pickup"
 
-        dt = float(self.travel_time.duration_to_pickup(d, trip, ev.t))
-        t_arr = ev.t + max(0.0, dt)
-
-        d.motion = MovePlan(
-            tasks=[MoveTask(start=d.loc, end=trip.origin, start_t=ev.t, end_t=t_arr)],
-            total_length_m=((trip.origin.x - d.loc.x) ** 2 + (trip.origin.y - d.loc.y) ** 2) ** 0.5,
-            start_t=ev.t,
-            end_t=t_arr,
-        )
+        t_arr = self._start_leg(d, trip.origin, ev.t, "pickup")
+        if self.mechanics is not None:
+            # the dropoff leg starts where this plan ends (the snapped pickup), not at origin
+            self.mechanics.prefetch(d.motion.tasks[-1].end, trip.dest)
 
         return [
             DriverLegArrive(
@@ -217,7 +225,7 @@ class TripHandler:
             return []
         trip.rider_at_pickup_t = ev.t
         d = self.world.drivers.get(trip.driver_id)
-        if d.state == "wait" and not trip.boarded:
+        if d is not None and d.state == "wait" and not trip.boarded:
             return self._schedule_boarding(ev.t, trip, d)
         return []
 
@@ -274,15 +282,8 @@ class TripHandler:
 
         d.state = "to_dropoff"
 
-        dur = float(self.travel_time.duration_to_dropoff(d, trip, now))
-        t_arr = now + max(0.0, dur)
-
-        d.motion = MovePlan(
-            tasks=[MoveTask(start=d.loc, end=trip.dest, start_t=now, end_t=t_arr)],
-            total_length_m=((trip.dest.x - d.loc.x) ** 2 + (trip.dest.y - d.loc.y) ** 2) ** 0.5,
-            start_t=now,
-            end_t=t_arr,
-        )
+        t_arr = self._start_leg(d, trip.dest, now, "dropoff")
+        trip.route_length_m = d.motion.total_length_m
 
         return [
             TripBoarded(t=now, rider_id=trip.rider_id, driver_id=d.id),
@@ -298,15 +299,8 @@ class TripHandler:
 
         d.state = "to_dropoff"
 
-        dur = float(self.travel_time.duration_to_dropoff(d, trip, now))
-        t_arr = now + max(0.0, dur)
-
-        d.motion = MovePlan(
-            tasks=[MoveTask(start=d.loc, end=trip.dest, start_t=now, end_t=t_arr)],
-            total_length_m=((trip.dest.x - d.loc.x) ** 2 + (trip.dest.y - d.loc.y) ** 2) ** 0.5,
-            start_t=now,
-            end_t=t_arr,
-        )
+        t_arr = self._start_leg(d, trip.dest, now, "dropoff")
+        trip.route_length_m = d.motion.total_length_m
 
         return [
             TripBoarded(t=now, rider_id=trip.rider_id, driver_id=d.id),
@@ -329,7 +323,25 @@ class TripHandler:
         if ev.task_id != d.task_id:
             return []
         trip = self.world.trips.get(ev.rider_id)
+        if self.pricing is not None:
+            trip.fare = self.pricing.fare(d, trip, ev.t, distance_m=self.fare_distance_m(trip))
         # finalize & free driver
         d.state = "idle"
         self.world.return_idle(d)
-        return [TripCompleted(t=ev.t, rider_id=trip.rider_id, driver_id=d.id)]
+        return [TripCompleted(t=ev.t, rider_id=trip.rider_id, driver_id=d.id, fare=trip.fare)]
+
+    # ------------ dynamic pricing --------------
+
+    def seed_pricing(self, t0: float, t_end: float) -> list[object]:
+        """First PricingTick for policies with an update(now) timer (e.g. surge)."""
+        interval_s = getattr(self.pricing, "interval_s", None)
+        if interval_s is None:
+            return []
+        self.pricing_until = t_end
+        return [PricingTick(t=t0 + interval_s)]
+
+    def on_pricing_tick(self, ev: PricingTick):
+        self.pricing.update(ev.t)
+        if ev.t + self.pricing.interval_s <= self.pricing_until:
+            return [PricingTick(t=ev.t + self.pricing.interval_s)]
+        return []
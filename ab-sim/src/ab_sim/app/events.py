@@ -87,6 +87,7 @@ class TripBoarded(BaseEvent):
 class TripCompleted(BaseEvent):
     rider_id: int
     driver_id: int
+    fare: float | None = None
 
 
 @dataclass(order=True)
@@ -132,6 +133,40 @@ class DriverStartShift(BaseEvent):
     loc: Point
 
 
+@dataclass(order=True)
+class BatchMatchTick(BaseEvent):
+    pass
+
+
+@dataclass(order=True)
+class OfferAccepted(BaseEvent):
+    rider_id: int
+    driver_id: int
+    offer_id: int
+
+
+@dataclass(order=True)
+class OfferExpired(BaseEvent):
+    rider_id: int
+    offer_id: int
+
+
+@dataclass(order=True)
+class PoolStopArrive(BaseEvent):
+    driver_id: int
+    task_id: int  # a newer task_id: the vehicle's next stop changed since
+
+
+@dataclass(order=True)
+class RebalanceTick(BaseEvent):
+    pass
+
+
+@dataclass(order=True)
+class PricingTick(BaseEvent):
+    pass
+
+
 # logging
 @dataclass(order=True)
 class EndOfDay(BaseEvent):
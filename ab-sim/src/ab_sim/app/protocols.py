@@ -1,6 +1,8 @@
 from collections.abc import Iterable
 from typing import Protocol, runtime_checkable
 
+import numpy as np
+
 from ab_sim.domain.entities.geography import Path, Point, Segment
 
 
@@ -33,7 +35,9 @@ class RoutePlanner(Protocol):
       • Compute network distance between points.
     """
 
-    def route(self, a: Point, b: Point) -> Path: ...
+    def route(self, a: Point, b: Point, t0: float | None = None) -> Path:
+        """Path a -> b; time-dependent planners use departure time t0 (sim seconds)."""
+
     def distance_m(self, a: Point, b: Point) -> float: ...
 
 
@@ -54,6 +58,25 @@ class SpeedSampler(Protocol):
         hour: int | None = None,
     ) -> float: ...
 
+    def speeds_mps(
+        self,
+        t_s: float,
+        edge_ids: np.ndarray,
+        *,
+        dow: int | None = None,
+        hour: int | None = None,
+    ) -> np.ndarray:
+        """Vectorized speed_mps over an int edge-id array (-1 => off-network).
+        Default loops over speed_mps; samplers on hot paths override it."""
+        return np.fromiter(
+            (
+                self.speed_mps(t_s, edge_id=None if e < 0 else int(e), dow=dow, hour=hour)
+                for e in edge_ids
+            ),
+            dtype=float,
+            count=len(edge_ids),
+        )
+
 
 @runtime_checkable
 class PathTraverser(Protocol):
@@ -90,6 +113,12 @@ class TravelTimeService(Protocol):
     def duration_to_pickup(self, driver, trip, now: float) -> float: ...
     def duration_to_dropoff(self, driver, trip, now: float) -> float: ...
     def duration_reposition(self, driver, now: float) -> float: ...
+    def leg_plan(self, a: Point, b: Point, now: float, *, leg: str, **time_kw):
+        """
+        Motion plan for one leg (MovePlan-like: end_t, total_length_m, pos(t), >= 1 task).
+        leg is "pickup" | "dropoff" | "reposition": fixed-duration services time the leg by it,
+        routed ones reject anything else.
+        """
 
 
 @runtime_checkable
@@ -113,24 +142,44 @@ class Mechanics(Protocol):
         dow: int | None = None,
         hour: int | None = None,
     ) -> float:
-        path = self.route_planner.route(a, b)
+        path = self.route_planner.route(a, b, t0_s)
         return self.path_traverser.travel_time_s(path, t0_s, self.speed_sampler, dow=dow, hour=hour)
 
     def distance_m(self, a: Point, b: Point) -> float:
         return self.route_planner.distance_m(a, b)
 
+    def snap(self, p: Point, kind: str = "vehicle") -> tuple[Point, Segment | None]:
+        return self.od_sampler.snap(p, kind=kind)
+
+    def prefetch(self, a: Point, b: Point, t0: float | None = None) -> None:
+        """Hint that route(a, b, t0) will be asked for soon (no-op without a prefetcher)."""
+
+    def close(self) -> None:
+        """Release background resources such as the prefetch thread pool."""
+
 
 # --------------- Policies -------------------------
 
 
 @runtime_checkable
 class PricingPolicy(Protocol):
-    def fare(self, driver, trip, now) -> float: ...
+    def fare(self, driver, trip, now, distance_m: float | None = None) -> float: ...
 
 
 @runtime_checkable
 class MatchingPolicy(Protocol):
-    pass
+    def select_driver(self, trip, now: float):
+        """Driver for this trip, taken out of the idle pool; None leaves the rider queued."""
+        return None
+
+
+@runtime_checkable
+class BatchMatchingPolicy(Protocol):
+    """Matches the rider queue every interval_s instead of one rider at a time."""
+
+    interval_s: float
+
+    def assign(self, rider_ids, now: float, exclude=()) -> list[tuple[int, int]]: ...
 
 
 @runtime_checkable
@@ -145,7 +194,11 @@ class DwellPolicy(Protocol):
 
 @runtime_checkable
 class DispatchPolicy(Protocol):
-    pass
+    """Which drivers are offered a trip, and who (if anyone) accepts it and when."""
+
+    timeout_s: float
+
+    def offer(self, trip, now: float, exclude=()): ...
 
 
 @runtime_checkable
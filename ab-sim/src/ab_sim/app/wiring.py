@@ -2,10 +2,12 @@
 from ab_sim.app.controllers.demand import DemandHandler
 from ab_sim.app.controllers.fleet import FleetHandler
 from ab_sim.app.controllers.idle import IdleHandler
+from ab_sim.app.controllers.rider_arrivals import RiderArrivalController
 from ab_sim.app.controllers.trips import TripHandler
 from ab_sim.app.events import (
     AlightingComplete,
     AlightingStarted,
+    BatchMatchTick,
     BoardingComplete,
     BoardingStarted,
     DriverAvailable,
@@ -15,7 +17,12 @@ from ab_sim.app.events import (
     DriverStartShift,
     DriverWaitTimeout,
     EndOfDay,
+    OfferAccepted,
+    OfferExpired,
     PickupDeadline,
+    PoolStopArrive,
+    PricingTick,
+    RebalanceTick,
     RiderArrivePickup,
     RiderCancel,
     RiderRequestPlaced,
@@ -35,6 +42,9 @@ def wire(
     idle: IdleHandler,
     housekeeping=None,
     fleet: FleetHandler,
+    arrivals: RiderArrivalController | None = None,
+    counters=None,
+    forecast=None,
 ) -> None:
     k = kernel
 
@@ -53,15 +63,27 @@ def wire(
     # demand
 
     k.on(RiderRequestPlaced, demand.on_rider_request)
+    if arrivals:
+        k.on(RiderRequestPlaced, arrivals.on_rider_request)  # lazily feeds the next arrival
     k.on(RiderTimeout, demand.on_rider_timeout)
+    if demand.batch is not None:
+        k.on(BatchMatchTick, demand.on_batch_match_tick)
+    if demand.dispatch is not None:
+        k.on(OfferAccepted, demand.dispatch.on_offer_accepted)
+        k.on(OfferExpired, demand.dispatch.on_offer_expired)
 
     if fleet:
         k.on(DriverStartShift, fleet.on_driver_start_shift)
+    if demand.pool is not None:
+        k.on(DriverStartShift, demand.pool.on_driver_start_shift)  # after the fleet adds it
+        k.on(PoolStopArrive, demand.pool.on_stop_arrive)
 
     # trips
     k.on(TripAssigned, trips.on_trip_assigned)
     k.on(DriverLegArrive, trips.on_driver_leg_arrive)
     k.on(RiderArrivePickup, trips.on_rider_arrive_pickup)
+    if demand.pool is not None:
+        k.on(RiderArrivePickup, demand.pool.on_rider_arrive_pickup)
 
     k.on(BoardingStarted, trips.on_boarding_started)
     k.on(BoardingComplete, trips.on_boarding_complete)
@@ -71,8 +93,25 @@ def wire(
     # idle → attempt to serve queue after completion
     k.on(TripCompleted, idle.on_trip_completed)
 
+    # dynamic pricing
+    if getattr(trips.pricing, "interval_s", None) is not None:
+        k.on(PricingTick, trips.on_pricing_tick)
+
     # supply housekeeping
     k.on(DriverIdleTimeout, idle.on_idle_timeout)
+    if idle.rebalancer is not None:
+        k.on(RebalanceTick, idle.on_rebalance_tick)
+
+    # per-zone open requests (idle supply is tracked through WorldState.idle_watchers)
+    if counters:
+        k.on(RiderRequestPlaced, counters.on_rider_request)
+        k.on(RiderRequeue, counters.on_rider_requeue)
+        k.on(TripAssigned, counters.on_trip_assigned)
+        k.on(RiderTimeout, counters.on_rider_timeout)
+        k.on(RiderCancel, counters.on_rider_gone)
+        k.on(TripCompleted, counters.on_rider_gone)
+    if forecast:
+        k.on(RiderRequestPlaced, forecast.on_rider_request)
 
     # daily rollups / maintenance
     if housekeeping:
@@ -10,6 +10,9 @@ class SimModel(BaseModel):
     epoch: tuple[int, int, int, int, int, int]
     seed: int
     duration: int  # seconds
+    # variance reduction (sim.rng): streams shared across scenarios / mirrored replicas
+    common_random_numbers: bool = False
+    antithetic: bool = False
 
 
 class LogModel(BaseModel):
@@ -47,6 +50,7 @@ class SpeedSamplerDistributionModel(BaseModel):
     dist: Literal["lognormal", "gamma"]
     params: dict[str, float] = Field(default_factory=dict)
     fallback_mps: float = 8.94
+    block_size: int = Field(default=4096, ge=1)  # draws pre-filled per RNG call
 
 
 class SpeedSamplerEdgeAwareModel(BaseModel):
@@ -56,6 +60,18 @@ class SpeedSamplerEdgeAwareModel(BaseModel):
     tfac: dict[str, float] = Field(default_factory=dict)  # "dow:hour" -> factor
     efac: dict[int, float] = Field(default_factory=dict)  # edge_id -> factor
 
+    @field_validator("tfac")
+    @classmethod
+    def _dow_hour_keys(cls, v: dict[str, float]) -> dict[str, float]:
+        for key in v:
+            try:
+                dow, hour = (int(x) for x in key.split(":"))
+            except ValueError:
+                raise ValueError(f"tfac keys must look like 'dow:hour', got {key!r}") from None
+            if not (0 <= dow < 7 and 0 <= hour < 24):
+                raise ValueError(f"tfac key out of range (dow 0-6, hour 0-23): {key!r}")
+        return v
+
 
 SpeedSamplerUnion = Annotated[
     SpeedSamplerGlobalModel
@@ -75,6 +91,7 @@ class ODSamplerIdealizedModel(BaseModel):
         default_factory=lambda: [(0, 0, 10_000, 10_000)]
     )
     weights: list[float] | None = None
+    block_size: int = Field(default=4096, ge=1)  # uniforms pre-drawn per RNG call
 
     @field_validator("weights", mode="before")
     @classmethod
@@ -111,14 +128,15 @@ class ODSamplerEmpiricalModel(BaseModel):
 class GraphByPath(BaseModel):
     model_config = ConfigDict(extra="forbid")
     by: Literal["path"] = "path"
-    file: str
-    fmt: Literal["pickle", "graphml", "parquet"] = "pickle"
+    file: str  # for fmt="npy", the graph directory
+    fmt: Literal["npy", "pickle", "graphml", "parquet", "csv"] = "pickle"
+    nodes: str | None = None  # node table for parquet/csv edge lists
     must_exist: bool = True
 
-    @field_validator("file")
+    @field_validator("file", "nodes")
     @classmethod
-    def _expand(cls, v: str) -> str:
-        return os.path.expandvars(os.path.expanduser(v))
+    def _expand(cls, v: str | None) -> str | None:
+        return None if v is None else os.path.expandvars(os.path.expanduser(v))
 
 
 class GraphByName(BaseModel):
@@ -156,8 +174,13 @@ class RoutePlannerManhattanModel(BaseModel):
 class RoutePlannerNetworkModel(BaseModel):
     model_config = ConfigDict(extra="forbid")
     kind: Literal["network"] = "network"
-    graph: GraphByPath
+    graph: GraphRef
     vmax_mps: float = 16.7
+    heuristic: Literal["euclidean", "alt"] = "euclidean"
+    landmarks: int = Field(8, ge=1)  # built at load time if the graph has none stored
+    # route by departure time over binned edge travel times from the speed sampler
+    time_dependent: bool = False
+    td_bin_s: float = Field(900.0, gt=0)
 
 
 RoutePlannerUnion = Annotated[
@@ -173,7 +196,66 @@ class PathTraverserPiecewiseConstModel(BaseModel):
     kind: Literal["piecewise_const"] = "piecewise_const"
 
 
-PathTraverserUnion = Annotated[PathTraverserPiecewiseConstModel, Field(discriminator="kind")]
+class PathTraverserVectorizedModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["vectorized"] = "vectorized"
+
+
+PathTraverserUnion = Annotated[
+    PathTraverserPiecewiseConstModel | PathTraverserVectorizedModel, Field(discriminator="kind")
+]
+
+# ----------------- SNAPPING ---------------------
+
+
+class SnapperModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    graph: GraphRef | None = None  # default: the network OD sampler's graph
+    index: Literal["grid", "kdtree"] = "grid"  # kdtree needs scipy
+    target: Literal["node", "edge"] = "node"
+    cell_m: float = Field(250.0, gt=0)
+    cache_quantum_m: float = Field(1.0, gt=0)
+    cache_size: int = Field(100_000, ge=0)
+
+    @model_validator(mode="after")
+    def _check(self):
+        if self.target == "edge" and self.index != "grid":
+            raise ValueError("edge snapping supports index='grid' only")
+        return self
+
+
+class RouteCacheModel(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    size: int = Field(4096, ge=1)  # routes kept (LRU, exact endpoints)
+    prefetch: bool = True  # route upcoming legs on a thread pool
+    workers: int = Field(1, ge=1)
+
+
+class IsochroneModel(BaseModel):
+    """Reachability bitsets for ETA-bounded matching (services.isochrones)."""
+
+    model_config = ConfigDict(extra="forbid")
+    path: str | None = None  # load a saved index (IsochroneIndex.save) instead of building
+    cell_m: float = Field(500.0, gt=0)
+    thresholds_s: list[float] = Field(default_factory=lambda: [300.0, 600.0, 900.0])
+    hours: list[int] = Field(default_factory=lambda: list(range(24)))  # bin start hours
+    dow: int = Field(0, ge=0, le=6)  # weekday the bins are computed for
+    bbox: tuple[float, float, float, float] | None = None  # default: graph or OD zones
+
+    @field_validator("thresholds_s")
+    def _sorted(cls, v: list[float]) -> list[float]:
+        return sorted(v)
+
+
+class ZoneIndexModel(BaseModel):
+    """Point -> zone raster (services.zones); default zones: the OD sampler's rectangles."""
+
+    model_config = ConfigDict(extra="forbid")
+    path: str | None = None  # .geojson polygons, or a saved ZoneIndex directory
+    name_property: str | None = None  # GeoJSON feature property used as the zone name
+    # inline zones: (x0, y0, x1, y1) rectangles or polygon rings [[x, y], ...]
+    zones: list[list] | None = None
+    cell_m: float = Field(100.0, gt=0)
 
 
 # ------------------ SERVICES -----------------------------
@@ -182,9 +264,14 @@ PathTraverserUnion = Annotated[PathTraverserPiecewiseConstModel, Field(discrimin
 class TravelTimeServiceMechanicsModel(BaseModel):
     model_config = ConfigDict(extra="forbid")
     kind: Literal["mechanics"] = "mechanics"
-    # Optional switches if you later add a traverser/ETA path:
+    # distance_over_speed: planner distance / one speed draw; router_eta: Mechanics.eta_s
     method: Literal["distance_over_speed", "router_eta"] = "distance_over_speed"
     min_speed_mps: float = 0.1  # clamp to avoid div by 0
+    # router_eta memo on (origin node, dest node, time bucket); exact=True disables it
+    exact: bool = False
+    memo_size: int = Field(default=65_536, ge=1)
+    bucket_s: float = Field(default=300.0, gt=0)
+    quantum_m: float = Field(default=25.0, gt=0)  # key resolution when not routing on a graph
 
 
 class TravelTimeServiceFixedModel(BaseModel):
@@ -208,6 +295,17 @@ TravelTimeUnion = Annotated[
 ]
 
 
+class DemandForecastModel(BaseModel):
+    """Per-zone recent request rates (services.demand_forecast); needs mechanics.zones."""
+
+    model_config = ConfigDict(extra="forbid")
+    tau_s: float = Field(default=900.0, gt=0)  # decay time constant of the recent rate
+    horizon_s: float = Field(default=900.0, gt=0)  # window of snapshot() expectations
+    bin_s: float = Field(default=3600.0, gt=0)  # time-of-day heatmap bins
+    profile_path: str | None = None  # DemandForecaster.save_profile directory or (Z, 24) .npy
+    recent_weight: float = Field(default=0.5, ge=0, le=1)  # with a profile
+
+
 # ------------------ POLICIES -----------------------------
 
 
@@ -216,6 +314,7 @@ class DwellPolicyExpBoardAlightModel(BaseModel):
     kind: Literal["exponential_board_alight"] = "exponential_board_alight"  # examples
     board_mean_s: float = 7.0
     alight_mean_s: float = 5.0
+    block_size: int = Field(default=4096, ge=1)  # riders per pre-drawn attribute chunk
 
 
 DwellPolicyUnion = Annotated[DwellPolicyExpBoardAlightModel, Field(discriminator="kind")]
@@ -236,7 +335,37 @@ class MatchingPolicyNearestAssignModel(BaseModel):
     kind: Literal["nearest_assign"] = "nearest_assign"  # examples
 
 
-MatchingPolicyUnion = Annotated[MatchingPolicyNearestAssignModel, Field(discriminator="kind")]
+class MatchingPolicyTopKModel(BaseModel):
+    """Fastest of the k nearest idle drivers, if its pickup ETA is within max_eta_s."""
+
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["top_k"] = "top_k"
+    k: int = Field(default=8, ge=1)
+    max_eta_s: float = Field(default=600.0, gt=0)
+    vmax_mps: float = Field(default=30.0, gt=0)  # no leg is faster: distance / vmax bounds ETAs
+
+
+class MatchingPolicyBatchAssignModel(BaseModel):
+    """Every interval_s, min-cost assignment of queued riders to idle / soon-idle drivers."""
+
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["batch_assign"] = "batch_assign"
+    interval_s: float = Field(default=10.0, gt=0)
+    max_eta_s: float = Field(default=600.0, gt=0)  # pairs slower than this are not offered
+    k_candidates: int = Field(default=8, ge=1)  # nearest drivers priced per rider
+    soon_idle_s: float = Field(default=0.0, ge=0)  # also drivers finishing a dropoff by then
+    unassigned_cost_s: float | None = None  # None: 2 x max_eta_s
+    eps_s: float = Field(default=0.1, gt=0)  # auction accuracy per rider
+    # ETA proxy: distance / speed_mps, distance L1 or L2 x detour
+    speed_mps: float = Field(default=8.0, gt=0)
+    metric: Literal["l1", "l2"] = "l2"
+    detour: float = Field(default=1.0, ge=1.0)
+
+
+MatchingPolicyUnion = Annotated[
+    MatchingPolicyNearestAssignModel | MatchingPolicyTopKModel | MatchingPolicyBatchAssignModel,
+    Field(discriminator="kind"),
+]
 
 
 class PricingPolicyConstantModel(BaseModel):
@@ -245,7 +374,107 @@ class PricingPolicyConstantModel(BaseModel):
     fare: float = 0.0
 
 
-PricingPolicyUnion = Annotated[PricingPolicyConstantModel, Field(discriminator="kind")]
+class PricingPolicySurgeModel(BaseModel):
+    """Distance fare x per-zone multiplier from open requests / idle drivers (needs zones)."""
+
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["surge"] = "surge"
+    base_fare: float = Field(default=2.5, ge=0)
+    per_km: float = Field(default=1.5, ge=0)
+    min_fare: float = Field(default=0.0, ge=0)
+    interval_s: float = Field(default=60.0, gt=0)  # multiplier recompute period
+    window_s: float = Field(default=300.0, gt=0)  # rolling window of counter samples
+    threshold: float = Field(default=1.0, ge=0)  # open / idle ratio where surge starts
+    sensitivity: float = Field(default=0.5, ge=0)  # multiplier per unit of ratio above it
+    max_multiplier: float = Field(default=3.0, ge=1)
+
+
+PricingPolicyUnion = Annotated[
+    PricingPolicyConstantModel | PricingPolicySurgeModel, Field(discriminator="kind")
+]
+
+
+class DispatchTopKModel(BaseModel):
+    """Offer trips to the k nearest idle drivers, who accept at random (policy.dispatch)."""
+
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["top_k"] = "top_k"
+    k: int | None = Field(default=3, ge=1)  # None: broadcast to every idle driver in reach
+    max_pickup_m: float | None = Field(default=None, gt=0)  # None: no distance limit
+    timeout_s: float = Field(default=15.0, gt=0)  # offer expiry
+    p_accept: float = Field(default=0.8, ge=0, le=1)
+    accept_decay_m: float | None = Field(default=None, gt=0)  # p_accept * exp(-dist / this)
+    mean_response_s: float = Field(default=5.0, ge=0)  # exponential response delay
+    block: int = Field(default=4096, ge=1)  # buffered draws per refill
+
+
+class DispatchPoolingModel(BaseModel):
+    """Insert each trip into a nearby vehicle's shared stop sequence (policy.pooling)."""
+
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["pooling"] = "pooling"
+    capacity: int | None = Field(default=None, ge=1)  # None: world.capacity
+    max_wait_s: float = Field(default=300.0, gt=0)  # pickup by request + this
+    max_detour: float = Field(default=0.5, ge=0)  # ride time up to (1 + this) x direct
+    k: int = Field(default=16, ge=1)  # nearest vehicles tried per request
+    vmax_mps: float = Field(default=30.0, gt=0)  # no leg is faster: distance / vmax bounds ETAs
+    stop_s: float = Field(default=0.0, ge=0)  # dwell at every stop
+    cell_m: float = Field(default=500.0, gt=0)  # vehicle grid cell
+
+
+DispatchPolicyUnion = Annotated[
+    DispatchTopKModel | DispatchPoolingModel, Field(discriminator="kind")
+]
+
+
+class RebalancingZoneFlowModel(BaseModel):
+    """Every interval_s, move idle drivers from surplus to deficit zones (needs mechanics.zones)."""
+
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["zone_flow"] = "zone_flow"
+    interval_s: float = Field(default=300.0, gt=0)
+    alpha: float = Field(default=0.3, gt=0, le=1)  # smoothing of requests per interval
+    slack: int = Field(default=1, ge=0)  # idle drivers a zone keeps above its target
+    max_moves: int | None = Field(default=None, ge=0)  # per interval; None: unbounded
+    speed_mps: float = Field(default=8.0, gt=0)  # move cost: zone center distance / speed
+
+
+RebalancingPolicyUnion = Annotated[RebalancingZoneFlowModel, Field(discriminator="kind")]
+
+
+# ------------------ DEMAND -----------------------------
+
+
+class DemandDayAheadModel(BaseModel):
+    """Vectorized day-ahead arrivals from hourly rates (requests/hour)."""
+
+    model_config = ConfigDict(extra="forbid")
+    kind: Literal["day_ahead"] = "day_ahead"
+    hourly_rate: list[float] | None = None  # 24 city-wide rates
+    zone_hourly_rate: list[list[float]] | None = None  # n_zones x 24, per origin zone
+    scale: float = Field(default=1.0, ge=0)  # multiplier on every rate (1.0 = as given)
+    method: Literal["piecewise", "thinning"] = "piecewise"
+    # zone rectangles; default: the idealized OD sampler's zones
+    zones: list[tuple[float, float, float, float]] | None = None
+    origin_weights: list[float] | None = None  # city-wide rates only
+    dest_weights: list[float] | None = None
+    walk_mean_s: float = Field(default=0.0, ge=0)
+    max_wait_s: tuple[float, float] = (600.0, 600.0)  # uniform [lo, hi]
+    first_rider_id: int = 0
+
+    @model_validator(mode="after")
+    def _check_rates(self):
+        if (self.hourly_rate is None) == (self.zone_hourly_rate is None):
+            raise ValueError("set exactly one of hourly_rate / zone_hourly_rate")
+        rows = [self.hourly_rate] if self.hourly_rate is not None else self.zone_hourly_rate
+        if any(len(r) != 24 for r in rows):
+            raise ValueError("hourly rates need 24 entries")
+        if self.max_wait_s[0] > self.max_wait_s[1]:
+            raise ValueError("max_wait_s must be (lo, hi) with lo <= hi")
+        return self
+
+
+DemandUnion = Annotated[DemandDayAheadModel, Field(discriminator="kind")]
 
 
 # ------------------------------------------------------------------
@@ -259,6 +488,10 @@ class MechanicsModel(BaseModel):
     speed_sampler: SpeedSamplerUnion = Field(default_factory=SpeedSamplerGlobalModel)
     route_planner: RoutePlannerUnion = Field(default_factory=RoutePlannerManhattanModel)
     path_traverser: PathTraverserUnion = Field(default_factory=PathTraverserPiecewiseConstModel)
+    snapper: SnapperModel | None = None  # None: snap through the OD sampler
+    route_cache: RouteCacheModel | None = None  # None: every route() searches
+    isochrones: IsochroneModel | None = None  # None: no reachability pruning
+    zones: ZoneIndexModel | None = None  # None: no point -> zone classification
 
 
 class ScenarioModel(BaseModel):
@@ -274,3 +507,16 @@ class ScenarioModel(BaseModel):
     matching: MatchingPolicyUnion = Field(default_factory=MatchingPolicyNearestAssignModel)
     dwell: DwellPolicyUnion = Field(default_factory=DwellPolicyExpBoardAlightModel)
     pricing: PricingPolicyUnion = Field(default_factory=PricingPolicyConstantModel)
+    dispatch: DispatchPolicyUnion | None = None  # None: matched drivers are assigned outright
+    rebalancing: RebalancingPolicyUnion | None = None  # None: idle drivers only circulate
+    forecast: DemandForecastModel | None = None  # None: no per-zone demand forecast
+    demand: DemandUnion | None = None
+
+    @model_validator(mode="after")
+    def _check_dispatch(self):
+        pooling = self.dispatch is not None and self.dispatch.kind == "pooling"
+        if pooling and self.rebalancing is not None:
+            raise ValueError("pooled vehicles follow their schedules; drop rebalancing")
+        if self.dispatch is not None and not pooling and self.matching.kind == "batch_assign":
+            raise ValueError("dispatch offers need a real-time matching kind, not batch_assign")
+        return self
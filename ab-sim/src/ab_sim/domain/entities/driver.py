@@ -2,7 +2,7 @@
 from dataclasses import dataclass
 
 from ab_sim.domain.entities.geography import Point
-from ab_sim.domain.entities.motion import MovePlan, MoveTask
+from ab_sim.domain.entities.motion import BreakpointPlan, MovePlan, MoveTask
 
 
 @dataclass
@@ -11,7 +11,7 @@ class Driver:
     loc: Point
     state: str = "idle"  # "idle" | "to_pickup" | "wait" | "to_dropoff"
     task_id: int = 0
-    motion: MovePlan | None = None
+    motion: MovePlan | BreakpointPlan | None = None
 
     @property
     def current_move(self) -> MoveTask | None:
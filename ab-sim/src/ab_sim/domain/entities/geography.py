@@ -1,4 +1,9 @@
+import heapq
+import math
 from dataclasses import dataclass
+from itertools import pairwise
+
+import numpy as np
 
 
 # Core geometry types used by mechanics
@@ -22,8 +27,205 @@ class Path:
     total_length_m: float
 
 
+@dataclass
+class ArrayPath:
+    """Array-backed path: n segments as (n+1) vertices, per-segment lengths and edge ids.
+
+    Edge id -1 marks an off-network segment (walking, snap connectors).
+    """
+
+    xy: np.ndarray  # (n+1, 2) float64, meters
+    lengths_m: np.ndarray  # (n,) float64
+    edge_ids: np.ndarray  # (n,) int64, -1 => off-network
+    total_length_m: float
+
+    @classmethod
+    def from_path(cls, path: Path) -> "ArrayPath":
+        if isinstance(path, ArrayPath):
+            return path
+        segs = path.segments
+        n = len(segs)
+        xy = np.zeros((n + 1, 2), dtype=float)
+        if n:
+            xy[0] = (segs[0].start.x, segs[0].start.y)
+            xy[1:, 0] = [s.end.x for s in segs]
+            xy[1:, 1] = [s.end.y for s in segs]
+        lengths = np.fromiter((s.length_m for s in segs), dtype=float, count=n)
+        eids = np.fromiter(
+            (-1 if s.edge_id is None else s.edge_id for s in segs), dtype=np.int64, count=n
+        )
+        return cls(xy, lengths, eids, path.total_length_m)
+
+    @property
+    def segments(self) -> list[Segment]:
+        # compat view for per-segment consumers; avoid on hot paths
+        pts = [Point(float(x), float(y)) for x, y in self.xy]
+        return [
+            Segment(pts[i], pts[i + 1], float(L), edge_id=None if e < 0 else int(e))
+            for i, (L, e) in enumerate(zip(self.lengths_m, self.edge_ids, strict=True))
+        ]
+
+
 class NetworkGraph:
-    """Wrapper over OSM preprocessor."""
+    """
+    Directed road graph in CSR form: the out-edges of node u occupy slots
+    indptr[u]:indptr[u+1] of indices (head node), length_m and edge_id.
+    Arrays may be read-only memory maps (see ab_sim.io.graph_format); nothing here writes them.
+    `extras` carries optional precomputed arrays stored alongside the graph.
+    """
+
+    def __init__(
+        self,
+        node_xy: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        length_m: np.ndarray,
+        edge_id: np.ndarray | None = None,
+        *,
+        meta: dict | None = None,
+        extras: dict[str, np.ndarray] | None = None,
+    ):
+        self.node_xy = node_xy  # (n, 2) float64, meters
+        self.indptr = indptr  # (n+1,) int64
+        self.indices = indices  # (m,) int64
+        self.length_m = length_m  # (m,) float64
+        self.edge_id = np.arange(len(indices)) if edge_id is None else edge_id  # (m,) int64
+        self.meta = dict(meta or {})
+        self.extras = dict(extras or {})
+        if len(indptr) != len(node_xy) + 1 or indptr[-1] != len(indices):
+            raise ValueError("inconsistent CSR arrays")
+        self._snapper = None
+        self._edge_u = None
+        self.last_expanded = 0
+
+    def with_extras(self, extras: dict[str, np.ndarray]) -> "NetworkGraph":
+        """A graph over the same arrays (not copied) whose extras also hold `extras`."""
+        return NetworkGraph(
+            self.node_xy,
+            self.indptr,
+            self.indices,
+            self.length_m,
+            self.edge_id,
+            meta=self.meta,
+            extras={**self.extras, **extras},
+        )
+
+    @classmethod
+    def from_edges(
+        cls,
+        node_xy,
+        u,
+        v,
+        length_m=None,
+        edge_id=None,
+        **kw,
+    ) -> "NetworkGraph":
+        """Build from an edge list; missing lengths default to straight-line distance."""
+        xy = np.asarray(node_xy, dtype=np.float64).reshape(-1, 2)
+        u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+        if length_m is None:
+            length_m = np.hypot(*(xy[v] - xy[u]).T)
+        length_m = np.asarray(length_m, dtype=np.float64)
+        eid = np.arange(len(u)) if edge_id is None else np.asarray(edge_id, dtype=np.int64)
+        order = np.argsort(u, kind="stable")
+        indptr = np.zeros(len(xy) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(u, minlength=len(xy)), out=indptr[1:])
+        return cls(xy, indptr, v[order], length_m[order], eid[order], **kw)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_xy)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def edge_u(self) -> np.ndarray:
+        """Tail node of every CSR slot."""
+        if self._edge_u is None:
+            self._edge_u = np.repeat(np.arange(self.n_nodes), np.diff(self.indptr))
+        return self._edge_u
+
+    @property
+    def edge_v(self) -> np.ndarray:
+        return self.indices
+
+    def node_point(self, n: int) -> Point:
+        x, y = self.node_xy[n]
+        return Point(float(x), float(y))
+
+    def nearest_node(self, p: Point) -> int:
+        if self._snapper is None:
+            from ab_sim.services.snapping import GridIndex, SnapService
+
+            grid = GridIndex.from_arrays(self.extras) if "grid_items" in self.extras else None
+            self._snapper = SnapService(self.node_xy, grid=grid)
+        return self._snapper.nearest_node(p)
+
+    def sample_point(self, rng) -> Point:
+        return self.node_point(int(rng.integers(self.n_nodes)))
+
+    def out_edges(self, u: int) -> range:
+        return range(int(self.indptr[u]), int(self.indptr[u + 1]))
+
+    def edge_slot(self, u: int, v: int) -> int:
+        """Shortest CSR slot u -> v (parallel edges allowed)."""
+        lo, hi = int(self.indptr[u]), int(self.indptr[u + 1])
+        slots = lo + np.flatnonzero(self.indices[lo:hi] == v)
+        if not len(slots):
+            raise KeyError((u, v))
+        return int(slots[np.argmin(self.length_m[slots])])
+
+    def _search(self, s: int, t: int, c0: float, step, h) -> tuple[list[int], float]:
+        """A* core: step(slot, cost_at_tail) -> cost_at_head. Returns (slots s..t, cost at t)."""
+        indptr, indices = self.indptr, self.indices
+        dist = {s: c0}
+        prev: dict[int, int] = {}  # node -> slot it was reached through
+        heap = [(c0 + h(s, t), s)]
+        done = set()
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u == t:
+                break
+            if u in done:
+                continue
+            done.add(u)
+            du = dist[u]
+            for k in range(int(indptr[u]), int(indptr[u + 1])):
+                v = int(indices[k])
+                nd = step(k, du)
+                if nd < dist.get(v, math.inf):
+                    dist[v], prev[v] = nd, k
+                    heapq.heappush(heap, (nd + h(v, t), v))
+        self.last_expanded = len(done)  # search-effort diagnostic
+        if t not in dist:
+            raise ValueError(f"node {t} unreachable from {s}")
+        slots, n = [], t
+        while n != s:
+            k = prev[n]
+            slots.append(k)
+            n = int(self.edge_u[k])
+        return slots[::-1], dist[t]
+
+    def astar_slots(self, s: int, t: int, h) -> list[int]:
+        """CSR slots of the route s..t minimising length_m; h(u, t) must not overestimate it."""
+        L = self.length_m
+        slots, _ = self._search(s, t, 0.0, lambda k, c: c + float(L[k]), h)
+        return slots
+
+    def astar(self, s: int, t: int, h) -> list[int]:
+        """Node sequence s..t minimising length_m; h(u, t) must not overestimate it."""
+        return [s, *(int(self.indices[k]) for k in self.astar_slots(s, t, h))]
+
+    def td_astar(self, s: int, t: int, t0: float, arrive, h) -> tuple[list[int], float]:
+        """
+        Earliest-arrival route leaving s at t0 -> (CSR slots, arrival time).
+        arrive(slot, tau) must be FIFO; h(u, t) must not overestimate the remaining seconds.
+        """
+        return self._search(s, t, t0, arrive, h)
 
-    pass
-    # implement nearest_node(Point)->int, node_point(int)->Point, astar(u,v,h)->List[int], iter_edges(nodes)->yield (u,v,data)
+    def iter_edges(self, nodes: list[int]):
+        for u, v in pairwise(nodes):
+            k = self.edge_slot(u, v)
+            yield u, v, {"length_m": float(self.length_m[k]), "edge_id": int(self.edge_id[k])}
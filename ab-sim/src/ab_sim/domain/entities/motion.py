@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
 
 from ab_sim.domain.entities.geography import Point
 
@@ -56,3 +58,54 @@ class MovePlan:
             if t <= m.end_t:
                 return i
         return len(self.tasks) - 1
+
+
+@dataclass
+class BreakpointPlan:
+    """Array-backed MovePlan: piecewise-linear motion through (t[k], xy[k]) breakpoints.
+
+    Same read API as MovePlan (start_t/end_t/pos/tasks), but built without a per-segment
+    loop; ``tasks`` is only materialized when something asks for it.
+    """
+
+    t: np.ndarray  # (n+1,) seconds, non-decreasing
+    xy: np.ndarray  # (n+1, 2) meters
+    total_length_m: float
+    _tasks: list[MoveTask] | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def start_t(self) -> float:
+        return float(self.t[0])
+
+    @property
+    def end_t(self) -> float:
+        return float(self.t[-1])
+
+    @property
+    def tasks(self) -> list[MoveTask]:
+        if self._tasks is None:
+            pts = [Point(float(x), float(y)) for x, y in self.xy]
+            ts = self.t.tolist()
+            self._tasks = [
+                MoveTask(start=pts[i], end=pts[i + 1], start_t=ts[i], end_t=ts[i + 1])
+                for i in range(len(ts) - 1)
+            ]
+        return self._tasks
+
+    def pos(self, t: float) -> Point:
+        if t <= self.t[0]:
+            return Point(float(self.xy[0, 0]), float(self.xy[0, 1]))
+        if t >= self.t[-1]:
+            return Point(float(self.xy[-1, 0]), float(self.xy[-1, 1]))
+        # first breakpoint at or after t (same tie-break as MovePlan.pos)
+        i = int(np.searchsorted(self.t, t, side="left"))
+        t0, t1 = self.t[i - 1], self.t[i]
+        f = 0.0 if t1 <= t0 else (t - t0) / (t1 - t0)
+        p0, p1 = self.xy[i - 1], self.xy[i]
+        return Point(float(p0[0] + f * (p1[0] - p0[0])), float(p0[1] + f * (p1[1] - p0[1])))
+
+    def current_task_index(self, t: float) -> int:
+        n = len(self.t) - 1
+        if t <= self.t[0] or n <= 0:
+            return 0
+        return min(int(np.searchsorted(self.t[1:], t, side="left")), n - 1)
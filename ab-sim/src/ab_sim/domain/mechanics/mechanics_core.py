@@ -8,8 +8,12 @@ from ab_sim.app.protocols import (
     RoutePlanner,
     SpeedSampler,
 )
-from ab_sim.domain.entities.geography import Path, Point
+from ab_sim.domain.entities.geography import Path, Point, Segment
 from ab_sim.domain.entities.motion import MovePlan
+from ab_sim.domain.mechanics.mechanics_route_cache import RoutePrefetcher
+from ab_sim.services.isochrones import IsochroneIndex
+from ab_sim.services.snapping import SnapService
+from ab_sim.services.zones import ZoneIndex
 
 
 @dataclass
@@ -18,16 +22,35 @@ class Mechanics(Mechanics):
     route_planner: RoutePlanner
     speed_sampler: SpeedSampler
     path_traverser: PathTraverser
+    snapper: SnapService | None = None
+    prefetcher: RoutePrefetcher | None = None
+    isochrones: IsochroneIndex | None = None
+    zones: ZoneIndex | None = None
 
     def od_pair(self, rng):
         return self.od_sampler.sample_origin(rng), self.od_sampler.sample_destination(rng)
 
-    def route(self, a: Point, b: Point) -> Path:
-        return self.route_planner.route(a, b)
+    def snap(self, p: Point, kind: str = "vehicle") -> tuple[Point, Segment | None]:
+        """Snap through the spatial index when configured, else the OD sampler."""
+        if self.snapper is not None:
+            return self.snapper.snap(p, kind=kind)
+        return self.od_sampler.snap(p, kind=kind)
+
+    def prefetch(self, a: Point, b: Point, t0: float | None = None) -> None:
+        if self.prefetcher is not None:
+            self.prefetcher.prefetch(a, b, t0)
+
+    def close(self) -> None:
+        """Shut down the prefetch thread pool, if any (idempotent)."""
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+
+    def route(self, a: Point, b: Point, t0: float | None = None) -> Path:
+        return self.route_planner.route(a, b, t0)
 
     def eta_s(self, a: Point, b: Point, t0: float, **time_kw) -> float:
         return self.path_traverser.eta_s(
-            self.route_planner.route(a, b), t0, self.speed_sampler, **time_kw
+            self.route_planner.route(a, b, t0), t0, self.speed_sampler, **time_kw
         )
 
     def distance_m(self, a: Point, b: Point) -> float:
@@ -35,10 +58,10 @@ class Mechanics(Mechanics):
 
     def progress(self, a: Point, b: Point, t0: float, **time_kw):
         yield from self.path_traverser.checkpoints(
-            self.route_planner.route(a, b), t0, self.speed_sampler, **time_kw
+            self.route_planner.route(a, b, t0), t0, self.speed_sampler, **time_kw
         )
 
     def move_plan(self, a: Point, b: Point, t0: float, **time_kw) -> MovePlan:
         return self.path_traverser.plan(
-            self.route_planner.route(a, b), t0, self.speed_sampler, **time_kw
+            self.route_planner.route(a, b, t0), t0, self.speed_sampler, **time_kw
         )
@@ -0,0 +1,135 @@
+# ab_sim/domain/mechanics/mechanics_demand_generators.py
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+
+from ab_sim.sim.clock import HOUR, SimClock
+from ab_sim.sim.rng import AliasTable
+
+
+@dataclass
+class DemandBatch:
+    """Columnar ride requests, sorted by request time."""
+
+    t: np.ndarray  # (n,) sim seconds
+    origin: np.ndarray  # (n, 2) meters
+    dest: np.ndarray  # (n, 2) meters
+    walk_s: np.ndarray  # (n,)
+    max_wait_s: np.ndarray  # (n,)
+    origin_zone: np.ndarray  # (n,) int64
+    dest_zone: np.ndarray  # (n,) int64
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+
+class DayAheadDemandGenerator:
+    """
+    Nonhomogeneous Poisson arrivals from hour-of-day rates (requests/hour), drawn for a
+    whole window at once.
+
+    rates: (24,) city-wide, origins then drawn by `origin_weights`; or (n_zones, 24) per
+           origin zone. Hours are wall-clock hours of `clock` (UTC epoch offset, no DST).
+    method: "piecewise" draws a Poisson count per (zone, hour bin) and spreads arrivals
+            uniformly in the bin (exact for piecewise-constant rates); "thinning" draws a
+            homogeneous process at the peak rate and keeps each arrival w.p. rate(t)/peak.
+    """
+
+    def __init__(
+        self,
+        *,
+        rates,
+        clock: SimClock,
+        rng: np.random.Generator,
+        zones,
+        origin_weights=None,
+        dest_weights=None,
+        method: Literal["piecewise", "thinning"] = "piecewise",
+        scale: float = 1.0,
+        walk_mean_s: float = 0.0,
+        max_wait_s: tuple[float, float] = (600.0, 600.0),
+    ):
+        r = np.asarray(rates, dtype=float) * scale
+        self.per_zone = r.ndim == 2
+        self.rates = r if self.per_zone else r[None, :]  # (Z or 1, 24)
+        if self.rates.shape[1] != 24 or (self.rates < 0).any():
+            raise ValueError("rates must be non-negative with 24 hourly columns")
+        self.zones = np.asarray(zones, dtype=float).reshape(-1, 4)
+        if self.per_zone and len(self.zones) != len(self.rates):
+            raise ValueError(f"per-zone rates need {len(self.rates)} zones, got {len(self.zones)}")
+        n_z = len(self.zones)
+        self._origin = AliasTable(np.ones(n_z) if origin_weights is None else origin_weights)
+        self._dest = AliasTable(np.ones(n_z) if dest_weights is None else dest_weights)
+        self.clock, self.rng, self.method = clock, rng, method
+        self.walk_mean_s, self.max_wait_s = walk_mean_s, max_wait_s
+        e = clock.epoch
+        self._tod0 = e.hour * HOUR + e.minute * 60.0 + e.second  # wall time-of-day at t=0
+
+    def _hour_bins(self, t0: float, t1: float):
+        """Clip [t0, t1) to wall-clock hour bins -> (lo, hi, hour-of-day) arrays."""
+        k0 = int(np.floor((t0 + self._tod0) / HOUR))
+        k1 = int(np.ceil((t1 + self._tod0) / HOUR))
+        k = np.arange(k0, max(k1, k0 + 1))
+        lo = np.maximum(k * HOUR - self._tod0, t0)
+        hi = np.minimum((k + 1) * HOUR - self._tod0, t1)
+        return lo, hi, k % 24
+
+    def _arrivals(self, t0: float, t1: float) -> tuple[np.ndarray, np.ndarray]:
+        """Return (times, origin zone) before sorting."""
+        lo, hi, hour = self._hour_bins(t0, t1)
+        dur = hi - lo
+        lam = self.rates[:, hour]  # (Z, K) requests/hour per bin
+        if self.method == "piecewise":
+            counts = self.rng.poisson(lam * (dur / HOUR))
+            zone, b = np.nonzero(counts)
+            c = counts[zone, b]
+            zone, b = np.repeat(zone, c), np.repeat(b, c)
+            t = lo[b] + self.rng.random(len(b)) * dur[b]
+        else:
+            total = lam.sum(axis=0)
+            peak = float(total.max()) if total.size else 0.0
+            n = self.rng.poisson(peak * (t1 - t0) / HOUR) if peak > 0 else 0
+            t = t0 + self.rng.random(n) * (t1 - t0)
+            b = np.minimum(np.searchsorted(hi, t, side="right"), len(hi) - 1)
+            keep = self.rng.random(n) * peak < total[b]
+            t, b = t[keep], b[keep]
+            if self.per_zone:
+                # origin zone ~ per-zone share of the bin's total rate
+                cum = np.cumsum(lam, axis=0) / np.where(total > 0, total, 1.0)
+                u = self.rng.random(len(b))
+                zone = np.empty(len(b), dtype=np.int64)
+                for k in np.unique(b):
+                    m = b == k
+                    zone[m] = np.searchsorted(cum[:, k], u[m], side="right")
+                zone = np.minimum(zone, len(lam) - 1)
+            else:
+                zone = np.zeros(len(b), dtype=np.int64)
+        if not self.per_zone:
+            zone = self._origin.sample_many(self.rng.random(len(t)))
+        return t, zone.astype(np.int64)
+
+    def _points_in(self, zone: np.ndarray) -> np.ndarray:
+        r = self.zones[zone]
+        u = self.rng.random((len(zone), 2))
+        return r[:, :2] + u * (r[:, 2:] - r[:, :2])
+
+    def generate(self, t0: float, t1: float) -> DemandBatch:
+        """All requests in [t0, t1), e.g. one simulated day ahead."""
+        t, oz = self._arrivals(t0, t1)
+        order = np.argsort(t, kind="stable")
+        t, oz = t[order], oz[order]
+        n = len(t)
+        dz = self._dest.sample_many(self.rng.random(n))
+        walk = self.rng.exponential(self.walk_mean_s, n) if self.walk_mean_s > 0 else np.zeros(n)
+        lo, hi = self.max_wait_s
+        wait = lo + self.rng.random(n) * (hi - lo) if hi > lo else np.full(n, float(lo))
+        return DemandBatch(
+            t=t,
+            origin=self._points_in(oz),
+            dest=self._points_in(dz),
+            walk_s=walk,
+            max_wait_s=wait,
+            origin_zone=oz,
+            dest_zone=dz,
+        )
@@ -1,8 +1,20 @@
 # ab_sim/domain/mechanics/mechanics_factory.py
 
-from ab_sim.config.models import MechanicsModel
+import numpy as np
+
+from ab_sim.config.models import IsochroneModel, MechanicsModel, ZoneIndexModel
 from ab_sim.domain.mechanics.mechanics_core import Mechanics
-from ab_sim.runtime.registries import make_od, make_path_traverser, make_route_planner, make_speed
+from ab_sim.domain.mechanics.mechanics_route_cache import CachedRoutePlanner, RoutePrefetcher
+from ab_sim.runtime.registries import (
+    make_od,
+    make_path_traverser,
+    make_route_planner,
+    make_snapper,
+    make_speed,
+)
+from ab_sim.services.isochrones import IsochroneIndex
+from ab_sim.services.zones import ZoneIndex
+from ab_sim.sim.clock import SimClock
 from ab_sim.sim.rng import RNGRegistry
 
 
@@ -14,24 +26,84 @@ def load_polygon_sampler(path: str):
 
 
 def load_graph(path: str):
-    from ab_sim.io.inputs import load_network_graph  # your preprocessor output
+    from ab_sim.io.graph_format import load_graph  # preprocessor output (.npy directory)
 
-    return load_network_graph(path)
+    return load_graph(path)
 
 
-def build_mechanics(cfg: MechanicsModel, rng_registry: RNGRegistry, *, graphs=None) -> Mechanics:
+def build_mechanics(
+    cfg: MechanicsModel, rng_registry: RNGRegistry, *, graphs=None, clock: SimClock | None = None
+) -> Mechanics:
+    """
+    graphs: prebuilt graphs by name (e.g. runtime.shared.attached()) for GraphByName refs.
+    clock: aligns time-dependent routing bins with wall time (default: t=0 is Monday 00:00).
+    """
     rng_od = rng_registry.stream("od")
     rng_speed_sampler = rng_registry.stream("speed_sampling")
     # rng_snap = rng_registry.stream("snap")
 
     speed_sampler = make_speed(cfg.speed_sampler, deps={"rng": rng_speed_sampler})
-    od_sampler = make_od(cfg.od_sampler, deps={"rng": rng_od})
-    route_planner = make_route_planner(cfg.route_planner)
+    od_sampler = make_od(cfg.od_sampler, deps={"rng": rng_od, "graphs": graphs or {}})
+    route_planner = make_route_planner(
+        cfg.route_planner,
+        deps={"graphs": graphs or {}, "speed_sampler": speed_sampler, "clock": clock},
+    )
+    prefetcher = None
+    if cfg.route_cache is not None:
+        route_planner = CachedRoutePlanner(route_planner, size=cfg.route_cache.size)
+        if cfg.route_cache.prefetch:
+            prefetcher = RoutePrefetcher(route_planner, workers=cfg.route_cache.workers)
     path_traverser = make_path_traverser(cfg.path_traverser)
+    snapper = None
+    if cfg.snapper is not None:
+        deps = {"graphs": graphs or {}}
+        if getattr(od_sampler, "G", None) is not None:
+            deps["graph"] = od_sampler.G
+        snapper = make_snapper(cfg.snapper, deps=deps)
 
-    return Mechanics(
+    mechanics = Mechanics(
         od_sampler=od_sampler,
         route_planner=route_planner,
         speed_sampler=speed_sampler,
         path_traverser=path_traverser,
+        snapper=snapper,
+        prefetcher=prefetcher,
     )
+    if cfg.isochrones is not None:
+        mechanics.isochrones = build_isochrones(cfg.isochrones, mechanics)
+    if cfg.zones is not None:
+        mechanics.zones = build_zones(cfg.zones, od_sampler)
+    return mechanics
+
+
+def build_zones(cfg: ZoneIndexModel, od_sampler) -> ZoneIndex:
+    if cfg.path is not None:
+        if cfg.path.endswith((".geojson", ".json")):
+            return ZoneIndex.from_geojson(cfg.path, cfg.cell_m, name_property=cfg.name_property)
+        return ZoneIndex.load(cfg.path)
+    zones = cfg.zones if cfg.zones is not None else getattr(od_sampler, "zones", None)
+    if not zones:
+        raise ValueError("zones need a path, inline zones or an OD sampler with zones")
+    return ZoneIndex.build(zones, cfg.cell_m)
+
+
+def build_isochrones(cfg: IsochroneModel, mechanics: Mechanics) -> IsochroneIndex:
+    """Load a saved index, else precompute from the network graph or, failing that, eta_s."""
+    if cfg.path is not None:
+        return IsochroneIndex.load(cfg.path)
+    lo = hi = None
+    if cfg.bbox is not None:
+        lo, hi = cfg.bbox[:2], cfg.bbox[2:]
+    kw = {"hours": cfg.hours, "dow": cfg.dow}
+    graph = getattr(mechanics.route_planner, "G", None)
+    if graph is not None:
+        return IsochroneIndex.from_graph(
+            graph, mechanics.speed_sampler, cfg.cell_m, cfg.thresholds_s, lo=lo, hi=hi, **kw
+        )
+    if lo is None:
+        zones = getattr(mechanics.od_sampler, "zones", None)
+        if not zones:
+            raise ValueError("isochrones need a bbox without a network graph or OD zones")
+        z = np.asarray(zones, dtype=np.float64)
+        lo, hi = z[:, :2].min(axis=0), z[:, 2:].max(axis=0)
+    return IsochroneIndex.from_eta(mechanics.eta_s, lo, hi, cfg.cell_m, cfg.thresholds_s, **kw)
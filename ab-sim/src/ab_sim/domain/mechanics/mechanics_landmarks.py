@@ -0,0 +1,97 @@
+# ab_sim/domain/mechanics/mechanics_landmarks.py
+"""
+ALT (A*, Landmarks, Triangle inequality) preprocessing for NetworkRoutePlanner.
+
+For landmark L and any nodes u, t:  d(u, t) >= d(u, L) - d(t, L)  and  d(u, t) >= d(L, t) - d(L, u).
+Distances from/to a few well-spread landmarks are precomputed once and stored with the
+graph as extras (alt_landmarks, alt_from, alt_to), so they are saved by
+io.graph_format.save_graph and shared by runtime.shared like any other array.
+"""
+
+import heapq
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import NetworkGraph
+
+
+def _reverse_csr(graph: NetworkGraph) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    order = np.argsort(graph.indices, kind="stable")
+    indptr = np.zeros(graph.n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(graph.indices, minlength=graph.n_nodes), out=indptr[1:])
+    return indptr, graph.edge_u[order], np.asarray(graph.length_m)[order]
+
+
+def dijkstra(graph: NetworkGraph, source: int, *, reverse: bool = False, csr=None) -> np.ndarray:
+    """Shortest length_m from source to every node (to source if reverse); inf if unreachable."""
+    if csr is None:
+        csr = _reverse_csr(graph) if reverse else (graph.indptr, graph.indices, graph.length_m)
+    indptr, indices, w = (np.asarray(a).tolist() for a in csr)
+    dist = [np.inf] * graph.n_nodes
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            v, nd = indices[k], d + w[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return np.asarray(dist)
+
+
+def build_landmarks(graph: NetworkGraph, k: int = 8, *, start: int = 0) -> dict[str, np.ndarray]:
+    """
+    Farthest-point landmark selection: each new landmark maximises its distance to the
+    nearest already chosen one. Returns extras arrays; (k, n) float32 keeps them compact.
+    """
+    k = min(k, graph.n_nodes)
+    rev = _reverse_csr(graph)
+    fwd = (graph.indptr, graph.indices, graph.length_m)
+    marks: list[int] = []
+    d_from, d_to = [], []
+    nearest = np.full(graph.n_nodes, np.inf)
+    cand = start
+    for _ in range(k):
+        marks.append(cand)
+        f, t = dijkstra(graph, cand, csr=fwd), dijkstra(graph, cand, csr=rev)
+        d_from.append(f)
+        d_to.append(t)
+        both = np.minimum(f, t)
+        nearest = np.minimum(nearest, np.where(np.isfinite(both), both, -1.0))
+        cand = int(np.argmax(nearest))
+    return {
+        "alt_landmarks": np.asarray(marks, dtype=np.int64),
+        "alt_from": np.asarray(d_from, dtype=np.float32),  # d(L, v)
+        "alt_to": np.asarray(d_to, dtype=np.float32),  # d(v, L)
+    }
+
+
+def add_landmarks(graph: NetworkGraph, k: int = 8) -> NetworkGraph:
+    """The graph with landmark extras added, as a new view; `graph` itself is left alone."""
+    return graph.with_extras(build_landmarks(graph, k))
+
+
+class LandmarkHeuristic:
+    """h(u, t): admissible lower bound on d(u, t) in meters from stored landmark arrays."""
+
+    def __init__(self, graph: NetworkGraph):
+        if "alt_from" not in graph.extras:
+            raise ValueError("graph has no ALT landmarks; run add_landmarks first")
+        # (n, k) rows so one lookup per node touches contiguous memory
+        self.d_from = np.ascontiguousarray(graph.extras["alt_from"].T, dtype=np.float64)
+        self.d_to = np.ascontiguousarray(graph.extras["alt_to"].T, dtype=np.float64)
+        # unreachable entries give no information
+        self.d_from[~np.isfinite(self.d_from)] = np.nan
+        self.d_to[~np.isfinite(self.d_to)] = np.nan
+        self._t = -1
+
+    def __call__(self, u: int, t: int) -> float:
+        if t != self._t:
+            self._t, self._from_t, self._to_t = t, self.d_from[t], self.d_to[t]
+        b = np.fmax(self.d_to[u] - self._to_t, self._from_t - self.d_from[u])
+        m = np.nanmax(b) if not np.isnan(b).all() else 0.0
+        # float32 storage: shave rounding so the bound stays admissible
+        return max(0.0, float(m) * (1.0 - 1e-6) - 1e-3)
@@ -4,6 +4,7 @@ import numpy as np
 
 from ab_sim.app.protocols import OriginDestinationSampler
 from ab_sim.domain.entities.geography import NetworkGraph, Point, Segment
+from ab_sim.sim.rng import AliasTable, BufferedStream
 
 
 class IdealizedODSampler(OriginDestinationSampler):
@@ -13,10 +14,14 @@ class IdealizedODSampler(OriginDestinationSampler):
         zones: list[tuple[float, float, float, float]],
         weights: list[float] | None = None,
         rng,
+        block_size: int = 4096,
     ):
         self.zones = list(zones)
         self.rng, self.weights = rng, weights
         self._p = None if weights is None else self._normalize_weights(weights, len(self.zones))
+        # uniforms come from pre-drawn blocks; weighted zone choice is O(1) via alias table
+        self.stream = rng if isinstance(rng, BufferedStream) else BufferedStream(rng, block_size)
+        self._alias = None if self._p is None else AliasTable(self._p)
 
     @staticmethod
     def _normalize_weights(weights, n):
@@ -36,15 +41,14 @@ class IdealizedODSampler(OriginDestinationSampler):
         return w / s
 
     def _pick(self):
-        if not self.weights:
-            idx = self.rng.integers(0, len(self.zones))
-        else:
-            idx = self.rng.choice(len(self.zones), p=self._p if self._p is not None else None)
-        return self.zones[int(idx)]
+        u = self.stream.random()
+        if self._alias is None:
+            return self.zones[min(int(u * len(self.zones)), len(self.zones) - 1)]
+        return self.zones[self._alias.sample(u)]
 
     def _uniform(self, rect):
         x0, y0, x1, y1 = rect
-        return Point(self.rng.uniform(x0, x1), self.rng.uniform(y0, y1))
+        return Point(self.stream.uniform(x0, x1), self.stream.uniform(y0, y1))
 
     def sample_origin(self, _rng=None):
         return self._uniform(self._pick())
@@ -1,9 +1,11 @@
 import math
 from collections.abc import Iterable
 
+import numpy as np
+
 from ab_sim.app.protocols import PathTraverser, SpeedSampler
-from ab_sim.domain.entities.geography import Path, Point
-from ab_sim.domain.entities.motion import MovePlan, MoveTask
+from ab_sim.domain.entities.geography import ArrayPath, Path, Point
+from ab_sim.domain.entities.motion import BreakpointPlan, MovePlan, MoveTask
 
 
 def eta(a: Point, b: Point, speed_mps: float) -> float:
@@ -62,3 +64,67 @@ class PiecewiseConstSpeedTraverser(PathTraverser):
             tasks.append(MoveTask(start=seg.start, end=seg.end, start_t=t, end_t=t + dt))
             t += dt
         return MovePlan(tasks=tasks, total_length_m=path.total_length_m, start_t=t0, end_t=t)
+
+
+class VectorizedSpeedTraverser(PathTraverser):
+    """
+    Array-path traverser: one SpeedSampler.speeds_mps call per leg, breakpoint times via cumsum.
+    Speeds are looked up at the leg's departure time t0 (dow/hour are fixed per call
+    anyway), so results match PiecewiseConstSpeedTraverser for every sampler we ship.
+    """
+
+    def _times(
+        self, path: ArrayPath, t0: float, speed: SpeedSampler, **kw
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (per-segment speeds, breakpoint times)."""
+        v = np.maximum(0.1, speed.speeds_mps(t0, path.edge_ids, **kw))
+        t = np.empty(len(path.lengths_m) + 1, dtype=float)
+        t[0] = t0
+        np.cumsum(path.lengths_m / v, out=t[1:])
+        t[1:] += t0
+        return v, t
+
+    def eta_s(self, path: Path | ArrayPath, t0: float, speed: SpeedSampler, **kw) -> float:
+        return float(self._times(ArrayPath.from_path(path), t0, speed, **kw)[1][-1])
+
+    def checkpoint_arrays(
+        self,
+        path: Path | ArrayPath,
+        t0: float,
+        speed: SpeedSampler,
+        step_m: float = 50.0,
+        **kw,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (t, xy) arrays of checkpoints every step_m along each segment."""
+        ap = ArrayPath.from_path(path)
+        v, t = self._times(ap, t0, speed, **kw)
+        L = ap.lengths_m
+        steps = np.maximum(1, np.ceil(L / step_m)).astype(np.int64)
+        seg = np.repeat(np.arange(len(L)), steps)
+        first = np.cumsum(steps) - steps
+        k = np.arange(len(seg)) - first[seg] + 1
+        Ls = L[seg]
+        dm = np.minimum(k * step_m, Ls)
+        frac = np.divide(dm, Ls, out=np.ones_like(dm), where=Ls > 0)
+        ts = t[seg] + dm / v[seg]
+        p0, p1 = ap.xy[seg], ap.xy[seg + 1]
+        return ts, p0 + frac[:, None] * (p1 - p0)
+
+    def checkpoints(
+        self, path: Path | ArrayPath, t0: float, speed: SpeedSampler, step_m: float = 50.0, **kw
+    ) -> Iterable[tuple[float, Point]]:
+        ts, xy = self.checkpoint_arrays(path, t0, speed, step_m=step_m, **kw)
+        for t, (x, y) in zip(ts.tolist(), xy.tolist(), strict=True):
+            yield (t, Point(x, y))
+
+    def plan(
+        self,
+        path: Path | ArrayPath,
+        t0: float,
+        speed: SpeedSampler,
+        dow: int | None = None,
+        hour: int | None = None,
+    ) -> BreakpointPlan:
+        ap = ArrayPath.from_path(path)
+        _, t = self._times(ap, t0, speed, dow=dow, hour=hour)
+        return BreakpointPlan(t=t, xy=ap.xy, total_length_m=ap.total_length_m)
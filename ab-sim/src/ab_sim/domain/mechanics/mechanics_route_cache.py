@@ -0,0 +1,128 @@
+# ab_sim/domain/mechanics/mechanics_route_cache.py
+"""
+Route cache + speculative prefetch.
+
+CachedRoutePlanner memoizes route(a, b, t0) on the exact endpoints, so a cached Path is
+the one the wrapped planner would return: the cache (and anything filling it) never
+changes results, only when the work happens. RoutePrefetcher fills it from a thread
+pool with routes that are likely to be asked for soon (driver -> pickup on assignment,
+then the dropoff leg from where that pickup leg ends) while the kernel keeps handling
+other events.
+
+The wrapped planner is not assumed thread-safe (A* bookkeeping, snap caches), so inner
+searches run one at a time under a lock. Concurrency is between a background search and
+the kernel's non-routing work; how much overlaps depends on how much of the search
+releases the GIL (the pure-Python A* mostly holds it, array-heavy planners do not).
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ab_sim.app.protocols import RoutePlanner
+from ab_sim.domain.entities.geography import Path, Point
+
+
+class CachedRoutePlanner(RoutePlanner):
+    def __init__(self, inner: RoutePlanner, *, size: int = 4096):
+        self.inner, self.size = inner, int(size)
+        # time-dependent planners route differently by departure time; others ignore t0
+        self.timed = getattr(inner, "td", None) is not None
+        self._cache: OrderedDict[tuple, Path] = OrderedDict()
+        self._pending: dict[tuple, Future] = {}
+        self._lock = threading.Lock()  # cache + pending
+        self._search = threading.Lock()  # inner planner, one search at a time
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # expose the wrapped planner's attributes (G, td, ...) to callers that probe them
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def key(self, a: Point, b: Point, t0: float | None = None) -> tuple:
+        return (a.x, a.y, b.x, b.y, t0 if self.timed else None)
+
+    def _compute(self, key: tuple, a: Point, b: Point, t0: float | None) -> Path:
+        with self._search:
+            path = self.inner.route(a, b, t0)
+        with self._lock:
+            self._cache[key] = path
+            if len(self._cache) > self.size:
+                self._cache.popitem(last=False)
+        return path
+
+    def route(self, a: Point, b: Point, t0: float | None = None) -> Path:
+        key = self.key(a, b, t0)
+        with self._lock:
+            path = self._cache.get(key)
+            if path is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return path
+            fut = self._pending.get(key)
+            if fut is None:
+                self.misses += 1
+        if fut is not None:
+            with self._lock:
+                self.hits += 1
+            return fut.result()  # being prefetched: wait instead of searching twice
+        return self._compute(key, a, b, t0)
+
+    def distance_m(self, a: Point, b: Point) -> float:
+        if hasattr(self.inner, "G"):  # network distance is a route length
+            return self.route(a, b).total_length_m
+        return self.inner.distance_m(a, b)
+
+    def submit(self, pool: ThreadPoolExecutor, a: Point, b: Point, t0: float | None = None):
+        key = self.key(a, b, t0)
+        with self._lock:
+            if key in self._cache or key in self._pending:
+                return None
+            fut = self._pending[key] = pool.submit(self._compute, key, a, b, t0)
+        fut.add_done_callback(lambda _: self._done(key))
+        return fut
+
+    def _done(self, key: tuple):
+        with self._lock:
+            self._pending.pop(key, None)
+
+
+class RoutePrefetcher:
+    """Speculatively route on a thread pool into a CachedRoutePlanner."""
+
+    def __init__(self, cache: CachedRoutePlanner, *, workers: int = 1):
+        self.cache = cache
+        self.workers = int(workers)
+        self._pool: ThreadPoolExecutor | None = None
+        self._inflight: set[Future] = set()
+        self.submitted = 0
+
+    def prefetch(self, a: Point, b: Point, t0: float | None = None):
+        if self.cache.timed and t0 is None:
+            return None  # departure time unknown: the timed route would not match
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="route-prefetch")
+        fut = self.cache.submit(self._pool, a, b, t0)
+        if fut is not None:
+            self.submitted += 1
+            self._inflight.add(fut)
+            fut.add_done_callback(self._inflight.discard)
+        return fut
+
+    def drain(self):
+        """Block until every prefetch submitted here has finished (tests, end of run)."""
+        for fut in list(self._inflight):
+            fut.result()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
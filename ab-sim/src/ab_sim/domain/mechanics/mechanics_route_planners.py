@@ -1,11 +1,16 @@
 import math
+from typing import Literal
+
+import numpy as np
 
 from ab_sim.app.protocols import RoutePlanner
 from ab_sim.domain.entities.geography import NetworkGraph, Path, Point, Segment
+from ab_sim.domain.mechanics.mechanics_landmarks import LandmarkHeuristic
+from ab_sim.domain.mechanics.mechanics_td_weights import TimeDependentWeights
 
 
 class EuclidRoutePlanner(RoutePlanner):
-    def route(self, a: Point, b: Point) -> Path:
+    def route(self, a: Point, b: Point, t0: float | None = None) -> Path:
         L = math.hypot(b.x - a.x, b.y - a.y)
         return Path([Segment(a, b, L)], L)
 
@@ -14,7 +19,7 @@ class EuclidRoutePlanner(RoutePlanner):
 
 
 class ManhattanRoutePlanner(RoutePlanner):
-    def route(self, a: Point, b: Point) -> Path:
+    def route(self, a: Point, b: Point, t0: float | None = None) -> Path:
         dx, dy = b.x - a.x, b.y - a.y
         p1 = Point(b.x, a.y)
         segs = [Segment(a, p1, abs(dx)), Segment(p1, b, abs(dy))]
@@ -25,28 +30,57 @@ class ManhattanRoutePlanner(RoutePlanner):
 
 
 class NetworkRoutePlanner(RoutePlanner):
-    def __init__(self, graph: NetworkGraph, vmax_mps: float = 16.7):
+    """
+    Shortest-length routes by A* over the graph.
+    heuristic="euclidean": straight-line meters; "alt": max of that and the landmark
+    bound (needs graph.extras from mechanics_landmarks.add_landmarks).
+    With time-dependent weights, route(a, b, t0) returns the earliest-arrival route
+    departing at t0 instead (same search, costs in seconds).
+    """
+
+    def __init__(
+        self,
+        graph: NetworkGraph,
+        vmax_mps: float = 16.7,
+        heuristic: Literal["euclidean", "alt"] = "euclidean",
+        td_weights: TimeDependentWeights | None = None,
+    ):
         self.G, self.vmax = graph, vmax_mps
+        self.alt = LandmarkHeuristic(graph) if heuristic == "alt" else None
+        self.td = td_weights
+        if td_weights is not None:
+            # fastest possible speed anywhere, any time: meters -> seconds lower bound
+            v = np.asarray(graph.length_m) / np.maximum(td_weights.base_s, 1e-9)
+            self._td_vmax = max(float(v.max(initial=0.0)) * td_weights.max_factor, 0.1)
 
-    def route(self, a: Point, b: Point) -> Path:
+    def route(self, a: Point, b: Point, t0: float | None = None) -> Path:
         na, nb = self.G.nearest_node(a), self.G.nearest_node(b)
-        nodes = self.G.astar(na, nb, self._h)
-        segs, L = [], 0.0
-        for u, v, data in self.G.iter_edges(nodes):
-            L += data["length_m"]
+        if self.td is not None and t0 is not None:
+            slots, _ = self.G.td_astar(na, nb, t0, self.td.arrive, self._h_td)
+        else:
+            slots = self.G.astar_slots(na, nb, self._h)
+        segs, total = [], 0.0
+        for k in slots:
+            length = float(self.G.length_m[k])
+            total += length
             segs.append(
                 Segment(
-                    self.G.node_point(u),
-                    self.G.node_point(v),
-                    data["length_m"],
-                    edge_id=data["edge_id"],
+                    self.G.node_point(int(self.G.edge_u[k])),
+                    self.G.node_point(int(self.G.indices[k])),
+                    length,
+                    edge_id=int(self.G.edge_id[k]),
                 )
             )
-        return Path(segs, L)
+        return Path(segs, total)
 
     def distance_m(self, a: Point, b: Point) -> float:
         return self.route(a, b).total_length_m
 
     def _h(self, u, goal):
-        pu, pg = self.G.node_point(u), self.G.node_point(goal)
-        return math.hypot(pg.x - pu.x, pg.y - pu.y) / max(self.vmax, 0.1)
+        # A* weights are length_m, so the bound must be in meters too
+        pu, pg = self.G.node_xy[u], self.G.node_xy[goal]
+        h = math.hypot(pg[0] - pu[0], pg[1] - pu[1])
+        return h if self.alt is None else max(h, self.alt(u, goal))
+
+    def _h_td(self, u, goal):
+        return self._h(u, goal) / self._td_vmax
@@ -1,7 +1,10 @@
-import math
+from collections.abc import Mapping
 from typing import Literal
 
+import numpy as np
+
 from ab_sim.app.protocols import SpeedSampler
+from ab_sim.sim.rng import BufferedStream
 
 
 class GlobalSpeedSampler(SpeedSampler):
@@ -11,6 +14,9 @@ class GlobalSpeedSampler(SpeedSampler):
     def speed_mps(self, t: float, **_):
         return self.v_mps
 
+    def speeds_mps(self, t: float, edge_ids: np.ndarray, **_) -> np.ndarray:
+        return np.full(len(edge_ids), self.v_mps, dtype=float)
+
 
 class ConstantSpeedSampler(SpeedSampler):
     def __init__(self, pickup_mps: float, dropoff_mps: float):
@@ -21,29 +27,96 @@ class ConstantSpeedSampler(SpeedSampler):
         if trip_leg == "pickup":
             return self.pickup_mps
         if trip_leg == "dropoff":
-            return self.pickup_mps
+            return self.dropoff_mps
+
+    def speeds_mps(
+        self,
+        t: float,
+        edge_ids: np.ndarray,
+        *,
+        trip_leg: Literal["pickup", "dropoff"] = "pickup",
+        **_,
+    ) -> np.ndarray:
+        return np.full(len(edge_ids), self.speed_mps(t, trip_leg), dtype=float)
 
 
 class DistDrawSpeedSampler(SpeedSampler):
-    def __init__(self, rng, dist: str, params: dict[str, float], fallback_mps: float):
+    """
+    i.i.d. speed draws served from a BufferedStream (refilled `block_size` values at a
+    time), so a run is reproducible for a given block size.
+    """
+
+    def __init__(
+        self, rng, dist: str, params: dict[str, float], fallback_mps: float, block_size: int = 4096
+    ):
         self.rng, self.dist, self.p, self.fb = rng, dist, params, fallback_mps
+        self.stream = rng if isinstance(rng, BufferedStream) else BufferedStream(rng, block_size)
+        self.block_size = self.stream.block
 
     def speed_mps(self, t: float, **_):
         if self.dist == "lognormal":
-            return max(
-                0.1, self.rng.lognormvariate(self.p.get("mu", 2.0), self.p.get("sigma", 0.25))
-            )
+            return max(0.1, self.stream.lognormal(self.p.get("mu", 2.0), self.p.get("sigma", 0.25)))
         if self.dist == "gamma":
-            k = max(1, int(self.p.get("k", 9)))
-            theta = self.p.get("theta", 1.0)
-            s = sum(-math.log(1.0 - self.rng.random()) for _ in range(k))
-            return max(0.1, s * theta)
+            # sum of k exponentials with mean theta == Gamma(k, theta)
+            k = float(max(1, int(self.p.get("k", 9))))
+            return max(0.1, self.p.get("theta", 1.0) * self.stream.next("standard_gamma", k))
         return self.fb
 
+    def speeds_mps(self, t: float, edge_ids: np.ndarray, **_) -> np.ndarray:
+        n = len(edge_ids)
+        if self.dist == "lognormal":
+            z = self.stream.take(n, "standard_normal")
+            v = np.exp(self.p.get("mu", 2.0) + self.p.get("sigma", 0.25) * z)
+        elif self.dist == "gamma":
+            k = float(max(1, int(self.p.get("k", 9))))
+            v = self.p.get("theta", 1.0) * self.stream.take(n, "standard_gamma", k)
+        else:
+            return np.full(n, self.fb, dtype=float)
+        return np.maximum(0.1, v)
+
+
+def compile_dow_hour_factors(tfac: Mapping[str, float]) -> np.ndarray:
+    """'dow:hour' -> factor mapping to a dense (7, 24) array (missing slots = 1.0)."""
+    out = np.ones((7, 24), dtype=float)
+    for key, f in tfac.items():
+        dow, hour = (int(x) for x in str(key).split(":"))
+        if not (0 <= dow < 7 and 0 <= hour < 24):
+            raise ValueError(f"tfac key out of range: {key!r}")
+        out[dow, hour] = float(f)
+    return out
+
+
+def compile_edge_factors(efac: Mapping[int, float], n_edges: int | None = None) -> np.ndarray:
+    """edge_id -> factor mapping to a dense (n_edges,) array (missing ids = 1.0)."""
+    n = max([int(e) + 1 for e in efac] + [n_edges or 0])
+    out = np.ones(n, dtype=float)
+    for e, f in efac.items():
+        if int(e) < 0:
+            raise ValueError(f"efac edge id must be >= 0, got {e!r}")
+        out[int(e)] = float(f)
+    return out
+
 
 class EdgeAwareSpeedSampler(SpeedSampler):
-    def __init__(self, base_mps: float, tfac: dict[str, float], efac: dict[int, float]):
-        self.base, self.tfac, self.efac = base_mps, tfac, efac
+    """
+    base_mps x time-of-day factor x edge factor, from precompiled arrays:
+      tfac: (7, 24) indexed [dow, hour]; efac: (n_edges,) indexed by dense edge id.
+    Mappings (the config form) are compiled on construction.
+    """
+
+    def __init__(
+        self,
+        base_mps: float,
+        tfac: np.ndarray | Mapping[str, float],
+        efac: np.ndarray | Mapping[int, float],
+    ):
+        self.base = base_mps
+        self.tfac = (
+            compile_dow_hour_factors(tfac) if isinstance(tfac, Mapping) else np.asarray(tfac, float)
+        )
+        self.efac = compile_edge_factors(efac) if isinstance(efac, Mapping) else np.asarray(efac)
+        # trailing 1.0 slot: off-network (-1) and unknown ids index here
+        self._efac_pad = np.append(self.efac.astype(float), 1.0)
 
     def speed_mps(
         self,
@@ -55,7 +128,23 @@ class EdgeAwareSpeedSampler(SpeedSampler):
     ):
         v = self.base
         if dow is not None and hour is not None:
-            v *= self.tfac.get(f"{dow}:{hour}", 1.0)
-        if edge_id is not None:
-            v *= self.efac.get(edge_id, 1.0)
-        return max(0.1, v)
+            v *= self.tfac[dow, hour]
+        if edge_id is not None and 0 <= edge_id < len(self.efac):
+            v *= self.efac[edge_id]
+        return max(0.1, float(v))
+
+    def speeds_mps(
+        self,
+        t: float,
+        edge_ids: np.ndarray,
+        *,
+        dow: int | None = None,
+        hour: int | None = None,
+    ) -> np.ndarray:
+        eids = np.asarray(edge_ids, dtype=np.int64)
+        n = len(self.efac)
+        idx = np.where((eids >= 0) & (eids < n), eids, n)
+        v = self.base
+        if dow is not None and hour is not None:
+            v *= self.tfac[dow, hour]
+        return np.maximum(0.1, v * self._efac_pad[idx])
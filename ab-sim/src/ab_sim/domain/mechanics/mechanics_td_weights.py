@@ -0,0 +1,108 @@
+# ab_sim/domain/mechanics/mechanics_td_weights.py
+import math
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import NetworkGraph
+from ab_sim.domain.mechanics.mechanics_speed_samplers import (
+    EdgeAwareSpeedSampler,
+    GlobalSpeedSampler,
+)
+from ab_sim.sim.clock import DAY, HOUR, SimClock
+
+WEEK = 7 * DAY
+
+
+class TimeDependentWeights:
+    """
+    Time-binned edge travel times over a repeating week, stored factorized:
+        tt[slot, b] = base_s[slot] / factor[group[slot], b]
+    With one group this is the EdgeAwareSpeedSampler model (speed = base x efac[edge] x
+    tfac[dow, hour]); extra groups (e.g. road classes) get their own weekly profile, so
+    the fastest route can change with the time of day.
+    Bin b covers [b * bin_s, (b+1) * bin_s) of week time; t_offset_s maps sim t=0 to
+    week time (Monday 00:00 == 0). Storage is O(n_edges + n_groups x n_bins).
+    """
+
+    def __init__(
+        self,
+        base_s: np.ndarray,
+        factor: np.ndarray,
+        *,
+        group: np.ndarray | None = None,
+        bin_s: float = 900.0,
+        t_offset_s=0.0,
+    ):
+        self.base_s = np.asarray(base_s, dtype=np.float64)  # (n_edges,) per CSR slot
+        self.factor = np.atleast_2d(np.asarray(factor, dtype=np.float64))  # (n_groups, n_bins)
+        self.group = (
+            np.zeros(len(self.base_s), dtype=np.int64) if group is None else np.asarray(group)
+        )
+        if self.factor.min() <= 0:
+            raise ValueError("bin factors must be positive")
+        if self.group.max(initial=0) >= len(self.factor):
+            raise ValueError("edge group without a factor profile")
+        self.bin_s, self.t_offset_s = float(bin_s), float(t_offset_s)
+        self.n_bins = self.factor.shape[1]
+        self.max_factor = float(self.factor.max())
+        self._base, self._fac = self.base_s.tolist(), self.factor.tolist()
+        self._grp = self.group.tolist()
+
+    @classmethod
+    def from_speed_sampler(
+        cls,
+        graph: NetworkGraph,
+        speed,
+        *,
+        clock: SimClock | None = None,
+        bin_s: float = 900.0,
+    ) -> "TimeDependentWeights":
+        """Precompute from a speed sampler's factors (non edge-aware samplers: flat in time)."""
+        if HOUR % bin_s:
+            raise ValueError("bin_s must divide one hour")
+        L = np.asarray(graph.length_m, dtype=np.float64)
+        if isinstance(speed, EdgeAwareSpeedSampler):
+            n = len(speed.efac)
+            eid = np.asarray(graph.edge_id)
+            ef = speed._efac_pad[np.where((eid >= 0) & (eid < n), eid, n)]
+            base_mps = np.maximum(0.1, speed.base * ef)
+            factor = np.repeat(speed.tfac.reshape(-1), int(HOUR // bin_s))
+        else:
+            if isinstance(speed, GlobalSpeedSampler):
+                base_mps = np.full(len(L), speed.v_mps)
+            else:
+                base_mps = speed.speeds_mps(0.0, np.asarray(graph.edge_id))
+            factor = np.ones(int(WEEK // bin_s))
+        off = 0.0
+        if clock is not None:
+            e = clock.epoch
+            off = e.weekday() * DAY + e.hour * HOUR + e.minute * 60.0 + e.second
+        return cls(L / base_mps, factor, bin_s=bin_s, t_offset_s=off)
+
+    def bin_at(self, t: float) -> int:
+        return int((t + self.t_offset_s) // self.bin_s) % self.n_bins
+
+    def tt_s(self, slot: int, t: float) -> float:
+        """Travel time of `slot` at the speed of the bin containing t (no bin crossing)."""
+        return self._base[slot] / self._fac[self._grp[slot]][self.bin_at(t)]
+
+    def arrive(self, slot: int, t: float) -> float:
+        """
+        Arrival time entering `slot` at t. Speed changes at bin boundaries mid-edge, so
+        leaving later never means arriving earlier (FIFO holds).
+        """
+        base, fac, w = self._base[slot], self._fac[self._grp[slot]], self.bin_s
+        k = math.floor((t + self.t_offset_s) / w)
+        left = 1.0  # fraction of the edge still to go
+        while True:
+            f = fac[k % self.n_bins]
+            end = (k + 1) * w - self.t_offset_s
+            need = left * base / f
+            if t + need <= end:
+                return t + need
+            left -= (end - t) * f / base
+            t, k = end, k + 1
+
+    def dense(self) -> np.ndarray:
+        """Materialized (n_bins, n_edges) float32 travel times, for export/inspection."""
+        return (self.base_s[None, :] / self.factor[self.group].T).astype(np.float32)
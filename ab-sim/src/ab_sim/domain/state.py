@@ -1,4 +1,5 @@
 # ab_sim/domain/state.py
+import math
 from dataclasses import dataclass, field
 
 from ab_sim.domain.entities.driver import Driver
@@ -12,11 +13,69 @@ class TripState:
     driver_id: int
     origin: Point
     dest: Point
+    requested_t: float | None = None  # when the rider asked for the ride
     driver_at_pickup_t: float | None = None
     rider_at_pickup_t: float | None = None
     boarding_started_t: float | None = None
     boarded: bool = False
     alighting_started_t: float | None = None
+    route_length_m: float | None = None  # dropoff leg as planned; the fare distance
+    fare: float | None = None  # priced at trip completion
+    surge_multiplier: float | None = None  # locked in when the trip is assigned
+
+
+class IdleGrid:
+    """
+    Spatial hash of idle drivers: (ix, iy) cell -> driver ids, updated as drivers go
+    idle / get taken. Cells are unbounded, so drivers outside any planned area are fine.
+    """
+
+    def __init__(self, cell_m: float = 500.0):
+        self.cell = float(cell_m)
+        self.cells: dict[tuple[int, int], dict[int, Point]] = {}
+        self.where: dict[int, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.where)
+
+    def _cell(self, p: Point) -> tuple[int, int]:
+        return math.floor(p.x / self.cell), math.floor(p.y / self.cell)
+
+    def add(self, did: int, p: Point) -> None:
+        self.discard(did)
+        c = self._cell(p)
+        self.cells.setdefault(c, {})[did] = p
+        self.where[did] = c
+
+    def discard(self, did: int) -> None:
+        c = self.where.pop(did, None)
+        if c is not None:
+            bucket = self.cells[c]
+            del bucket[did]
+            if not bucket:
+                del self.cells[c]
+
+    def nearest(self, p: Point, k: int, max_dist: float = math.inf) -> list[tuple[float, int]]:
+        """Up to k (straight-line distance, driver id) within max_dist, nearest first."""
+        cx, cy = self._cell(p)
+        found: list[tuple[float, int]] = []
+        seen, r = 0, 0
+        while seen < len(self.where):
+            for ix in range(cx - r, cx + r + 1):
+                step = 1 if abs(ix - cx) == r else 2 * r  # interior columns: top/bottom only
+                for iy in range(cy - r, cy + r + 1, max(step, 1)):
+                    bucket = self.cells.get((ix, iy))
+                    if bucket:
+                        seen += len(bucket)
+                        found += [(math.hypot(q.x - p.x, q.y - p.y), d) for d, q in bucket.items()]
+            found.sort()
+            found = found[:k]
+            # anything outside rings 0..r is at least r * cell away
+            reach = r * self.cell
+            if reach >= max_dist or (len(found) == k and found[-1][0] <= reach):
+                break
+            r += 1
+        return [(dist, d) for dist, d in found if dist <= max_dist]
 
 
 @dataclass
@@ -28,6 +87,9 @@ class WorldState:
     trips: dict[int, TripState] = field(default_factory=dict)
     idle_driver_ids: set[int] = field(default_factory=set)
     queued_rider_ids: set[int] = field(default_factory=set)
+    idle_grid: IdleGrid = field(default_factory=IdleGrid)  # mirrors idle_driver_ids
+    # more idle-pool listeners with the same add(did, p) / discard(did) calls (zone counters)
+    idle_watchers: list = field(default_factory=list)
 
     # active assignment index: (driver_id, task_id) -> rider_id
     active_task: dict[tuple[int, int], int] = field(default_factory=dict)
@@ -35,19 +97,36 @@ class WorldState:
     def add_driver(self, d: Driver) -> None:
         self.drivers[d.id] = d
         if d.state == "idle":
-            self.idle_driver_ids.add(d.id)
+            self._idle_add(d.id, d.loc)
 
     def get_idle_driver(self) -> Driver | None:
         if not self.idle_driver_ids:
             return None
-        did = next(iter(self.idle_driver_ids))
-        self.idle_driver_ids.remove(did)
+        return self.take_idle(next(iter(self.idle_driver_ids)))
+
+    def take_idle(self, did: int) -> Driver:
+        """Remove a specific driver from the idle pool (it is about to be dispatched)."""
+        self.idle_driver_ids.discard(did)
+        self.idle_grid.discard(did)
+        for w in self.idle_watchers:
+            w.discard(did)
         return self.drivers[did]
 
     def return_idle(self, d: Driver) -> None:
         d.state = "idle"
         d.clear_motion()
-        self.idle_driver_ids.add(d.id)
+        self._idle_add(d.id, d.loc)
+
+    def relocate_idle(self, d: Driver) -> None:
+        """An idle driver's location changed without leaving the pool."""
+        if d.id in self.idle_driver_ids:
+            self._idle_add(d.id, d.loc)
+
+    def _idle_add(self, did: int, p: Point) -> None:
+        self.idle_driver_ids.add(did)
+        self.idle_grid.add(did, p)
+        for w in self.idle_watchers:
+            w.add(did, p)
 
 
 # store TripState by rider_id or trip_id
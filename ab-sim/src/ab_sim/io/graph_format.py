@@ -0,0 +1,252 @@
+# ab_sim/io/graph_format.py
+"""
+On-disk graph format: a directory of .npy arrays plus a JSON header.
+
+    <dir>/graph.json     {"format": "ab-sim-graph", "version": 1, "n_nodes", "n_edges",
+                          "arrays": {name: {"dtype", "shape"}}, "meta": {...}}
+    <dir>/<name>.npy     one file per array
+
+Core arrays are node_xy, indptr, indices, length_m, edge_id (see NetworkGraph); any
+other listed array is loaded into `graph.extras`. Loading memory-maps every array
+read-only, so it takes milliseconds and worker processes share pages through the OS
+page cache instead of each holding a private unpickled copy.
+
+Precomputed lookup tables that are not graphs (isochrones, skims) use the same layout
+with a tables.json header ({"format": "ab-sim-tables", ...}); see save_tables.
+"""
+
+import csv
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import NetworkGraph
+
+FORMAT = "ab-sim-graph"
+VERSION = 1
+HEADER = "graph.json"
+TABLES_FORMAT = "ab-sim-tables"
+TABLES_HEADER = "tables.json"
+CORE = {
+    "node_xy": np.float64,
+    "indptr": np.int64,
+    "indices": np.int64,
+    "length_m": np.float64,
+    "edge_id": np.int64,
+}
+
+
+def save_graph(graph: NetworkGraph, path, *, extras: dict[str, np.ndarray] | None = None) -> Path:
+    """Write `graph` (plus graph.extras and `extras`) to directory `path`."""
+    out = Path(path)
+    out.mkdir(parents=True, exist_ok=True)
+    arrays = {k: np.ascontiguousarray(getattr(graph, k), dtype=dt) for k, dt in CORE.items()}
+    for k, a in {**graph.extras, **(extras or {})}.items():
+        if k in CORE:
+            raise ValueError(f"reserved array name {k!r}")
+        arrays[k] = np.ascontiguousarray(a)
+    for k, a in arrays.items():
+        np.save(out / f"{k}.npy", a, allow_pickle=False)
+    header = {
+        "format": FORMAT,
+        "version": VERSION,
+        "n_nodes": graph.n_nodes,
+        "n_edges": graph.n_edges,
+        "arrays": {k: {"dtype": a.dtype.str, "shape": list(a.shape)} for k, a in arrays.items()},
+        "meta": graph.meta,
+    }
+    # header last: a directory without one is an incomplete write
+    (out / HEADER).write_text(json.dumps(header, indent=2))
+    return out
+
+
+def read_header(path, *, name: str = HEADER, fmt: str = FORMAT) -> dict:
+    f = Path(path) / name
+    if not f.exists():
+        raise FileNotFoundError(f"no {name} in {path}")
+    header = json.loads(f.read_text())
+    if header.get("format") != fmt:
+        raise ValueError(f"{path}: not an {fmt} directory")
+    if header.get("version") != VERSION:
+        raise ValueError(f"{path}: unsupported format version {header.get('version')!r}")
+    return header
+
+
+def _load_arrays(path, header: dict, mmap: bool) -> dict[str, np.ndarray]:
+    arrays = {}
+    for k, spec in header["arrays"].items():
+        a = np.load(Path(path) / f"{k}.npy", mmap_mode="r" if mmap else None, allow_pickle=False)
+        if a.dtype.str != spec["dtype"] or list(a.shape) != spec["shape"]:
+            raise ValueError(f"{path}: array {k!r} does not match header")
+        arrays[k] = a
+    return arrays
+
+
+def load_graph(path, *, mmap: bool = True) -> NetworkGraph:
+    """Open a saved graph; arrays are read-only memory maps unless mmap=False."""
+    header = read_header(path)
+    arrays = _load_arrays(path, header, mmap)
+    missing = CORE.keys() - arrays.keys()
+    if missing:
+        raise ValueError(f"{path}: missing arrays {sorted(missing)}")
+    core = {k: arrays.pop(k) for k in CORE}
+    return NetworkGraph(**core, meta=header.get("meta"), extras=arrays)
+
+
+def save_tables(tables: dict[str, np.ndarray], path, *, meta: dict | None = None) -> Path:
+    """Write named arrays (plus JSON-able meta) to directory `path`."""
+    out = Path(path)
+    out.mkdir(parents=True, exist_ok=True)
+    arrays = {k: np.ascontiguousarray(a) for k, a in tables.items()}
+    for k, a in arrays.items():
+        np.save(out / f"{k}.npy", a, allow_pickle=False)
+    header = {
+        "format": TABLES_FORMAT,
+        "version": VERSION,
+        "arrays": {k: {"dtype": a.dtype.str, "shape": list(a.shape)} for k, a in arrays.items()},
+        "meta": meta or {},
+    }
+    (out / TABLES_HEADER).write_text(json.dumps(header, indent=2))
+    return out
+
+
+def load_tables(path, *, mmap: bool = True) -> tuple[dict[str, np.ndarray], dict]:
+    """Open saved tables as (arrays, meta); arrays are read-only memory maps unless mmap=False."""
+    header = read_header(path, name=TABLES_HEADER, fmt=TABLES_FORMAT)
+    return _load_arrays(path, header, mmap), header.get("meta") or {}
+
+
+# ---------------- converters ----------------
+
+
+def graph_from_graphml(
+    file, *, x_attr: str = "x", y_attr: str = "y", length_attr: str = "length"
+) -> NetworkGraph:
+    """
+    Parse GraphML with node x/y keys (projected meters). Undirected graphs get both
+    directions; edges without `length_attr` use straight-line length.
+    """
+    root = ET.parse(file).getroot()
+    ns = {"g": root.tag[1:].split("}")[0]} if root.tag.startswith("{") else {}
+    q = (lambda t: f"g:{t}") if ns else (lambda t: t)
+    keys = {(k.get("for"), k.get("attr.name")): k.get("id") for k in root.iterfind(q("key"), ns)}
+    kx, ky = keys.get(("node", x_attr)), keys.get(("node", y_attr))
+    kl = keys.get(("edge", length_attr))
+    if kx is None or ky is None:
+        raise ValueError(f"GraphML nodes need {x_attr!r}/{y_attr!r} attributes")
+    g = root.find(q("graph"), ns)
+    directed = g.get("edgedefault", "directed") == "directed"
+
+    def data(el) -> dict[str, str]:
+        return {d.get("key"): (d.text or "") for d in el.iterfind(q("data"), ns)}
+
+    ids, xy = {}, []
+    for n in g.iterfind(q("node"), ns):
+        d = data(n)
+        ids[n.get("id")] = len(xy)
+        xy.append((float(d[kx]), float(d[ky])))
+    u, v, L = [], [], []
+    for e in g.iterfind(q("edge"), ns):
+        d = data(e)
+        a, b = ids[e.get("source")], ids[e.get("target")]
+        length = float(d[kl]) if kl in d else np.nan
+        u.append(a), v.append(b), L.append(length)
+        if not (directed if e.get("directed") is None else e.get("directed") == "true"):
+            u.append(b), v.append(a), L.append(length)
+    return _assemble(np.array(xy), u, v, L, meta={"source": str(file)})
+
+
+def graph_from_edge_list(
+    file,
+    *,
+    nodes=None,
+    u: str = "u",
+    v: str = "v",
+    length: str = "length_m",
+    edge_id: str = "edge_id",
+    x: str = "x",
+    y: str = "y",
+    node_id: str = "node_id",
+    directed: bool = True,
+) -> NetworkGraph:
+    """
+    Edge list (CSV or Parquet) with u/v columns; node coordinates from `nodes` (a
+    node_id/x/y table) or, when absent, from per-edge u_x/u_y/v_x/v_y columns.
+    Node ids may be arbitrary integers; they are renumbered densely.
+    """
+    e = read_table(file)
+    if nodes is not None:
+        n = read_table(nodes)
+        raw = np.asarray(n[node_id], dtype=np.int64)
+        xy = np.column_stack([np.asarray(n[x], float), np.asarray(n[y], float)])
+    else:
+        ends = np.concatenate([np.asarray(e[u], np.int64), np.asarray(e[v], np.int64)])
+        pts = np.concatenate(
+            [
+                np.column_stack(
+                    [np.asarray(e[f"{u}_{x}"], float), np.asarray(e[f"{u}_{y}"], float)]
+                ),
+                np.column_stack(
+                    [np.asarray(e[f"{v}_{x}"], float), np.asarray(e[f"{v}_{y}"], float)]
+                ),
+            ]
+        )
+        raw, first = np.unique(ends, return_index=True)
+        xy = pts[first]
+    order = np.argsort(raw)
+    raw, xy = raw[order], xy[order]
+    iu, iv = dense_index(raw, e[u]), dense_index(raw, e[v])
+    L = np.asarray(e[length], float) if length in e else np.full(len(iu), np.nan)
+    eid = np.asarray(e[edge_id], np.int64) if edge_id in e else None
+    if not directed:
+        iu, iv = np.concatenate([iu, iv]), np.concatenate([iv, iu])
+        L = np.concatenate([L, L])
+        eid = None if eid is None else np.concatenate([eid, eid])
+    return _assemble(xy, iu, iv, L, eid, meta={"source": str(file), "node_ids": "dense"})
+
+
+def convert(src, dst, *, fmt: str | None = None, **kw) -> Path:
+    """Convert a GraphML / CSV / Parquet graph to the .npy directory format."""
+    fmt = fmt or Path(src).suffix.lstrip(".").lower()
+    if fmt == "graphml":
+        g = graph_from_graphml(src, **kw)
+    elif fmt in ("csv", "parquet"):
+        g = graph_from_edge_list(src, **kw)
+    else:
+        raise ValueError(f"Unsupported graph fmt {fmt!r}")
+    return save_graph(g, dst)
+
+
+def _assemble(xy, u, v, L, eid=None, *, meta=None) -> NetworkGraph:
+    u, v = np.asarray(u, np.int64), np.asarray(v, np.int64)
+    L = np.asarray(L, float)
+    straight = np.hypot(*(xy[v] - xy[u]).T)
+    L = np.where(np.isnan(L), straight, L)
+    return NetworkGraph.from_edges(xy, u, v, L, eid, meta=meta)
+
+
+def dense_index(sorted_ids: np.ndarray, ids) -> np.ndarray:
+    """Positions of raw node ids within sorted_ids; raises on unknown ids."""
+    ids = np.asarray(ids, np.int64)
+    i = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+    if len(ids) and (sorted_ids[i] != ids).any():
+        raise ValueError("edge list references unknown node ids")
+    return i
+
+
+def read_table(file) -> dict[str, np.ndarray]:
+    if Path(file).suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:  # optional dependency
+            raise ImportError("reading Parquet edge lists requires pyarrow") from e
+        t = pq.read_table(file)
+        return {c: t.column(c).to_numpy() for c in t.column_names}
+    with open(file, newline="") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        return {}
+    # blank cells read as NaN (e.g. a missing length falls back to straight-line)
+    return {c: np.array([r[c] or "nan" for r in rows]) for c in rows[0]}
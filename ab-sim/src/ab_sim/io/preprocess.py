@@ -0,0 +1,290 @@
+# ab_sim/io/preprocess.py
+"""
+Offline road-network preprocessor: raw edge list -> compact NetworkGraph on disk.
+
+  1. keep the largest strongly connected component (every node can reach every other);
+  2. merge chains of degree-2 nodes into single edges, keeping their polyline geometry
+     (extras geom_indptr/geom_xy) and summed length;
+  3. number the surviving edges densely in CSR order, so edge_id == CSR slot and any
+     (n_edges,) array - e.g. EdgeAwareSpeedSampler.efac - lines up with the graph;
+  4. write the .npy directory format (ab_sim.io.graph_format).
+
+raw_to_dense (extra) maps each input row to the dense edge that absorbed it (-1: pruned).
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import NetworkGraph
+from ab_sim.io.graph_format import dense_index, read_table, save_graph
+
+
+@dataclass
+class PreprocessReport:
+    n_nodes_in: int
+    n_edges_in: int
+    n_nodes_out: int
+    n_edges_out: int
+    n_nodes_pruned: int  # outside the largest SCC
+    n_nodes_contracted: int  # removed by degree-2 merging
+
+
+def _csr(n: int, u: np.ndarray, v: np.ndarray) -> tuple[list[int], list[int]]:
+    order = np.argsort(u, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(u, minlength=n), out=indptr[1:])
+    return indptr.tolist(), v[order].tolist()
+
+
+def largest_scc(n: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Boolean node mask of the largest strongly connected component (Kosaraju)."""
+    indptr, indices = _csr(n, u, v)
+    seen = [False] * n
+    order: list[int] = []
+    for s in range(n):
+        if seen[s]:
+            continue
+        seen[s] = True
+        stack = [(s, indptr[s])]
+        while stack:
+            x, i = stack[-1]
+            if i < indptr[x + 1]:
+                stack[-1] = (x, i + 1)
+                w = indices[i]
+                if not seen[w]:
+                    seen[w] = True
+                    stack.append((w, indptr[w]))
+            else:
+                stack.pop()
+                order.append(x)
+    rptr, rind = _csr(n, v, u)
+    comp = [-1] * n
+    c = 0
+    for s in reversed(order):
+        if comp[s] >= 0:
+            continue
+        comp[s] = c
+        stack = [s]
+        while stack:
+            x = stack.pop()
+            for k in range(rptr[x], rptr[x + 1]):
+                w = rind[k]
+                if comp[w] < 0:
+                    comp[w] = c
+                    stack.append(w)
+        c += 1
+    comp_a = np.asarray(comp, dtype=np.int64)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    return comp_a == np.argmax(np.bincount(comp_a))
+
+
+def _contractible(n: int, u: np.ndarray, v: np.ndarray, cls: np.ndarray) -> np.ndarray:
+    """
+    Degree-2 nodes: one-way pass-through (a -> w -> b) or two-way pass-through
+    (a <-> w <-> b) with a single edge per direction and one road class throughout.
+    """
+    ins: list[list[int]] = [[] for _ in range(n)]
+    outs: list[list[int]] = [[] for _ in range(n)]
+    for e, (a, b) in enumerate(zip(u.tolist(), v.tolist(), strict=True)):
+        outs[a].append(e)
+        ins[b].append(e)
+    ok = np.zeros(n, dtype=bool)
+    for w in range(n):
+        i, o = ins[w], outs[w]
+        src, dst = [u[e] for e in i], [v[e] for e in o]
+        if w in src or len({cls[e] for e in i + o}) != 1:
+            continue
+        if len(i) == len(o) == 1:
+            ok[w] = src[0] != dst[0]
+        elif len(i) == len(o) == 2:
+            ok[w] = len(set(src)) == 2 and set(src) == set(dst)
+    return ok
+
+
+def contract_degree2(xy: np.ndarray, u, v, length_m, cls):
+    """
+    Merge chains through contractible nodes.
+    Returns (u, v, length_m, cls, geom list of (k, 2) arrays, members list of input edges).
+    """
+    n = len(xy)
+    u, v = np.asarray(u, np.int64), np.asarray(v, np.int64)
+    ok = _contractible(n, u, v, cls)
+    outs: list[list[int]] = [[] for _ in range(n)]
+    for e, a in enumerate(u.tolist()):
+        outs[a].append(e)
+    done = np.zeros(len(u), dtype=bool)
+    res_u, res_v, res_L, res_c, geom, members = [], [], [], [], [], []
+
+    def walk(e0: int):
+        a = int(u[e0])
+        chain, nodes = [e0], [a, int(v[e0])]
+        prev, cur = a, int(v[e0])
+        while ok[cur] and cur != a:
+            nxt = [f for f in outs[cur] if v[f] != prev] if len(outs[cur]) == 2 else outs[cur]
+            f = nxt[0]
+            chain.append(f)
+            prev, cur = cur, int(v[f])
+            nodes.append(cur)
+        done[chain] = True
+        res_u.append(a), res_v.append(cur), res_c.append(cls[e0])
+        res_L.append(float(np.sum(length_m[chain])))
+        geom.append(xy[nodes])
+        members.append(chain)
+
+    for e in range(len(u)):
+        if not done[e] and not ok[u[e]]:
+            walk(e)
+    # rings made only of contractible nodes: keep one node per ring as an anchor
+    for e in range(len(u)):
+        if not done[e]:
+            ok[u[e]] = False
+            walk(e)
+            for f in outs[u[e]]:
+                if not done[f]:
+                    walk(f)
+    return (
+        np.asarray(res_u, np.int64),
+        np.asarray(res_v, np.int64),
+        np.asarray(res_L, float),
+        np.asarray(res_c),
+        geom,
+        members,
+    )
+
+
+def preprocess_edges(
+    node_xy,
+    u,
+    v,
+    length_m,
+    road_class=None,
+    *,
+    prune_scc: bool = True,
+    contract: bool = True,
+    meta: dict | None = None,
+) -> tuple[NetworkGraph, PreprocessReport]:
+    """In-memory pipeline over dense node indices (see module docstring)."""
+    xy = np.asarray(node_xy, dtype=np.float64).reshape(-1, 2)
+    u, v = np.asarray(u, np.int64), np.asarray(v, np.int64)
+    L = np.asarray(length_m, dtype=np.float64)
+    raw_L = L
+    n_in, m_in = len(xy), len(u)
+    names, cls = np.unique(
+        np.zeros(m_in, dtype=np.int64) if road_class is None else np.asarray(road_class),
+        return_inverse=True,
+    )
+    raw_rows = np.arange(m_in)
+
+    keep = largest_scc(n_in, u, v) if prune_scc else np.ones(n_in, dtype=bool)
+    e_keep = keep[u] & keep[v]
+    new_id = np.cumsum(keep) - 1
+    xy, u, v, L, cls, raw_rows = (
+        xy[keep],
+        new_id[u[e_keep]],
+        new_id[v[e_keep]],
+        L[e_keep],
+        cls[e_keep],
+        raw_rows[e_keep],
+    )
+
+    if contract:
+        u, v, L, cls, geom, members = contract_degree2(xy, u, v, L, cls)
+    else:
+        geom = [xy[[a, b]] for a, b in zip(u, v, strict=True)]
+        members = [[e] for e in range(len(u))]
+
+    # drop nodes no longer referenced (contracted away)
+    used = np.zeros(len(xy), dtype=bool)
+    used[u], used[v] = True, True
+    remap = np.cumsum(used) - 1
+    n_scc = len(xy)
+    xy, u, v = xy[used], remap[u], remap[v]
+
+    # dense ids in CSR order: edge_id == slot
+    order = np.argsort(u, kind="stable")
+    u, v, L, cls = u[order], v[order], L[order], cls[order]
+    geom = [geom[i] for i in order]
+    members = [members[i] for i in order]
+    raw_to_dense = np.full(m_in, -1, dtype=np.int64)
+    for dense, chain in enumerate(members):
+        raw_to_dense[raw_rows[chain]] = dense
+    geom_indptr = np.zeros(len(geom) + 1, dtype=np.int64)
+    np.cumsum([len(g) for g in geom], out=geom_indptr[1:])
+
+    g = NetworkGraph.from_edges(
+        xy,
+        u,
+        v,
+        L,
+        np.arange(len(u), dtype=np.int64),
+        meta={**(meta or {}), "road_classes": [str(x) for x in names.tolist()]},
+        extras={
+            "road_class": cls.astype(np.int32),
+            "geom_indptr": geom_indptr,
+            "geom_xy": np.concatenate(geom) if geom else np.zeros((0, 2)),
+            "raw_to_dense": raw_to_dense,
+            "raw_length_m": raw_L,
+        },
+    )
+    report = PreprocessReport(
+        n_nodes_in=n_in,
+        n_edges_in=m_in,
+        n_nodes_out=g.n_nodes,
+        n_edges_out=g.n_edges,
+        n_nodes_pruned=n_in - n_scc,
+        n_nodes_contracted=n_scc - g.n_nodes,
+    )
+    return g, report
+
+
+def dense_edge_factors(graph: NetworkGraph, raw_factors) -> np.ndarray:
+    """
+    Map per-input-edge speed factors (indexed like the raw edge list) onto dense edges,
+    e.g. to build EdgeAwareSpeedSampler.efac. Merged edges get the length-weighted
+    harmonic mean, which preserves their travel time.
+    """
+    f = np.asarray(raw_factors, dtype=float)
+    r2d, raw_L = graph.extras["raw_to_dense"], graph.extras["raw_length_m"]
+    m = r2d >= 0
+    t = np.bincount(r2d[m], weights=raw_L[m] / f[m], minlength=graph.n_edges)
+    L = np.bincount(r2d[m], weights=raw_L[m], minlength=graph.n_edges)
+    return np.divide(L, t, out=np.ones(graph.n_edges), where=t > 0)
+
+
+def preprocess(
+    edges,
+    nodes,
+    dst,
+    *,
+    u: str = "u",
+    v: str = "v",
+    length: str = "length_m",
+    road_class: str = "road_class",
+    node_id: str = "node_id",
+    x: str = "x",
+    y: str = "y",
+    prune_scc: bool = True,
+    contract: bool = True,
+) -> tuple[Path, PreprocessReport]:
+    """Read a raw edge list + node table (CSV/Parquet), preprocess, write to `dst`."""
+    e, n = read_table(edges), read_table(nodes)
+    raw = np.asarray(n[node_id], dtype=np.int64)
+    order = np.argsort(raw)
+    xy = np.column_stack([np.asarray(n[x], float), np.asarray(n[y], float)])[order]
+    iu, iv = dense_index(raw[order], e[u]), dense_index(raw[order], e[v])
+    L = np.asarray(e[length], float) if length in e else np.full(len(iu), np.nan)
+    L = np.where(np.isnan(L), np.hypot(*(xy[iv] - xy[iu]).T), L)
+    g, report = preprocess_edges(
+        xy,
+        iu,
+        iv,
+        L,
+        e.get(road_class),
+        prune_scc=prune_scc,
+        contract=contract,
+        meta={"source": str(edges)},
+    )
+    return save_graph(g, dst), report
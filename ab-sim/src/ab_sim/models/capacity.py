@@ -0,0 +1,26 @@
+# ab_sim/models/capacity.py
+"""Seat bookkeeping along a vehicle's stop sequence."""
+
+from collections.abc import Sequence
+
+
+def leg_loads(load0: int, kinds: Sequence[str]) -> list[int]:
+    """
+    Riders on board on the leg into each stop, plus one trailing entry for after the last
+    stop: loads[k] is the occupancy while driving to stop k.
+    """
+    loads = [int(load0)]
+    for kind in kinds:
+        loads.append(loads[-1] + (1 if kind == "pickup" else -1))
+    return loads
+
+
+def seat_free_until(loads: Sequence[int], capacity: int) -> list[int]:
+    """
+    free[k] = first leg index >= k that is full (len(loads) if none): a rider picked up
+    before stop k can stay on board at most until just before stop free[k].
+    """
+    free = [len(loads)] * (len(loads) + 1)
+    for k in range(len(loads) - 1, -1, -1):
+        free[k] = k if loads[k] >= capacity else free[k + 1]
+    return free[: len(loads)]
@@ -0,0 +1,170 @@
+# ab_sim/policy/assignment.py
+"""
+Sparse min-cost assignment (riders x drivers) by an epsilon-scaled auction, pure NumPy.
+
+Only candidate pairs are given (rows[k], cols[k], cost[k]); a rider may also stay
+unmatched at `unassigned_cost`, modelled as a private object only that rider bids on.
+Riders bid Jacobi-style: every unassigned rider bids in the same vectorized round, so
+a round is O(candidate pairs) of NumPy work. Epsilon-scaling (big steps first) keeps
+the number of rounds small.
+
+With more drivers than riders the problem is asymmetric: a driver left free must not
+be priced above the cheapest assigned object, otherwise a price left over from an
+earlier phase scares riders away from it. Each phase therefore ends with a reverse
+auction (free objects bid their price down for riders, Bertsekas & Castanon), which
+touches few objects and runs as a plain loop. The result is within
+n_riders x eps_min of the optimum.
+"""
+
+import numpy as np
+
+_TAIL = 16  # this few bidders left: finish them one by one instead of in rounds
+
+
+def _csr(person: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(person, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(person, minlength=n), out=indptr[1:])
+    return order, indptr
+
+
+def _ranges(start: np.ndarray, stop: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenated aranges [start_i, stop_i) and each range's offset in the result."""
+    n = stop - start
+    offs = np.cumsum(n) - n
+    return np.repeat(start - offs, n) + np.arange(n.sum()), offs
+
+
+def _bid(bidders, indptr, obj, benefit, price, owner, assigned, gain, eps, span):
+    idx, seg = _ranges(indptr[bidders], indptr[bidders + 1])
+    val = benefit[idx] - price[obj[idx]]
+    best = np.maximum.reduceat(val, seg)
+    hit = np.flatnonzero(val == np.repeat(best, np.diff(np.r_[seg, len(val)])))
+    first = hit[np.searchsorted(hit, seg)]
+    j, b = obj[idx[first]], benefit[idx[first]]
+    val[first] = -np.inf
+    second = np.maximum.reduceat(val, seg)
+    second = np.where(np.isfinite(second), second, best - span)
+    bid = price[j] + (best - second) + eps
+
+    # highest bid per object wins (ties: lowest rider)
+    o = np.lexsort((bidders, -bid, j))
+    win = np.r_[True, j[o][1:] != j[o][:-1]]
+    wj, wp, wb = j[o][win], bidders[o][win], bid[o][win]
+    prev = owner[wj]
+    assigned[prev[prev >= 0]] = -1
+    owner[wj], assigned[wp], price[wj], gain[wp] = wp, wj, wb, b[o][win]
+
+
+def _chase(i, indptr, obj, benefit, price, owner, assigned, gain, eps, span):
+    """Gauss-Seidel tail: rider i bids, then whoever it displaced, until nobody is."""
+    while i >= 0:
+        lo, hi = indptr[i], indptr[i + 1]
+        o, b = obj[lo:hi], benefit[lo:hi]
+        val = b - price[o]
+        m = int(val.argmax())
+        best = val[m]
+        val[m] = -np.inf
+        second = val.max() if hi - lo > 1 else best - span
+        j = o[m]
+        prev = owner[j]
+        owner[j], assigned[i], gain[i] = i, j, b[m]
+        price[j] += best - second + eps
+        if prev >= 0:
+            assigned[prev] = -1
+        i = prev
+
+
+def _reverse(optr, pers, ben, price, owner, assigned, gain, eps):
+    """Lower prices of free objects to lambda (= min assigned price) by reverse bids."""
+    lam = float(price[assigned].min())
+    # free objects no rider wants at price lambda just drop to it (profits unchanged)
+    val = ben - (gain - price[assigned])[pers]
+    top = np.full(len(price), -np.inf)
+    nz = np.flatnonzero(np.diff(optr))
+    top[nz] = np.maximum.reduceat(val, optr[nz])
+    free = (owner < 0) & (price > lam)
+    price[free & (top <= lam + eps)] = lam
+
+    p, own, asg, g = price.tolist(), owner.tolist(), assigned.tolist(), gain.tolist()
+    todo = np.flatnonzero(free & (top > lam + eps)).tolist()
+    optr, pers, ben = optr.tolist(), pers.tolist(), ben.tolist()
+    while todo:
+        j = todo.pop()
+        best = second = -np.inf
+        bi = bb = -1
+        for e in range(optr[j], optr[j + 1]):
+            i = pers[e]
+            v = ben[e] - (g[i] - p[asg[i]])  # benefit of j minus rider i's current profit
+            if v > best:
+                best, second, bi, bb = v, best, i, ben[e]
+            elif v > second:
+                second = v
+        if lam >= best - eps:
+            p[j] = lam
+            continue
+        k = asg[bi]
+        own[k], own[j], asg[bi], g[bi] = -1, bi, j, bb
+        p[j] = max(lam, second - eps)
+        if p[k] > lam:
+            todo.append(k)
+    price[:] = p
+    return np.asarray(asg, dtype=np.int64)
+
+
+def auction_assign(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    cost: np.ndarray,
+    n_rows: int,
+    n_cols: int,
+    *,
+    unassigned_cost: float,
+    eps_min: float = 1e-2,
+    scale: float = 6.0,
+) -> np.ndarray:
+    """Column per row (-1: unmatched) minimizing total cost + unassigned_cost x unmatched."""
+    rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+    cost = np.asarray(cost, dtype=np.float64)
+    out = np.full(n_rows, -1, dtype=np.int64)
+    keep = cost < unassigned_cost  # never better than leaving the rider unmatched
+    rows, cols, cost = rows[keep], cols[keep], cost[keep]
+    if len(rows) == 0:
+        return out
+    # only riders / drivers that appear in some candidate pair take part
+    r_ids, r = np.unique(rows, return_inverse=True)
+    d_ids, d = np.unique(cols, return_inverse=True)
+    R, D = len(r_ids), len(d_ids)
+
+    # objects: drivers 0..D-1, then rider r's private "unmatched" slot D + r
+    person = np.concatenate([r, np.arange(R)])
+    obj = np.concatenate([d, D + np.arange(R)])
+    benefit = -np.concatenate([cost, np.full(R, unassigned_cost)])
+    order, indptr = _csr(person, R)
+    obj, benefit = obj[order], benefit[order]
+    # the same pairs by object, for the reverse steps
+    rorder, optr = _csr(obj, D + R)
+    rpers, rben = np.repeat(np.arange(R), np.diff(indptr))[rorder], benefit[rorder]
+
+    price = np.zeros(D + R)
+    span = float(benefit.max() - benefit.min()) + 1.0
+    eps = max(span / scale, eps_min)
+    while True:
+        owner = np.full(D + R, -1, dtype=np.int64)
+        assigned = np.full(R, -1, dtype=np.int64)
+        gain = np.zeros(R)  # benefit of each rider's current pair
+        bidders = np.arange(R)
+        while len(bidders) > _TAIL:
+            _bid(bidders, indptr, obj, benefit, price, owner, assigned, gain, eps, span)
+            bidders = np.flatnonzero(assigned < 0)
+        for i in bidders.tolist():
+            _chase(i, indptr, obj, benefit, price, owner, assigned, gain, eps, span)
+        assigned = _reverse(optr, rpers, rben, price, owner, assigned, gain, eps)
+        if eps <= eps_min:
+            break
+        eps = max(eps / scale, eps_min)
+
+    got = assigned
+    matched = got < D
+    out[r_ids[matched]] = d_ids[got[matched]]
+    return out
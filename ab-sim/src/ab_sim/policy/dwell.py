@@ -1,22 +1,38 @@
 # ab_sim/policy/dwells.py
-import numpy as np
-
 from ab_sim.app.protocols import DwellPolicy
+from ab_sim.sim.attributes import AttributeTable, Trait
 from ab_sim.sim.rng import RNGRegistry
 
 
 class ExpBoardingAlightingPolicy(DwellPolicy):
-    def __init__(self, rng_registry: RNGRegistry, board_mean_s=7.0, alight_mean_s=5.0):
+    """
+    Truncated exponential boarding / alighting times, one pair per rider: the same rider
+    takes as long in every run with this seed, whichever driver picks it up and in
+    whatever order riders board.
+    """
+
+    def __init__(
+        self,
+        rng_registry: RNGRegistry,
+        board_mean_s=7.0,
+        alight_mean_s=5.0,
+        block_size: int = 4096,
+    ):
         self.rng_registry = rng_registry
         self.board_mean_s = board_mean_s
         self.alight_mean_s = alight_mean_s
+        self.riders = AttributeTable(
+            rng_registry,
+            "riders",
+            [
+                Trait("boarding_s", "exponential", (board_mean_s,), lo=1.0, hi=60.0),
+                Trait("alighting_s", "exponential", (alight_mean_s,), lo=1.0, hi=60.0),
+            ],
+            chunk=block_size,
+        )
 
     def boarding_delay(self, rider_id: int, driver_id: int) -> float:
-        # per-rider (or per driver+rider) stream
-        g = self.rng_registry.substream("boarding", rider_id, driver_id)
-        # e.g., truncated exponential
-        return float(np.clip(g.exponential(self.board_mean_s), 1.0, 60.0))
+        return self.riders.get("boarding_s", rider_id)
 
     def alighting_delay(self, rider_id: int, driver_id: int) -> float:
-        g = self.rng_registry.substream("alighting", rider_id, driver_id)
-        return float(np.clip(g.exponential(self.alight_mean_s), 1.0, 60.0))
+        return self.riders.get("alighting_s", rider_id)
@@ -1,17 +1,155 @@
 # ab_sim/policy/assign.py
 from dataclasses import dataclass
 
+import numpy as np
+
 from ab_sim.app.protocols import MatchingPolicy
-from ab_sim.domain.state import WorldState
+from ab_sim.domain.state import Driver, TripState, WorldState
+from ab_sim.policy.assignment import auction_assign
+from ab_sim.services.snapping import GridIndex
 
 
 @dataclass
 class NearestAssignMatchingPolicy(MatchingPolicy):
     world: WorldState
 
+    def select_driver(self, trip: TripState, now: float) -> Driver | None:
+        return self.world.get_idle_driver()  # any idle driver
+
     # Example # Emit business-only enrichment (does not affect sim)
     # self.hooks.biz(TripMatchedBiz(
     #     run_id="unknown", t=now, seq=seq, name="TripMatched",  # run_id is set by KernelJSONHooks if you want; or pass it here
     #     rider_id=rider_id, driver_id=did, task_id=self.world.drivers[did].task_id,
     #     score=score, eta_s=eta_s
     # ))
+
+
+class TopKMatchingPolicy(MatchingPolicy):
+    """
+    Real-time nearest-ETA matching: the k idle drivers nearest the pickup (straight line,
+    from the world's idle grid) are priced with the travel-time service, and the fastest
+    one within max_eta_s wins. distance / vmax_mps lower-bounds every ETA, so candidates
+    are visited nearest first and routing stops as soon as the bound exceeds the best ETA.
+    """
+
+    def __init__(
+        self,
+        world: WorldState,
+        travel_time,
+        *,
+        k: int = 8,
+        max_eta_s: float = 600.0,
+        vmax_mps: float = 30.0,
+    ):
+        self.world, self.travel_time = world, travel_time
+        self.k, self.max_eta_s, self.vmax_mps = int(k), float(max_eta_s), float(vmax_mps)
+        self.routed = 0  # exact ETAs computed
+        self.pruned = 0  # candidates skipped on the lower bound
+
+    def select_driver(self, trip: TripState, now: float) -> Driver | None:
+        cands = self.world.idle_grid.nearest(
+            trip.origin, self.k, max_dist=self.max_eta_s * self.vmax_mps
+        )
+        best, best_eta = None, self.max_eta_s
+        for n, (dist, did) in enumerate(cands):
+            if dist / self.vmax_mps > best_eta:
+                self.pruned += len(cands) - n
+                break
+            d = self.world.drivers[did]
+            eta = self.travel_time.duration_to_pickup(d, trip, now)
+            self.routed += 1
+            if eta < best_eta or (best is None and eta == best_eta):
+                best, best_eta = d, eta
+        return None if best is None else self.world.take_idle(best.id)
+
+
+class BatchAssignMatchingPolicy(MatchingPolicy):
+    """
+    Periodic batch matching: every interval_s the demand handler hands over the queued
+    riders; they are matched to idle drivers (and drivers finishing a dropoff within
+    soon_idle_s) by a min-cost assignment over ETAs.
+
+    ETAs are a vectorized proxy, distance (L1 or L2 x detour) / speed_mps plus the time a
+    busy driver still needs; only each rider's k_candidates nearest drivers within
+    max_eta_s are priced, pruned further by the mechanics' isochrones when present.
+    A rider left unmatched costs unassigned_cost_s and waits for the next batch.
+    """
+
+    def __init__(
+        self,
+        world: WorldState,
+        mechanics=None,
+        clock=None,
+        *,
+        interval_s: float = 10.0,
+        max_eta_s: float = 600.0,
+        k_candidates: int = 8,
+        soon_idle_s: float = 0.0,
+        unassigned_cost_s: float | None = None,
+        eps_s: float = 0.1,
+        speed_mps: float = 8.0,
+        metric: str = "l2",
+        detour: float = 1.0,
+    ):
+        self.world, self.mechanics, self.clock = world, mechanics, clock
+        self.interval_s, self.max_eta_s = float(interval_s), float(max_eta_s)
+        self.k, self.soon_idle_s = int(k_candidates), float(soon_idle_s)
+        self.unassigned_cost_s = (
+            2.0 * self.max_eta_s if unassigned_cost_s is None else float(unassigned_cost_s)
+        )
+        self.eps_s, self.speed_mps = float(eps_s), float(speed_mps)
+        self.metric, self.detour = metric, float(detour)
+
+    def candidates(self, now: float, exclude=()) -> tuple[list[int], np.ndarray, np.ndarray]:
+        """Driver ids, their (x, y) when free and the seconds until they are free."""
+        ids = sorted(self.world.idle_driver_ids)
+        xy = [(self.world.drivers[i].loc.x, self.world.drivers[i].loc.y) for i in ids]
+        wait = [0.0] * len(ids)
+        if self.soon_idle_s > 0:
+            for d in self.world.drivers.values():
+                m = d.motion
+                if d.state != "to_dropoff" or m is None or d.id in exclude:
+                    continue
+                if m.end_t <= now + self.soon_idle_s:
+                    end = m.tasks[-1].end
+                    ids.append(d.id)
+                    xy.append((end.x, end.y))
+                    wait.append(max(m.end_t - now, 0.0))
+        return ids, np.asarray(xy, dtype=float).reshape(-1, 2), np.asarray(wait)
+
+    def assign(self, rider_ids, now: float, exclude=()) -> list[tuple[int, int]]:
+        """(rider_id, driver_id) pairs for this batch; exclude: drivers already promised."""
+        rider_ids = list(rider_ids)
+        d_ids, d_xy, wait = self.candidates(now, exclude)
+        if not rider_ids or not d_ids:
+            return []
+        r_xy = np.array(
+            [(self.world.riders[r].pickup.x, self.world.riders[r].pickup.y) for r in rider_ids],
+            dtype=float,
+        )
+
+        def dist(qi, it):
+            diff = np.abs(r_xy[qi] - d_xy[it])
+            return diff.sum(axis=1) if self.metric == "l1" else np.hypot(*diff.T)
+
+        reach = self.max_eta_s * self.speed_mps / self.detour
+        span = np.ptp(d_xy, axis=0).prod() if len(d_ids) > 1 else 0.0
+        cell = max(np.sqrt(span * self.k / len(d_ids)), 50.0)  # ~k drivers per cell
+        grid = GridIndex.for_points(d_xy, cell_m=cell)
+        rows, cols, dist_m = grid.nearest_k_many(r_xy, self.k, dist, max_dist=reach)
+        eta = dist_m * self.detour / self.speed_mps + wait[cols]
+        ok = eta <= self.max_eta_s
+        iso = getattr(self.mechanics, "isochrones", None)
+        if iso is not None and self.clock is not None:
+            hour = self.clock.dow_hour_at(now)["hour"]
+            ok[ok] = iso.can_reach_pairs(d_xy[cols[ok]], r_xy[rows[ok]], self.max_eta_s, hour)
+        match = auction_assign(
+            rows[ok],
+            cols[ok],
+            eta[ok],
+            len(rider_ids),
+            len(d_ids),
+            unassigned_cost=self.unassigned_cost_s,
+            eps_min=self.eps_s,
+        )
+        return [(rider_ids[r], d_ids[c]) for r, c in enumerate(match.tolist()) if c >= 0]
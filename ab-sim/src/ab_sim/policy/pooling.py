@@ -0,0 +1,134 @@
+# ab_sim/policy/pooling.py
+import math
+
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.state import IdleGrid, WorldState
+from ab_sim.policy.via_contraints import EtaFn, Insertion, Schedule, Stop, best_insertion
+
+
+class PoolingInsertionPolicy:
+    """
+    Ride pooling by cheapest insertion: a request's pickup and dropoff are inserted into
+    the stop sequence of one of the vehicles near the pickup, at the positions adding the
+    least vehicle time while every rider keeps
+        pickup by request time + max_wait_s (or the rider's own, if shorter)
+        dropoff by that pickup deadline + (1 + max_detour) x direct ride time
+    Deadlines count from the request, so a request retried later gets no fresh wait.
+    and no leg carries more than `capacity` riders (default: the world's capacity).
+
+    Vehicles are indexed by where their schedule starts; a vehicle can only reach the
+    pickup in time if that start is within (deadline - now) x vmax_mps, so the spatial
+    query is sound, and straight line / vmax_mps prunes positions before routing.
+    """
+
+    def __init__(
+        self,
+        world: WorldState,
+        eta: EtaFn,
+        *,
+        capacity: int | None = None,
+        max_wait_s: float = 300.0,
+        max_detour: float = 0.5,
+        k: int = 16,
+        vmax_mps: float = 30.0,
+        stop_s: float = 0.0,
+        cell_m: float = 500.0,
+    ):
+        self.world, self.eta = world, eta
+        self.capacity = int(capacity or world.capacity)
+        if self.capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.max_wait_s, self.max_detour = float(max_wait_s), float(max_detour)
+        self.k, self.vmax_mps, self.stop_s = int(k), float(vmax_mps), float(stop_s)
+        self.schedules: dict[int, Schedule] = {}
+        self.grid = IdleGrid(cell_m)  # vehicles by schedule start
+
+    def _lower_bound(self, a: Point, b: Point, t: float) -> float:
+        return math.hypot(b.x - a.x, b.y - a.y) / self.vmax_mps
+
+    def add_vehicle(self, driver_id: int, loc: Point, now: float) -> Schedule:
+        sched = Schedule(start=loc, t0=now, stop_s=self.stop_s).refresh(self.eta)
+        self.schedules[driver_id] = sched
+        self.grid.add(driver_id, loc)
+        return sched
+
+    def stops_for(
+        self,
+        rider_id: int,
+        pickup: Point,
+        dropoff: Point,
+        requested_t: float,
+        max_wait_s: float | None = None,
+        ready_t: float | None = None,
+    ):
+        wait = self.max_wait_s if max_wait_s is None else min(self.max_wait_s, max_wait_s)
+        direct = self.eta(pickup, dropoff, requested_t)
+        p_late = requested_t + wait
+        d_late = p_late + self.stop_s + (1.0 + self.max_detour) * direct
+        p_early = requested_t if ready_t is None else ready_t
+        return (
+            Stop("pickup", rider_id, pickup, p_late, p_early),
+            Stop("dropoff", rider_id, dropoff, d_late),
+        )
+
+    def best(self, pickup: Stop, dropoff: Stop, now: float) -> Insertion | None:
+        if pickup.latest_t < now:
+            return None
+        reach = (pickup.latest_t - now) * self.vmax_mps
+        best: Insertion | None = None
+        for dist, did in self.grid.nearest(pickup.at, self.k, max_dist=reach):
+            sched = self.schedules[did]
+            if not sched.stops and sched.t0 < now:
+                sched.t0 = now  # idle since t0: leaves from where it waits
+            if sched.t0 + dist / self.vmax_mps > pickup.latest_t:
+                continue
+            ins = best_insertion(
+                sched,
+                pickup,
+                dropoff,
+                self.eta,
+                capacity=self.capacity,
+                driver_id=did,
+                lower_bound=self._lower_bound,
+                cost_cap=best.cost_s if best else math.inf,
+                first=1 if sched.stops and sched.t0 < now else 0,  # already en route
+            )
+            best = ins or best
+        return best
+
+    def assign(
+        self,
+        rider_id: int,
+        pickup: Point,
+        dropoff: Point,
+        now: float,
+        *,
+        requested_t: float | None = None,
+        max_wait_s: float | None = None,
+        ready_t: float | None = None,
+    ) -> Insertion | None:
+        """
+        Insert the request into the best vehicle's schedule (None: nobody can take it).
+        requested_t: when the rider asked (default now); max_wait_s: the rider's own limit;
+        ready_t: when the rider reaches the pickup (default requested_t).
+        """
+        requested_t = now if requested_t is None else requested_t
+        p, d = self.stops_for(rider_id, pickup, dropoff, requested_t, max_wait_s, ready_t)
+        ins = self.best(p, d, now)
+        if ins is not None:
+            self.schedules[ins.driver_id].insert(ins, p, d, self.eta)
+        return ins
+
+    def hold(self, driver_id: int, until: float) -> None:
+        """The vehicle is at its next stop but cannot serve it before `until`."""
+        sched = self.schedules[driver_id]
+        head = sched.stops[0]
+        head.earliest_t = max(head.earliest_t, until)
+        sched.refresh(self.eta)
+
+    def served(self, driver_id: int, now: float) -> Stop:
+        """The vehicle reached its next stop at `now`."""
+        sched = self.schedules[driver_id]
+        stop = sched.pop_stop(now, self.eta)
+        self.grid.add(driver_id, sched.start)
+        return stop
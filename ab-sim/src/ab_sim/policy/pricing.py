@@ -1,11 +1,84 @@
 # ab_sim/policy/pricing.py
+import numpy as np
 
 from ab_sim.app.protocols import PricingPolicy
+from ab_sim.services.zone_counters import ZoneCounters
 
 
 class ConstantPricingPolicy(PricingPolicy):
     def __init__(self, fare: float = 0.0):
-        self.fare = fare
+        self.fare_amount = fare
+
+    def fare(self, driver, trip, now, distance_m: float | None = None) -> float:
+        return self.fare_amount
 
     def get_price(self):
-        return self.fare
+        return self.fare_amount
+
+
+class SurgePricingPolicy(PricingPolicy):
+    """
+    Distance fare (base + per_km, at least min_fare) times the pickup zone's multiplier.
+
+    Multipliers are recomputed every interval_s by update() from the ZoneCounters arrays:
+    open requests and idle drivers per zone are summed over the last window_s of samples
+    (a ring buffer with running sums, so one update is O(n_zones)), and
+        multiplier = clip(1 + sensitivity * (open / max(idle, 1) - threshold), 1, max_multiplier)
+    fare() is then a zone lookup plus an array read; nothing is recomputed per request.
+    The multiplier a rider pays is the one quoted when the trip was assigned (stored on
+    TripState.surge_multiplier), not whatever is in effect at drop-off.
+    """
+
+    def __init__(
+        self,
+        counters: ZoneCounters,
+        *,
+        base_fare: float = 2.5,
+        per_km: float = 1.5,
+        min_fare: float = 0.0,
+        interval_s: float = 60.0,
+        window_s: float = 300.0,
+        threshold: float = 1.0,
+        sensitivity: float = 0.5,
+        max_multiplier: float = 3.0,
+    ):
+        self.counters, self.zones = counters, counters.zones
+        self.base_fare, self.per_km, self.min_fare = base_fare, per_km, min_fare
+        self.interval_s = float(interval_s)
+        self.threshold, self.sensitivity = float(threshold), float(sensitivity)
+        self.max_multiplier = float(max_multiplier)
+        n, k = len(counters.idle), max(1, int(np.ceil(window_s / interval_s)))
+        self._open = np.zeros((k, n), dtype=np.int64)  # ring buffer of samples
+        self._idle = np.zeros((k, n), dtype=np.int64)
+        self._open_sum = np.zeros(n, dtype=np.int64)
+        self._idle_sum = np.zeros(n, dtype=np.int64)
+        self._slot = 0
+        self.multipliers = np.ones(n)
+
+    def update(self, now: float) -> np.ndarray:
+        """Sample the counters into the window and recompute every zone's multiplier."""
+        s = self._slot
+        self._open_sum += self.counters.open - self._open[s]
+        self._idle_sum += self.counters.idle - self._idle[s]
+        self._open[s], self._idle[s] = self.counters.open, self.counters.idle
+        self._slot = (s + 1) % len(self._open)
+        ratio = self._open_sum / np.maximum(self._idle_sum, 1)
+        raw = 1.0 + self.sensitivity * (ratio - self.threshold)
+        np.clip(raw, 1.0, self.max_multiplier, out=self.multipliers)
+        return self.multipliers
+
+    def multiplier(self, z: int) -> float:
+        return float(self.multipliers[z]) if z >= 0 else 1.0
+
+    def quote(self, trip, now) -> float:
+        """Multiplier in effect now at the trip's pickup zone (locked in at assignment)."""
+        return self.multiplier(self.zones.zone_of(trip.origin))
+
+    def fare(self, driver, trip, now, distance_m: float | None = None) -> float:
+        if distance_m is None:
+            distance_m = trip.route_length_m
+        if distance_m is None:
+            raise ValueError(f"no fare distance for rider {trip.rider_id}")
+        amount = max(self.base_fare + self.per_km * distance_m / 1000.0, self.min_fare)
+        mult = trip.surge_multiplier
+        return amount * (self.quote(trip, now) if mult is None else mult)
@@ -0,0 +1,145 @@
+# ab_sim/policy/rebalancing.py
+"""
+Zone-level rebalancing: every interval, idle drivers are redistributed toward zones in
+proportion to forecast demand by solving a small transportation problem between
+surplus and deficit zones. Inputs are the ZoneCounters arrays, so one plan costs
+O(n_zones^2) NumPy work (plus one pick per moved driver), whatever the fleet size.
+"""
+
+import numpy as np
+
+from ab_sim.app.protocols import RebalancingPolicy
+from ab_sim.domain.entities.geography import Point
+from ab_sim.services.zone_counters import ZoneCounters
+
+
+def transport(supply, demand, cost) -> np.ndarray:
+    """
+    Integer min-cost transportation plan (S, D) shipping min(sum supply, sum demand)
+    units, by successive shortest paths. Paths are found with Bellman-Ford on the
+    bipartite residual graph, each pass one (S, D) array operation; every augmentation
+    empties a source, fills a sink or clears an edge, so there are O(S + D) of them.
+    A node's predecessor is recorded only when its distance strictly improves, so ties
+    between equal-cost paths cannot turn the predecessor links into a cycle.
+    """
+    rs = np.asarray(supply, dtype=np.int64).copy()
+    rd = np.asarray(demand, dtype=np.int64).copy()
+    cost = np.asarray(cost, dtype=np.float64)
+    S, D = cost.shape
+    flow = np.zeros((S, D), dtype=np.int64)
+    cols, rows = np.arange(D), np.arange(S)
+    while rs.sum() > 0 and rd.sum() > 0:
+        ds = np.where(rs > 0, 0.0, np.inf)  # distance to each source
+        dd = np.full(D, np.inf)  # distance to each sink
+        src_of = np.full(D, -1)  # source each sink was reached from (forward edge)
+        via = np.full(S, -1)  # sink each source was reached from (back along a used edge)
+        for _ in range(S + D + 1):
+            tot = ds[:, None] + cost
+            best = tot.argmin(axis=0)
+            fwd_d = tot[best, cols]
+            up_d = fwd_d < dd - 1e-9
+            dd[up_d], src_of[up_d] = fwd_d[up_d], best[up_d]
+            back = np.where(flow > 0, dd[None, :] - cost, np.inf)
+            bd = back.argmin(axis=1)
+            back_s = back[rows, bd]
+            up_s = back_s < ds - 1e-9
+            ds[up_s], via[up_s] = back_s[up_s], bd[up_s]
+            if not (up_d.any() or up_s.any()):
+                break
+        ends = np.flatnonzero(rd > 0)
+        d = int(ends[dd[ends].argmin()])
+        fwd, rev, seen = [], [], set()
+        s = int(src_of[d])
+        fwd.append((s, d))
+        while rs[s] == 0:  # walk back to the first source that still has supply
+            if s in seen:
+                raise RuntimeError("transport: cycle in shortest-path predecessors")
+            seen.add(s)
+            d2 = int(via[s])
+            rev.append((s, d2))
+            s = int(src_of[d2])
+            fwd.append((s, d2))
+        amount = min(rs[s], rd[d], *(flow[e] for e in rev))
+        for e in fwd:
+            flow[e] += amount
+        for e in rev:
+            flow[e] -= amount
+        rs[s] -= amount
+        rd[d] -= amount
+    return flow
+
+
+class ZoneRebalancingPolicy(RebalancingPolicy):
+    """
+    Target idle drivers per zone: the idle fleet split in proportion to forecast demand,
+    an exponentially smoothed request count per interval (or, given a DemandForecaster,
+    its snapshot) plus currently open requests.
+    Zones more than `slack` drivers above target send drivers to zones below it, along
+    the cheapest (straight line between zone centers / speed_mps) transportation plan,
+    at most max_moves drivers per interval.
+    """
+
+    def __init__(
+        self,
+        counters: ZoneCounters,
+        centers,
+        world,
+        *,
+        interval_s: float = 300.0,
+        alpha: float = 0.3,
+        slack: int = 1,
+        max_moves: int | None = None,
+        speed_mps: float = 8.0,
+        forecast=None,
+    ):
+        self.counters, self.world = counters, world
+        self.centers = np.asarray(centers, dtype=np.float64)
+        self.interval_s, self.alpha = float(interval_s), float(alpha)
+        self.slack, self.max_moves = int(slack), max_moves
+        diff = self.centers[:, None, :] - self.centers[None, :, :]
+        self.cost_s = np.hypot(diff[..., 0], diff[..., 1]) / float(speed_mps)
+        self.rate: np.ndarray | None = None  # smoothed requests per interval
+        self._seen = counters.requests.copy()
+        self.forecaster = forecast  # services.demand_forecast.DemandForecaster
+
+    def forecast(self, now: float) -> np.ndarray:
+        if self.forecaster is not None:
+            return self.forecaster.snapshot(now) + self.counters.open
+        new = self.counters.requests - self._seen
+        self._seen = self.counters.requests.copy()
+        if self.rate is None:
+            self.rate = new.astype(np.float64)
+        else:
+            self.rate = self.alpha * new + (1.0 - self.alpha) * self.rate
+        return self.rate + self.counters.open
+
+    def targets(self, weight: np.ndarray) -> np.ndarray:
+        idle = self.counters.idle
+        if weight.sum() <= 0:
+            return idle.copy()
+        return np.floor(idle.sum() * weight / weight.sum()).astype(np.int64)
+
+    def plan(self, now: float) -> list[tuple[int, Point]]:
+        """(driver_id, target point) moves for this interval."""
+        target = self.targets(self.forecast(now))
+        idle = self.counters.idle
+        surplus = np.maximum(idle - target - self.slack, 0)
+        deficit = np.maximum(target - idle, 0)
+        if self.max_moves is not None and surplus.sum() > self.max_moves:
+            surplus = np.floor(surplus * self.max_moves / surplus.sum()).astype(np.int64)
+        src, dst = np.flatnonzero(surplus), np.flatnonzero(deficit)
+        if len(src) == 0 or len(dst) == 0:
+            return []
+        flow = transport(surplus[src], deficit[dst], self.cost_s[np.ix_(src, dst)])
+        moves, taken = [], set()
+        for a, b in zip(*np.nonzero(flow), strict=True):
+            z_from, z_to, n = int(src[a]), int(dst[b]), int(flow[a, b])
+            to = Point(*self.centers[z_to].tolist())
+            for did in sorted(self.counters.idle_ids[z_from]):
+                if n == 0:
+                    break
+                if did not in taken and self.world.drivers[did].state == "idle":
+                    moves.append((did, to))
+                    taken.add(did)
+                    n -= 1
+        return moves
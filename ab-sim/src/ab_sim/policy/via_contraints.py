@@ -0,0 +1,173 @@
+# ab_sim/policy/via_contraints.py
+"""
+Stop sequences for pooled vehicles and cheapest feasible insertion of a new request.
+
+A Schedule caches, per stop, the planned arrival time and its slack: how much later the
+vehicle may reach that stop without any stop from there on missing its deadline (a
+suffix minimum of latest_t - arrival). Inserting a pickup before stop i delays every
+later stop by at most the same detour (waiting for a rider at a pickup can absorb some
+of it), so one comparison against slack[i] settles feasibility for the whole tail; no
+candidate sequence is ever re-timed stop by stop.
+
+best_insertion scans pickup positions i and dropoff positions j >= i. Legs into and out
+of the dropoff depend on j only and are routed once per j (timed at the undelayed
+schedule, exact for time-independent ETAs); deadlines only get harder with i and j, so
+both loops stop at the first position whose earliest arrival is already too late, and
+seat counts bound how far j may run. Routing is linear in the number of stops, the
+remaining scan is plain arithmetic.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from ab_sim.domain.entities.geography import Point
+from ab_sim.models.capacity import leg_loads, seat_free_until
+
+EtaFn = Callable[[Point, Point, float], float]  # (a, b, depart_t) -> seconds
+
+
+@dataclass
+class Stop:
+    kind: Literal["pickup", "dropoff"]
+    rider_id: int
+    at: Point
+    latest_t: float  # pickup: max wait; dropoff: max ride time incl. detour
+    earliest_t: float = float("-inf")  # pickup: when the rider is there to board
+
+
+@dataclass
+class Insertion:
+    driver_id: int
+    i: int  # pickup goes before stop i
+    j: int  # dropoff goes before stop j of the original sequence (j >= i)
+    cost_s: float  # added vehicle time
+    pickup_t: float
+    dropoff_t: float
+
+
+@dataclass
+class Schedule:
+    """Stops a vehicle still has to serve, starting from `start` at time t0."""
+
+    start: Point
+    t0: float
+    load0: int = 0
+    stops: list[Stop] = field(default_factory=list)
+    stop_s: float = 0.0  # dwell at every stop
+    # caches, rebuilt by refresh()
+    arr: list[float] = field(default_factory=list)
+    slack: list[float] = field(default_factory=list)
+    legs: list[float] = field(default_factory=list)  # legs[k]: previous point -> stop k
+    loads: list[int] = field(default_factory=list)
+
+    def point(self, k: int) -> Point:
+        """Where the vehicle is before stop k (k = 0: the start)."""
+        return self.start if k == 0 else self.stops[k - 1].at
+
+    def depart(self, k: int) -> float:
+        """When the vehicle leaves point(k)."""
+        return self.t0 if k == 0 else self.arr[k - 1] + self.stop_s
+
+    def refresh(self, eta: EtaFn) -> "Schedule":
+        n = len(self.stops)
+        self.legs, self.arr = [0.0] * n, [0.0] * n
+        for k, s in enumerate(self.stops):
+            self.legs[k] = eta(self.point(k), s.at, self.depart(k))
+            self.arr[k] = max(self.depart(k) + self.legs[k], s.earliest_t)
+        self.slack = [float("inf")] * (n + 1)
+        for k in range(n - 1, -1, -1):
+            self.slack[k] = min(self.slack[k + 1], self.stops[k].latest_t - self.arr[k])
+        self.loads = leg_loads(self.load0, [s.kind for s in self.stops])
+        return self
+
+    @property
+    def end_t(self) -> float:
+        return self.arr[-1] + self.stop_s if self.stops else self.t0
+
+    def insert(self, ins: Insertion, pickup: Stop, dropoff: Stop, eta: EtaFn) -> None:
+        self.stops.insert(ins.j, dropoff)
+        self.stops.insert(ins.i, pickup)
+        self.refresh(eta)
+
+    def pop_stop(self, now: float, eta: EtaFn) -> Stop:
+        """Vehicle served the first stop at `now`: it becomes the new start."""
+        s = self.stops.pop(0)
+        self.start, self.t0 = s.at, now + self.stop_s
+        self.load0 += 1 if s.kind == "pickup" else -1
+        self.refresh(eta)
+        return s
+
+
+def best_insertion(
+    sched: Schedule,
+    pickup: Stop,
+    dropoff: Stop,
+    eta: EtaFn,
+    *,
+    capacity: int,
+    driver_id: int = -1,
+    lower_bound: EtaFn | None = None,
+    cost_cap: float = float("inf"),
+    first: int = 0,
+) -> Insertion | None:
+    """
+    Cheapest (added vehicle time) feasible way to serve pickup then dropoff, or None.
+    lower_bound(a, b, t) <= eta(a, b, t) lets hopeless positions skip routing; only
+    insertions cheaper than cost_cap are looked for; first=1 keeps the leg the vehicle
+    is already driving.
+    """
+    n, w = len(sched.stops), sched.stop_s
+    free = seat_free_until(sched.loads, capacity)
+    lb = lower_bound or (lambda a, b, t: 0.0)
+    drop_legs: dict[int, tuple[float, float]] = {}  # j -> (into dropoff, dropoff -> stop j)
+    best: Insertion | None = None
+
+    for i in range(first, n + 1):
+        if free[i] <= i:
+            continue  # full on the leg into stop i: nobody can board there
+        dep = sched.depart(i)
+        if dep + lb(sched.point(i), pickup.at, dep) > pickup.latest_t:
+            if dep > pickup.latest_t:
+                break  # later positions leave even later
+            continue
+        t_p = max(dep + eta(sched.point(i), pickup.at, dep), pickup.earliest_t)
+        if t_p > pickup.latest_t:
+            continue
+        to_p = t_p - dep  # driving there, then waiting for the rider
+        # pickup followed directly by the dropoff, then stop i
+        p_to_d = eta(pickup.at, dropoff.at, t_p + w)
+        t_d = t_p + w + p_to_d
+        if t_d <= dropoff.latest_t:
+            cost = to_p + w + p_to_d + w
+            if i < n:
+                cost += eta(dropoff.at, sched.stops[i].at, t_d + w) - sched.legs[i]
+            if cost < cost_cap and (i == n or cost <= sched.slack[i]):
+                best = Insertion(driver_id, i, i, cost, t_p, t_d)
+                cost_cap = cost
+        if i == n:
+            continue
+        # pickup before stop i, dropoff later: stop i onward is delayed by d_p
+        d_p = to_p + w + eta(pickup.at, sched.stops[i].at, t_p + w) - sched.legs[i]
+        if d_p > sched.slack[i] or d_p >= cost_cap:
+            continue
+        for j in range(i + 1, min(free[i], n + 1)):
+            t_prev = sched.arr[j - 1] + d_p + w  # leave stop j - 1
+            if t_prev > dropoff.latest_t:
+                break
+            if j not in drop_legs:  # timed as if undelayed, shared by every i
+                t_dep = sched.arr[j - 1] + w
+                into = eta(sched.stops[j - 1].at, dropoff.at, t_dep)
+                out = eta(dropoff.at, sched.stops[j].at, t_dep + into + w) if j < n else 0.0
+                drop_legs[j] = (into, out)
+            into, out = drop_legs[j]
+            t_d = t_prev + into
+            d_d = into + w + (out - sched.legs[j] if j < n else 0.0)
+            cost = d_p + d_d
+            if t_d > dropoff.latest_t or cost >= cost_cap:
+                continue
+            if j < n and cost > sched.slack[j]:
+                continue
+            best = Insertion(driver_id, i, j, cost, t_p, t_d)
+            cost_cap = cost
+    return best
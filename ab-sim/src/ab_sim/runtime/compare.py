@@ -0,0 +1,46 @@
+# ab_sim/runtime/compare.py
+from collections.abc import Callable, Iterable, Mapping
+
+from ab_sim.app.build import App, build
+from ab_sim.config.models import ScenarioModel
+from ab_sim.sim.variance import PairedReport, paired_comparison
+
+
+def _replica(cfg: ScenarioModel | Mapping, seed: int, antithetic: bool) -> ScenarioModel:
+    model = cfg if isinstance(cfg, ScenarioModel) else ScenarioModel.model_validate(cfg)
+    sim = model.sim.model_copy(
+        update={"seed": seed, "common_random_numbers": True, "antithetic": antithetic}
+    )
+    return model.model_copy(update={"sim": sim})
+
+
+def run_paired(
+    cfg_a: ScenarioModel | Mapping,
+    cfg_b: ScenarioModel | Mapping,
+    metric: Callable[[App], float],
+    seeds: Iterable[int],
+    *,
+    antithetic: bool = False,
+    setup: Callable[[App], None] | None = None,
+    worker: int = 0,
+) -> PairedReport:
+    """
+    Run both scenarios once per seed on common random numbers (plus a mirrored replica
+    each with antithetic=True) and compare metric(app) pairwise.
+    setup(app) runs after build, e.g. to schedule driver shifts.
+    """
+    out: dict[tuple[str, bool], list[float]] = {}
+    for seed in seeds:
+        for tag, cfg in (("a", cfg_a), ("b", cfg_b)):
+            for anti in (False, True) if antithetic else (False,):
+                model = _replica(cfg, seed, anti)
+                with build(model, worker=worker, use_logging=False) as app:
+                    if setup is not None:
+                        setup(app)
+                    app.kernel.run(until=float(model.sim.duration))
+                    out.setdefault((tag, anti), []).append(float(metric(app)))
+    if antithetic:
+        return paired_comparison(
+            out["a", False], out["b", False], a_anti=out["a", True], b_anti=out["b", True]
+        )
+    return paired_comparison(out["a", False], out["b", False])
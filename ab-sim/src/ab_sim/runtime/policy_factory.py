@@ -1,19 +1,41 @@
-from ab_sim.app.protocols import DwellPolicy, IdlePolicy, MatchingPolicy, PricingPolicy
+from ab_sim.app.protocols import (
+    DispatchPolicy,
+    DwellPolicy,
+    IdlePolicy,
+    MatchingPolicy,
+    PricingPolicy,
+    RebalancingPolicy,
+)
 from ab_sim.config.models import (
+    DispatchPolicyUnion,
+    DispatchPoolingModel,
+    DispatchTopKModel,
     DwellPolicyExpBoardAlightModel,
     DwellPolicyUnion,
     IdlePolicyCirculatingModel,
     IdlePolicyUnion,
+    MatchingPolicyBatchAssignModel,
     MatchingPolicyNearestAssignModel,
+    MatchingPolicyTopKModel,
     MatchingPolicyUnion,
     PricingPolicyConstantModel,
+    PricingPolicySurgeModel,
     PricingPolicyUnion,
+    RebalancingPolicyUnion,
+    RebalancingZoneFlowModel,
 )
 from ab_sim.domain.state import WorldState
+from ab_sim.policy.dispatch import TopKDispatchPolicy
 from ab_sim.policy.dwell import ExpBoardingAlightingPolicy
 from ab_sim.policy.idle import CirculatingIdlePolicy
-from ab_sim.policy.matching import NearestAssignMatchingPolicy
-from ab_sim.policy.pricing import ConstantPricingPolicy
+from ab_sim.policy.matching import (
+    BatchAssignMatchingPolicy,
+    NearestAssignMatchingPolicy,
+    TopKMatchingPolicy,
+)
+from ab_sim.policy.pooling import PoolingInsertionPolicy
+from ab_sim.policy.pricing import ConstantPricingPolicy, SurgePricingPolicy
+from ab_sim.policy.rebalancing import ZoneRebalancingPolicy
 from ab_sim.sim.rng import RNGRegistry
 
 
@@ -23,6 +45,7 @@ def make_dwell_policy(cfg: DwellPolicyUnion, *, rng_registry: RNGRegistry) -> Dw
             rng_registry=rng_registry,
             board_mean_s=cfg.board_mean_s,
             alight_mean_s=cfg.alight_mean_s,
+            block_size=cfg.block_size,
         )
         return dp
     else:
@@ -39,17 +62,118 @@ def make_idle_policy(cfg: IdlePolicyUnion) -> IdlePolicy:
         raise TypeError(cfg)
 
 
-def make_matching_policy(cfg: MatchingPolicyUnion, world: WorldState) -> MatchingPolicy:
+def make_matching_policy(
+    cfg: MatchingPolicyUnion, world: WorldState, *, mechanics=None, clock=None, travel_time=None
+) -> MatchingPolicy:
     if isinstance(cfg, MatchingPolicyNearestAssignModel):
         mp = NearestAssignMatchingPolicy(world=world)
         return mp
+    elif isinstance(cfg, MatchingPolicyTopKModel):
+        mp = TopKMatchingPolicy(
+            world, travel_time, k=cfg.k, max_eta_s=cfg.max_eta_s, vmax_mps=cfg.vmax_mps
+        )
+        return mp
+    elif isinstance(cfg, MatchingPolicyBatchAssignModel):
+        mp = BatchAssignMatchingPolicy(
+            world,
+            mechanics,
+            clock,
+            interval_s=cfg.interval_s,
+            max_eta_s=cfg.max_eta_s,
+            k_candidates=cfg.k_candidates,
+            soon_idle_s=cfg.soon_idle_s,
+            unassigned_cost_s=cfg.unassigned_cost_s,
+            eps_s=cfg.eps_s,
+            speed_mps=cfg.speed_mps,
+            metric=cfg.metric,
+            detour=cfg.detour,
+        )
+        return mp
     else:
         raise TypeError(cfg)
 
 
-def make_pricing_policy(cfg: PricingPolicyUnion) -> PricingPolicy:
+def make_pricing_policy(cfg: PricingPolicyUnion, *, counters=None) -> PricingPolicy:
     if isinstance(cfg, PricingPolicyConstantModel):
         mp = ConstantPricingPolicy(fare=cfg.fare)
         return mp
+    elif isinstance(cfg, PricingPolicySurgeModel):
+        if counters is None:
+            raise ValueError("pricing.kind='surge' needs mechanics.zones")
+        mp = SurgePricingPolicy(
+            counters,
+            base_fare=cfg.base_fare,
+            per_km=cfg.per_km,
+            min_fare=cfg.min_fare,
+            interval_s=cfg.interval_s,
+            window_s=cfg.window_s,
+            threshold=cfg.threshold,
+            sensitivity=cfg.sensitivity,
+            max_multiplier=cfg.max_multiplier,
+        )
+        return mp
+    else:
+        raise TypeError(cfg)
+
+
+def make_dispatch_policy(
+    cfg: DispatchPolicyUnion,
+    world: WorldState,
+    *,
+    rng_registry: RNGRegistry,
+    mechanics=None,
+    clock=None,
+) -> DispatchPolicy | PoolingInsertionPolicy:
+    if isinstance(cfg, DispatchTopKModel):
+        dp = TopKDispatchPolicy(
+            world,
+            rng_registry.buffered("dispatch", block=cfg.block),
+            k=cfg.k,
+            max_pickup_m=cfg.max_pickup_m if cfg.max_pickup_m is not None else float("inf"),
+            timeout_s=cfg.timeout_s,
+            p_accept=cfg.p_accept,
+            accept_decay_m=cfg.accept_decay_m,
+            mean_response_s=cfg.mean_response_s,
+        )
+        return dp
+    elif isinstance(cfg, DispatchPoolingModel):
+
+        def eta(a, b, t):  # Mechanics.eta_s is the arrival time
+            return mechanics.eta_s(a, b, t, **clock.dow_hour_at(t)) - t
+
+        dp = PoolingInsertionPolicy(
+            world,
+            eta,
+            capacity=cfg.capacity,
+            max_wait_s=cfg.max_wait_s,
+            max_detour=cfg.max_detour,
+            k=cfg.k,
+            vmax_mps=cfg.vmax_mps,
+            stop_s=cfg.stop_s,
+            cell_m=cfg.cell_m,
+        )
+        return dp
+    else:
+        raise TypeError(cfg)
+
+
+def make_rebalancing_policy(
+    cfg: RebalancingPolicyUnion, world: WorldState, *, mechanics, counters, forecast=None
+) -> RebalancingPolicy:
+    if isinstance(cfg, RebalancingZoneFlowModel):
+        if mechanics.zones is None:
+            raise ValueError("rebalancing.kind='zone_flow' needs mechanics.zones")
+        rp = ZoneRebalancingPolicy(
+            counters,
+            mechanics.zones.centroids(),
+            world,
+            interval_s=cfg.interval_s,
+            alpha=cfg.alpha,
+            slack=cfg.slack,
+            max_moves=cfg.max_moves,
+            speed_mps=cfg.speed_mps,
+            forecast=forecast,
+        )
+        return rp
     else:
         raise TypeError(cfg)
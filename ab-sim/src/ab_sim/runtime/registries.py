@@ -19,22 +19,28 @@ from ab_sim.config.models import (
     ODUnion,
     PathTraverserPiecewiseConstModel,
     PathTraverserUnion,
+    PathTraverserVectorizedModel,
     RoutePlannerEuclideanModel,
     RoutePlannerManhattanModel,
     RoutePlannerNetworkModel,
     RoutePlannerUnion,
+    SnapperModel,
     SpeedSamplerConstantModel,
     SpeedSamplerDistributionModel,
     SpeedSamplerEdgeAwareModel,
     SpeedSamplerGlobalModel,
     SpeedSamplerUnion,
 )
+from ab_sim.domain.mechanics.mechanics_landmarks import add_landmarks
 from ab_sim.domain.mechanics.mechanics_od_samplers import (
     EmpiricalODSampler,
     IdealizedODSampler,
     NetworkODSampler,
 )
-from ab_sim.domain.mechanics.mechanics_path_traversers import PiecewiseConstSpeedTraverser
+from ab_sim.domain.mechanics.mechanics_path_traversers import (
+    PiecewiseConstSpeedTraverser,
+    VectorizedSpeedTraverser,
+)
 from ab_sim.domain.mechanics.mechanics_route_planners import (
     EuclidRoutePlanner,
     ManhattanRoutePlanner,
@@ -45,8 +51,12 @@ from ab_sim.domain.mechanics.mechanics_speed_samplers import (
     DistDrawSpeedSampler,
     EdgeAwareSpeedSampler,
     GlobalSpeedSampler,
+    compile_dow_hour_factors,
+    compile_edge_factors,
 )
+from ab_sim.domain.mechanics.mechanics_td_weights import TimeDependentWeights
 from ab_sim.runtime.resources import load_graph_from_path
+from ab_sim.services.snapping import SnapService
 
 SpeedFactory = Callable[[SpeedSamplerUnion, Any], SpeedSampler]
 ODFactory = Callable[[ODUnion, dict], OriginDestinationSampler]
@@ -85,17 +95,22 @@ def _make_global(cfg: SpeedSamplerGlobalModel, deps):
 
 @register_speed("constant")
 def _make_const(cfg: SpeedSamplerConstantModel, deps):
-    return ConstantSpeedSampler(cfg.v_mps)
+    return ConstantSpeedSampler(cfg.pickup_mps, cfg.dropoff_mps)
 
 
 @register_speed("distribution")
 def _make_dist(cfg: SpeedSamplerDistributionModel, deps):
-    return DistDrawSpeedSampler(deps["rng"], cfg.dist, cfg.params, cfg.fallback_mps)
+    return DistDrawSpeedSampler(
+        deps["rng"], cfg.dist, cfg.params, cfg.fallback_mps, block_size=cfg.block_size
+    )
 
 
 @register_speed("edge_aware")
 def _make_edge(cfg: SpeedSamplerEdgeAwareModel, deps):
-    return EdgeAwareSpeedSampler(cfg.base_mps, cfg.tfac, cfg.efac)
+    # compile dict config into dense (7, 24) / (n_edges,) lookup arrays once, at build time
+    return EdgeAwareSpeedSampler(
+        cfg.base_mps, compile_dow_hour_factors(cfg.tfac), compile_edge_factors(cfg.efac)
+    )
 
 
 # ----- Origin/Destination Samplers --------------------------
@@ -130,7 +145,7 @@ def resolve_graph(ref: GraphRef | None, *, deps: dict):
     if isinstance(ref, GraphByName):
         return deps["graphs"][ref.name]  # raises KeyError if missing
     if isinstance(ref, GraphByPath):
-        g = load_graph_from_path(ref.file, ref.fmt)
+        g = load_graph_from_path(ref.file, ref.fmt, ref.nodes)
         if ref.must_exist and g is None:
             raise FileNotFoundError(ref.file)
         return g
@@ -144,7 +159,9 @@ def make_od(cfg: ODUnion, *, deps: dict = {}) -> OriginDestinationSampler:
 @register_od("idealized")
 def _make_uniform(cfg: ODSamplerIdealizedModel, deps):
     rng = deps["rng"]
-    return IdealizedODSampler(zones=cfg.zones, weights=(cfg.weights or None), rng=rng)
+    return IdealizedODSampler(
+        zones=cfg.zones, weights=(cfg.weights or None), rng=rng, block_size=cfg.block_size
+    )
 
 
 @register_od("empirical")
@@ -187,7 +204,16 @@ def _make_manhattan(cfg: RoutePlannerManhattanModel, deps):
 @register_route_planner("network")
 def _make_route_planner_network(cfg: RoutePlannerNetworkModel, deps):
     g = resolve_graph(cfg.graph, deps=deps)
-    return NetworkRoutePlanner(graph=g, vmax_mps=cfg.vmax_mps)
+    if cfg.heuristic == "alt" and "alt_from" not in g.extras:
+        g = add_landmarks(g, cfg.landmarks)  # the shared graph is not modified
+    td = None
+    if cfg.time_dependent:
+        td = TimeDependentWeights.from_speed_sampler(
+            g, deps["speed_sampler"], clock=deps.get("clock"), bin_s=cfg.td_bin_s
+        )
+    return NetworkRoutePlanner(
+        graph=g, vmax_mps=cfg.vmax_mps, heuristic=cfg.heuristic, td_weights=td
+    )
 
 
 # ---------------------- Path Traversers ----------------------------
@@ -208,3 +234,24 @@ def make_path_traverser(cfg: RoutePlannerUnion, *, deps: dict = {}) -> PathTrave
 @register_path_traverser("piecewise_const")
 def _make_piecewise_const(cfg: PathTraverserPiecewiseConstModel, deps):
     return PiecewiseConstSpeedTraverser()
+
+
+@register_path_traverser("vectorized")
+def _make_vectorized(cfg: PathTraverserVectorizedModel, deps):
+    return VectorizedSpeedTraverser()
+
+
+# ---------------------- Snapping ----------------------------
+
+
+def make_snapper(cfg: SnapperModel, *, deps: dict | None = None) -> SnapService:
+    deps = deps or {}
+    g = resolve_graph(cfg.graph, deps=deps)
+    return SnapService.from_graph(
+        g,
+        index=cfg.index,
+        target=cfg.target,
+        cell_m=cfg.cell_m,
+        cache_quantum_m=cfg.cache_quantum_m,
+        cache_size=cfg.cache_size,
+    )
@@ -2,15 +2,19 @@
 import pickle
 from functools import lru_cache
 
-# import networkx as nx
+from ab_sim.io.graph_format import graph_from_edge_list, graph_from_graphml, load_graph
 
 
 @lru_cache(maxsize=8)
-def load_graph_from_path(file: str, fmt: str):
+def load_graph_from_path(file: str, fmt: str, nodes: str | None = None):
+    if fmt == "npy":
+        # memory-mapped; prefer this (convert once with ab_sim.io.graph_format.convert)
+        return load_graph(file)
     if fmt == "pickle":
         with open(file, "rb") as f:
             return pickle.load(f)
-    # if fmt == "graphml":
-    #     return nx.read_graphml(file)
-    # add other formats you support
+    if fmt == "graphml":
+        return graph_from_graphml(file)
+    if fmt in ("parquet", "csv"):
+        return graph_from_edge_list(file, nodes=nodes)
     raise ValueError(f"Unsupported graph fmt {fmt!r}")
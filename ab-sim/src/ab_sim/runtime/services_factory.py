@@ -1,15 +1,33 @@
 # ab_sim/runtime/services_factory.py
+from ab_sim.app.controllers.rider_arrivals import RiderArrivalController
 from ab_sim.config.models import (
+    DemandDayAheadModel,
+    DemandForecastModel,
+    DemandUnion,
     TravelTimeServiceFixedModel,
     TravelTimeServiceMechanicsModel,
     TravelTimeUnion,
 )
+from ab_sim.domain.mechanics.mechanics_demand_generators import DayAheadDemandGenerator
+from ab_sim.services.demand_forecast import DemandForecaster
 from ab_sim.services.travel_time import FixedDurationTravelTime, MechanicsTravelTime  # your classes
+from ab_sim.sim.clock import SimClock
 
 
-def make_travel_time(cfg: TravelTimeUnion, *, mechanics) -> MechanicsTravelTime:
+def make_travel_time(
+    cfg: TravelTimeUnion, *, mechanics, clock: SimClock | None = None
+) -> MechanicsTravelTime:
     if isinstance(cfg, TravelTimeServiceMechanicsModel):
-        tt = MechanicsTravelTime(mechanics)
+        tt = MechanicsTravelTime(
+            mechanics,
+            method=cfg.method,
+            min_speed_mps=cfg.min_speed_mps,
+            clock=clock,
+            exact=cfg.exact,
+            memo_size=cfg.memo_size,
+            bucket_s=cfg.bucket_s,
+            quantum_m=cfg.quantum_m,
+        )
         return tt
     elif isinstance(cfg, TravelTimeServiceFixedModel):
         return FixedDurationTravelTime(
@@ -19,3 +37,56 @@ def make_travel_time(cfg: TravelTimeUnion, *, mechanics) -> MechanicsTravelTime:
         )
     else:
         raise TypeError(cfg)
+
+
+def make_rider_arrivals(
+    cfg: DemandUnion, *, clock: SimClock, rng, mechanics
+) -> RiderArrivalController:
+    if isinstance(cfg, DemandDayAheadModel):
+        od = mechanics.od_sampler
+        zones = cfg.zones if cfg.zones is not None else getattr(od, "zones", None)
+        if not zones:
+            raise ValueError("day_ahead demand needs zones (config or idealized OD sampler)")
+        origin_w = cfg.origin_weights
+        dest_w = cfg.dest_weights
+        if cfg.zones is None:
+            # reuse the OD sampler's zone weights unless overridden
+            od_w = getattr(od, "weights", None) or None
+            origin_w = origin_w if origin_w is not None else od_w
+            dest_w = dest_w if dest_w is not None else od_w
+        gen = DayAheadDemandGenerator(
+            rates=cfg.zone_hourly_rate if cfg.zone_hourly_rate is not None else cfg.hourly_rate,
+            clock=clock,
+            rng=rng,
+            zones=zones,
+            origin_weights=origin_w,
+            dest_weights=dest_w,
+            method=cfg.method,
+            scale=cfg.scale,
+            walk_mean_s=cfg.walk_mean_s,
+            max_wait_s=cfg.max_wait_s,
+        )
+        return RiderArrivalController(
+            gen, first_rider_id=cfg.first_rider_id, snapper=getattr(mechanics, "snapper", None)
+        )
+    else:
+        raise TypeError(cfg)
+
+
+def make_demand_forecast(
+    cfg: DemandForecastModel, *, mechanics, clock: SimClock
+) -> DemandForecaster:
+    if mechanics.zones is None:
+        raise ValueError("forecast needs mechanics.zones")
+    profile, bin_s = None, cfg.bin_s
+    if cfg.profile_path is not None:
+        profile, bin_s = DemandForecaster.load_profile(cfg.profile_path)
+    return DemandForecaster(
+        mechanics.zones,
+        clock=clock,
+        tau_s=cfg.tau_s,
+        horizon_s=cfg.horizon_s,
+        bin_s=bin_s,
+        profile=profile,
+        recent_weight=cfg.recent_weight,
+    )
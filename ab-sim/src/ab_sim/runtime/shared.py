@@ -0,0 +1,160 @@
+# ab_sim/runtime/shared.py
+"""
+Publish graphs and lookup tables (skims, spatial indexes) into
+multiprocessing.shared_memory once in the parent; workers attach zero-copy by name.
+
+Parent:
+    with SharedRegistry() as reg:
+        reg.publish_graph("city", load_graph_from_path(...))
+        reg.publish_tables("skims", {"tt_s": skim})
+        with ProcessPoolExecutor(32, initializer=attach, initargs=(reg.manifest(),)) as ex:
+            ...
+Worker:
+    app = build(cfg, worker=i, graphs=attached())   # GraphByName("city") resolves here
+
+The parent owns the segments and unlinks them on close() (or when the registry is
+garbage collected); workers only map them, and drop their mappings with detach(), which
+also runs at interpreter exit.
+"""
+
+import atexit
+import os
+import weakref
+from contextlib import suppress
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+from uuid import uuid4
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import NetworkGraph
+from ab_sim.services.snapping import GridIndex
+
+_CORE = ("node_xy", "indptr", "indices", "length_m", "edge_id")
+_owned: set[str] = set()  # segments created by this process (or its fork parent)
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    shm: str  # segment name
+    dtype: str
+    shape: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SharedEntry:
+    kind: str  # "graph" | "tables"
+    arrays: dict[str, SharedArray]
+    meta: dict = field(default_factory=dict)
+
+
+class SharedRegistry:
+    """Parent-side owner of shared segments; manifest() is the picklable handoff."""
+
+    def __init__(self, prefix: str | None = None):
+        self.prefix = prefix or f"absim-{uuid4().hex[:8]}"
+        self._entries: dict[str, SharedEntry] = {}
+        self._segments: list[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _release, self._segments)
+
+    def _put(self, name: str, key: str, a: np.ndarray) -> SharedArray:
+        a = np.ascontiguousarray(a)
+        shm = shared_memory.SharedMemory(
+            name=f"{self.prefix}-{name}-{key}", create=True, size=max(a.nbytes, 1)
+        )
+        self._segments.append(shm)
+        _owned.add(shm.name)
+        np.ndarray(a.shape, a.dtype, buffer=shm.buf)[...] = a
+        return SharedArray(shm.name, a.dtype.str, tuple(a.shape))
+
+    def _publish(self, name: str, kind: str, arrays: dict[str, np.ndarray], meta) -> SharedEntry:
+        if name in self._entries:
+            raise KeyError(f"{name!r} already published")
+        specs = {k: self._put(name, k, a) for k, a in arrays.items()}
+        entry = SharedEntry(kind, specs, dict(meta or {}))
+        self._entries[name] = entry
+        return entry
+
+    def publish_graph(
+        self, name: str, graph: NetworkGraph, *, node_index_cell_m: float | None = 250.0
+    ) -> SharedEntry:
+        """CSR arrays + extras; also a node grid index so workers skip rebuilding it."""
+        arrays = {k: getattr(graph, k) for k in _CORE} | dict(graph.extras)
+        if node_index_cell_m and "grid_items" not in arrays:
+            arrays |= GridIndex.for_points(graph.node_xy, node_index_cell_m).to_arrays()
+        return self._publish(name, "graph", arrays, graph.meta)
+
+    def publish_tables(self, name: str, tables: dict[str, np.ndarray], meta=None) -> SharedEntry:
+        """Arbitrary named arrays, e.g. OD skims or zone lookups."""
+        return self._publish(name, "tables", tables, meta)
+
+    def manifest(self) -> dict[str, SharedEntry]:
+        return dict(self._entries)
+
+    def close(self):
+        self._finalizer()  # idempotent
+        self._entries.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _release(segments: list[shared_memory.SharedMemory]) -> None:
+    for shm in segments:
+        _owned.discard(shm.name)
+        shm.close()
+        shm.unlink()
+    segments.clear()
+
+
+# ---------------- worker side ----------------
+
+_attached: dict[str, tuple[SharedEntry, object]] = {}
+_handles: list[shared_memory.SharedMemory] = []
+
+
+def _map(spec: SharedArray) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=spec.shm)
+    if spec.shm not in _owned and os.name == "posix":
+        # the parent owns the segment; stop this process's tracker unlinking it at exit
+        # (POSIX trackers key segments by their "/"-prefixed name)
+        resource_tracker.unregister("/" + shm.name, "shared_memory")
+    _handles.append(shm)
+    a = np.ndarray(spec.shape, np.dtype(spec.dtype), buffer=shm.buf)
+    a.flags.writeable = False
+    return a
+
+
+def attach(manifest: dict[str, SharedEntry]) -> dict[str, object]:
+    """Map every published entry (idempotent per process); usable as a pool initializer."""
+    for name, entry in manifest.items():
+        if name in _attached and _attached[name][0] == entry:
+            continue
+        arrays = {k: _map(s) for k, s in entry.arrays.items()}
+        if entry.kind == "graph":
+            core = {k: arrays.pop(k) for k in _CORE}
+            _attached[name] = (entry, NetworkGraph(**core, meta=entry.meta, extras=arrays))
+        else:
+            _attached[name] = (entry, arrays)
+    return attached()
+
+
+def attached() -> dict[str, object]:
+    """Entries attached in this process, keyed by name (pass as build(graphs=...))."""
+    return {name: obj for name, (_, obj) in _attached.items()}
+
+
+def detach() -> None:
+    """Forget every attached entry and close this process's mappings (never unlinks)."""
+    _attached.clear()
+    while _handles:
+        shm = _handles.pop()
+        # BufferError: an array over it is still referenced; the OS unmaps it at exit
+        with suppress(BufferError):
+            shm.close()
+
+
+atexit.register(detach)
@@ -0,0 +1,171 @@
+# ab_sim/services/demand_forecast.py
+"""
+Online per-zone demand heatmap and short-horizon forecast.
+
+Each zone keeps an exponentially decayed request count (time constant tau_s) and the
+time it was last touched; decay is applied lazily, so a request costs one exp() and a
+zone read costs one exp(). Requests are also tallied per (zone, time-of-day bin), which
+can be saved as a historical profile for later runs. When a profile is loaded, the
+forecast over [now, now + horizon_s] blends the recent rate with the profile's integral
+over the same wall-clock window (prefix sums, O(1) per zone).
+
+snapshot() writes into one preallocated array and returns it (read-only view): callers
+read it in place and must not keep it across calls.
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+
+from ab_sim.app.events import RiderRequestPlaced
+from ab_sim.io.graph_format import load_tables, save_tables
+from ab_sim.sim.clock import DAY, HOUR, SimClock
+
+
+class DemandForecaster:
+    """
+    zones: anything with zone_of(Point) -> int and n_zones (services.zones.ZoneIndex).
+    profile: (n_zones, n_bins) historical requests/hour per wall-clock time-of-day bin.
+    recent_weight: share of the recent rate in the forecast (1.0 without a profile).
+    """
+
+    def __init__(
+        self,
+        zones,
+        *,
+        clock: SimClock | None = None,
+        tau_s: float = 900.0,
+        horizon_s: float = 900.0,
+        bin_s: float = HOUR,
+        profile: np.ndarray | None = None,
+        recent_weight: float = 0.5,
+        t0: float = 0.0,
+    ):
+        if tau_s <= 0 or horizon_s <= 0:
+            raise ValueError("tau_s and horizon_s must be positive")
+        n_bins = DAY / bin_s
+        if bin_s <= 0 or abs(n_bins - round(n_bins)) > 1e-9:
+            raise ValueError("bin_s must divide a day")
+        self.zones = zones
+        self.n_zones, self.n_bins = int(zones.n_zones), round(n_bins)
+        self.tau, self.horizon_s, self.bin_s = float(tau_s), float(horizon_s), float(bin_s)
+        self.t0 = float(t0)
+        e = clock.epoch if clock is not None else None
+        self._tod0 = e.hour * HOUR + e.minute * 60.0 + e.second if e is not None else 0.0
+
+        self.level = np.zeros(self.n_zones)  # decayed count as of stamp[z]
+        self.stamp = np.full(self.n_zones, self.t0)
+        self.counts = np.zeros((self.n_zones, self.n_bins), dtype=np.int64)  # heatmap
+        self._out = np.zeros(self.n_zones)
+        self._decay = np.zeros(self.n_zones)
+
+        self.profile = None
+        self.recent_weight = 1.0
+        if profile is not None:
+            self.set_profile(profile, recent_weight)
+
+    # ---------- profile ----------
+
+    def set_profile(self, profile, recent_weight: float = 0.5) -> None:
+        p = np.asarray(profile, dtype=np.float64)
+        if p.shape != (self.n_zones, self.n_bins) or np.any(p < 0):
+            shape = (self.n_zones, self.n_bins)
+            raise ValueError(f"profile must be non-negative with shape {shape}")
+        if not 0.0 <= recent_weight <= 1.0:
+            raise ValueError("recent_weight must be in [0, 1]")
+        self.profile, self.recent_weight = p, float(recent_weight)
+        # requests expected from the start of the day to the start of each bin (two days,
+        # so a window crossing midnight is one subtraction)
+        per_bin = np.tile(p * (self.bin_s / HOUR), 2)
+        self._cum = np.concatenate([np.zeros((self.n_zones, 1)), per_bin.cumsum(axis=1)], 1)
+
+    def _profile_window(self, now: float, h: float, z=slice(None)):
+        """Profile requests over [now, now + h] for zone(s) z."""
+        if h >= DAY:
+            return self._cum[z, self.n_bins] * (h / DAY)
+        a = self._tod(now)
+        return self._profile_upto(a + h, z) - self._profile_upto(a, z)
+
+    def _profile_upto(self, tod: float, z):
+        """Profile requests from wall-clock midnight to tod (0 <= tod < 2 DAY)."""
+        k = int(tod // self.bin_s)
+        frac = (tod - k * self.bin_s) / self.bin_s
+        return self._cum[z, k] + frac * (self._cum[z, k + 1] - self._cum[z, k])
+
+    def _tod(self, t: float) -> float:
+        return (t + self._tod0) % DAY
+
+    # ---------- writes ----------
+
+    def record(self, t: float, z: int) -> None:
+        """One request in zone z at time t (t non-decreasing per zone)."""
+        if z < 0:
+            return
+        self.level[z] = self.level[z] * math.exp((self.stamp[z] - t) / self.tau) + 1.0
+        self.stamp[z] = t
+        self.counts[z, int(self._tod(t) // self.bin_s)] += 1
+
+    def on_rider_request(self, ev: RiderRequestPlaced):
+        self.record(ev.t, self.zones.zone_of(ev.pickup))
+        return []
+
+    # ---------- reads ----------
+
+    def _warmup(self, now: float) -> float:
+        """Bias correction while less than a few tau of history exist."""
+        return -math.expm1(-max(now - self.t0, 1e-9) / self.tau)
+
+    def rate(self, z: int, now: float) -> float:
+        """Recent requests per second in zone z."""
+        decayed = self.level[z] * math.exp((self.stamp[z] - now) / self.tau)
+        return decayed / (self.tau * self._warmup(now))
+
+    def expected(self, z: int, now: float, horizon_s: float | None = None) -> float:
+        """Requests expected in zone z over [now, now + horizon_s]."""
+        h = self.horizon_s if horizon_s is None else float(horizon_s)
+        recent = self.rate(z, now) * h
+        if self.profile is None:
+            return recent
+        hist = float(self._profile_window(now, h, z))
+        return self.recent_weight * recent + (1.0 - self.recent_weight) * hist
+
+    def snapshot(self, now: float) -> np.ndarray:
+        """(n_zones,) requests expected over the next horizon_s; a reused buffer."""
+        h = self.horizon_s
+        np.subtract(self.stamp, now, out=self._decay)
+        self._decay /= self.tau
+        np.exp(self._decay, out=self._decay)
+        np.multiply(self.level, self._decay, out=self._out)
+        self._out *= h / (self.tau * self._warmup(now))
+        if self.profile is not None:
+            self._out *= self.recent_weight
+            self._out += (1.0 - self.recent_weight) * self._profile_window(now, h)
+        view = self._out.view()
+        view.flags.writeable = False
+        return view
+
+    # ---------- storage ----------
+
+    def observed_profile(self, days: float) -> np.ndarray:
+        """Heatmap as requests/hour per bin, averaged over `days` observed days."""
+        if days <= 0:
+            raise ValueError("days must be positive")
+        return self.counts / (days * self.bin_s / HOUR)
+
+    def save_profile(self, path, days: float) -> Path:
+        return save_tables(
+            {"profile": self.observed_profile(days)},
+            path,
+            meta={"kind": "demand_profile", "bin_s": self.bin_s},
+        )
+
+    @staticmethod
+    def load_profile(path, *, mmap: bool = True) -> tuple[np.ndarray, float]:
+        """(profile, bin_s) from save_profile's directory, or a bare .npy of hourly bins."""
+        if Path(path).suffix == ".npy":
+            return np.load(path, mmap_mode="r" if mmap else None), HOUR
+        arrays, meta = load_tables(path, mmap=mmap)
+        if meta.get("kind") != "demand_profile":
+            raise ValueError(f"{path} is not a demand profile")
+        return arrays["profile"], float(meta["bin_s"])
@@ -0,0 +1,259 @@
+# ab_sim/services/isochrones.py
+"""
+Precomputed reachability isochrones for ETA-bounded matching.
+
+Space is cut into a regular grid and the day into time-of-day bins; for every origin
+cell, bin and ETA threshold a bitset marks the destination cells that may be reached in
+time. A matching policy tests candidate drivers against the pickup's cell with one
+vectorized bit lookup and only routes the survivors.
+
+The tables are plain arrays (to_arrays / from_arrays), saved with io.graph_format's
+memory-mapped tables layout or published through runtime.shared, so workers share them.
+"""
+
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_landmarks import dijkstra
+from ab_sim.domain.mechanics.mechanics_td_weights import TimeDependentWeights
+from ab_sim.io.graph_format import load_tables, save_tables
+from ab_sim.sim.clock import HOUR
+
+
+class IsochroneIndex:
+    """
+    bits[b, k, i] is a packed mask over destination cells j with
+        eta(i -> j, bin b) - radius(i) - radius(j) <= thresholds_s[k]
+    where radius(c) bounds the trip between c's center and any point of c. A cleared bit
+    proves nothing in cell i reaches cell j in time, so pruning never drops a feasible
+    driver; a set bit only means "maybe, route it".
+    hours: start hour of each time-of-day bin (bin b covers hours[b] .. hours[b+1] - 1).
+    """
+
+    def __init__(
+        self,
+        origin: Sequence[float],
+        cell_m: float,
+        nx: int,
+        ny: int,
+        thresholds_s: Sequence[float],
+        hours: Sequence[int],
+        bits: np.ndarray,
+    ):
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell, self.nx, self.ny = float(cell_m), int(nx), int(ny)
+        self.n_cells = self.nx * self.ny
+        self.thresholds_s = np.asarray(thresholds_s, dtype=np.float64)
+        self.hours = np.asarray(hours, dtype=np.int64)
+        self.bits = bits  # (n_bins, n_thresholds, n_cells, ceil(n_cells / 8)) uint8
+        if len(self.hours) == 0 or self.hours[0] != 0 or np.any(np.diff(self.hours) <= 0):
+            raise ValueError("hours must be increasing and start at 0")
+        if np.any(np.diff(self.thresholds_s) <= 0):
+            raise ValueError("thresholds_s must be increasing")
+        shape = (len(self.hours), len(self.thresholds_s), self.n_cells, -(-self.n_cells // 8))
+        if self.bits.shape != shape:
+            raise ValueError(f"bits shape {self.bits.shape} != {shape}")
+
+    # ---------- lookup ----------
+
+    def cell_of(self, xy) -> np.ndarray:
+        """Cell id of each (x, y) row; points outside the grid clamp to the border cells."""
+        ij = np.floor((np.atleast_2d(xy) - self.origin) / self.cell).astype(np.int64)
+        i = np.clip(ij[:, 0], 0, self.nx - 1)
+        j = np.clip(ij[:, 1], 0, self.ny - 1)
+        return i + self.nx * j
+
+    def centers(self) -> np.ndarray:
+        j, i = np.divmod(np.arange(self.n_cells), self.nx)
+        return self.origin + (np.column_stack([i, j]) + 0.5) * self.cell
+
+    def bin_of(self, hour: int) -> int:
+        return int(np.searchsorted(self.hours, hour % 24, side="right")) - 1
+
+    def level_of(self, threshold_s: float) -> int | None:
+        """Tightest stored threshold >= threshold_s (None: larger than all, no pruning)."""
+        k = int(np.searchsorted(self.thresholds_s, threshold_s - 1e-9))
+        return k if k < len(self.thresholds_s) else None
+
+    def can_reach(self, src_xy, dst: Point, threshold_s: float, hour: int) -> np.ndarray:
+        """Bool mask over src_xy rows: may reach dst within threshold_s at this hour."""
+        src_xy = np.atleast_2d(np.asarray(src_xy, dtype=np.float64))
+        k = self.level_of(threshold_s)
+        if k is None or len(src_xy) == 0:
+            return np.ones(len(src_xy), dtype=bool)
+        j = int(self.cell_of([dst.x, dst.y])[0])
+        col = self.bits[self.bin_of(hour), k, :, j >> 3]
+        return ((col[self.cell_of(src_xy)] >> (7 - (j & 7))) & 1).astype(bool)
+
+    def can_reach_pairs(self, src_xy, dst_xy, threshold_s: float, hour: int) -> np.ndarray:
+        """Elementwise can_reach for aligned (src_xy[i], dst_xy[i]) rows."""
+        src_xy = np.atleast_2d(np.asarray(src_xy, dtype=np.float64))
+        k = self.level_of(threshold_s)
+        if k is None or len(src_xy) == 0:
+            return np.ones(len(src_xy), dtype=bool)
+        j = self.cell_of(dst_xy)
+        byte = self.bits[self.bin_of(hour), k][self.cell_of(src_xy), j >> 3]
+        return ((byte >> (7 - (j & 7))) & 1).astype(bool)
+
+    def reachable_cells(self, src: Point, threshold_s: float, hour: int) -> np.ndarray:
+        """Cell ids that may be reached from src within threshold_s at this hour."""
+        k = self.level_of(threshold_s)
+        if k is None:
+            return np.arange(self.n_cells)
+        i = int(self.cell_of([src.x, src.y])[0])
+        row = np.unpackbits(self.bits[self.bin_of(hour), k, i], count=self.n_cells)
+        return np.flatnonzero(row)
+
+    # ---------- build ----------
+
+    @classmethod
+    def _empty(cls, lo, hi, cell_m, thresholds_s, hours) -> "IsochroneIndex":
+        lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+        nx, ny = (max(1, int(np.ceil(s / cell_m))) for s in (hi - lo))
+        n, thr = nx * ny, np.sort(np.asarray(thresholds_s, dtype=np.float64))
+        bits = np.zeros((len(hours), len(thr), n, -(-n // 8)), dtype=np.uint8)
+        return cls(lo, cell_m, nx, ny, thr, hours, bits)
+
+    @staticmethod
+    def _pack(lb: np.ndarray, thresholds_s: np.ndarray) -> np.ndarray:
+        # lb: (n_cells, n_cells) lower bounds in seconds -> (n_thresholds, n_cells, bytes)
+        return np.packbits(lb[None, :, :] <= thresholds_s[:, None, None], axis=-1)
+
+    @classmethod
+    def from_eta(
+        cls,
+        eta_s: Callable[..., float],
+        lo: Sequence[float],
+        hi: Sequence[float],
+        cell_m: float,
+        thresholds_s: Sequence[float],
+        hours: Sequence[int] = tuple(range(24)),
+        *,
+        dow: int = 0,
+    ) -> "IsochroneIndex":
+        """
+        Any planner: eta_s(a, b, t0, dow=, hour=) -> arrival time (e.g. Mechanics.eta_s)
+        between cell centers, leaving at each bin's start hour; radius = slowest center ->
+        corner trip. O(n_cells^2) calls per bin: coarse grids only. Sound for distance-based
+        planners at constant speed (triangle inequality); time-varying or stochastic speeds
+        make it approximate.
+        """
+        idx = cls._empty(lo, hi, cell_m, thresholds_s, hours)
+        pts = [Point(float(x), float(y)) for x, y in idx.centers()]
+        half = cell_m / 2.0
+        for b, h in enumerate(idx.hours.tolist()):
+            t0, kw = (dow * 24 + h) * HOUR, {"dow": dow, "hour": h}
+            r = np.array(
+                [
+                    max(
+                        eta_s(p, Point(p.x + sx * half, p.y + sy * half), t0, **kw) - t0
+                        for sx in (-1, 1)
+                        for sy in (-1, 1)
+                    )
+                    for p in pts
+                ]
+            )
+            T = np.array([[eta_s(p, q, t0, **kw) - t0 for q in pts] for p in pts])
+            idx.bits[b] = cls._pack(T - r[:, None] - r[None, :], idx.thresholds_s)
+        return idx
+
+    @classmethod
+    def from_graph(
+        cls,
+        graph: NetworkGraph,
+        speed,
+        cell_m: float,
+        thresholds_s: Sequence[float],
+        hours: Sequence[int] = tuple(range(24)),
+        *,
+        dow: int = 0,
+        lo: Sequence[float] | None = None,
+        hi: Sequence[float] | None = None,
+    ) -> "IsochroneIndex":
+        """
+        Road network: per occupied cell and bin, one forward and one reverse Dijkstra over
+        edge travel times from the speed sampler (its deterministic base x factor model) at
+        the fastest hour in the bin. radius(c) = farthest graph node of c from/to c's center
+        node, so bounds hold for locations on graph nodes. Bins with the same speed profile
+        are computed once.
+        """
+        xy = np.asarray(graph.node_xy, dtype=np.float64)
+        lo = xy.min(axis=0) if lo is None else lo
+        hi = xy.max(axis=0) + 1e-6 if hi is None else hi
+        idx = cls._empty(lo, hi, cell_m, thresholds_s, hours)
+        n = idx.n_cells
+
+        cell = idx.cell_of(xy)
+        occupied = np.unique(cell)
+        centers = idx.centers()
+        d2 = ((xy - centers[cell]) ** 2).sum(axis=1)
+        order = np.lexsort((d2, cell))  # by cell, nearest-to-center first
+        first = np.unique(cell[order], return_index=True)[1]
+        hub = np.full(n, -1, dtype=np.int64)
+        hub[occupied] = order[first]
+
+        td = TimeDependentWeights.from_speed_sampler(graph, speed, bin_s=HOUR)
+        rev = np.argsort(graph.indices, kind="stable")
+        rindptr = np.zeros(graph.n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(graph.indices, minlength=graph.n_nodes), out=rindptr[1:])
+
+        done = {}
+        ends = [*idx.hours.tolist()[1:], 24]
+        for b, (h, h_end) in enumerate(zip(idx.hours.tolist(), ends, strict=True)):
+            tbs = [td.bin_at((dow * 24 + x) * HOUR) for x in range(h, h_end)]
+            fac = td.factor[:, tbs].max(axis=1)  # fastest hour: lower bounds hold all bin
+            prof = fac.tobytes()
+            if prof in done:
+                idx.bits[b] = idx.bits[done[prof]]
+                continue
+            w = td.base_s / fac[td.group]
+            fwd = (graph.indptr, graph.indices, w)
+            bwd = (rindptr, graph.edge_u[rev], w[rev])
+            T = np.full((n, n), np.inf)
+            r_out, r_in = np.zeros(n), np.zeros(n)
+            for c in occupied.tolist():
+                df = dijkstra(graph, int(hub[c]), csr=fwd)
+                dr = dijkstra(graph, int(hub[c]), csr=bwd)
+                mine = cell == c
+                r_out[c], r_in[c] = df[mine].max(), dr[mine].max()
+                T[c, occupied] = df[hub[occupied]]
+            lb = T - r_out[:, None] - r_in[None, :]
+            lb[np.isnan(lb)] = -np.inf  # unknown (infinite radius): keep
+            empty = np.setdiff1d(np.arange(n), occupied)
+            lb[empty, :] = lb[:, empty] = -np.inf  # no nodes: nothing to prove
+            idx.bits[b] = cls._pack(lb, idx.thresholds_s)
+            done[prof] = b
+        return idx
+
+    # ---------- storage ----------
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "iso_bits": self.bits,
+            "iso_meta": np.array([*self.origin, self.cell, self.nx, self.ny], dtype=float),
+            "iso_thresholds_s": self.thresholds_s,
+            "iso_hours": self.hours,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "IsochroneIndex":
+        ox, oy, cell, nx, ny = arrays["iso_meta"].tolist()
+        return cls(
+            (ox, oy),
+            cell,
+            int(nx),
+            int(ny),
+            arrays["iso_thresholds_s"],
+            arrays["iso_hours"],
+            arrays["iso_bits"],
+        )
+
+    def save(self, path):
+        return save_tables(self.to_arrays(), path, meta={"kind": "isochrones"})
+
+    @classmethod
+    def load(cls, path, *, mmap: bool = True) -> "IsochroneIndex":
+        arrays, _ = load_tables(path, mmap=mmap)
+        return cls.from_arrays(arrays)
@@ -0,0 +1,276 @@
+# ab_sim/services/snapping.py
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import Point, Segment
+
+
+class GridIndex:
+    """
+    Static uniform-grid bucket index (CSR layout: cell -> item ids).
+    Items are points, or segments registered in every cell of their bounding box.
+    Queries scan rings of cells outward and stop once no unscanned cell can be closer.
+    """
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, cell_m: float = 250.0):
+        # lo/hi: (n, 2) item bounding boxes (lo == hi for points)
+        lo, hi = np.asarray(lo, float).reshape(-1, 2), np.asarray(hi, float).reshape(-1, 2)
+        self.cell = float(cell_m)
+        self.origin = lo.min(axis=0) if len(lo) else np.zeros(2)
+        top = hi.max(axis=0) if len(hi) else np.zeros(2)
+        self.nx, self.ny = (np.floor((top - self.origin) / self.cell).astype(int) + 1).tolist()
+        c0 = self._cells(lo)
+        c1 = self._cells(hi)
+        span = (c1 - c0 + 1).prod(axis=1)
+        item = np.repeat(np.arange(len(lo)), span)
+        # enumerate the cells of each bbox
+        k = np.arange(len(item)) - np.repeat(np.cumsum(span) - span, span)
+        w = np.repeat(c1[:, 0] - c0[:, 0] + 1, span)
+        cx = np.repeat(c0[:, 0], span) + k % w
+        cy = np.repeat(c0[:, 1], span) + k // w
+        cid = cy * self.nx + cx
+        order = np.argsort(cid, kind="stable")
+        self.items = item[order]
+        self.start = np.zeros(self.nx * self.ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cid, minlength=self.nx * self.ny), out=self.start[1:])
+
+    @classmethod
+    def for_points(cls, xy: np.ndarray, cell_m: float = 250.0) -> "GridIndex":
+        return cls(xy, xy, cell_m)
+
+    def _cells(self, xy: np.ndarray) -> np.ndarray:
+        c = np.floor((xy - self.origin) / self.cell).astype(np.int64)
+        return np.clip(c, 0, [self.nx - 1, self.ny - 1])
+
+    def _ring(self, r: int) -> np.ndarray:
+        if r == 0:
+            return np.zeros((1, 2), dtype=np.int64)
+        s = np.arange(-r, r + 1)
+        return np.unique(
+            np.concatenate(
+                [
+                    np.stack([s, np.full_like(s, -r)], 1),
+                    np.stack([s, np.full_like(s, r)], 1),
+                    np.stack([np.full_like(s, -r), s], 1),
+                    np.stack([np.full_like(s, r), s], 1),
+                ]
+            ),
+            axis=0,
+        )
+
+    def nearest_many(self, q: np.ndarray, dist_fn) -> tuple[np.ndarray, np.ndarray]:
+        """
+        For each query row return (best item id, distance); -1/inf if the index is empty.
+        dist_fn(query_rows, item_ids) -> distances, both 1-D aligned arrays.
+        """
+        q = np.asarray(q, float).reshape(-1, 2)
+        best = np.full(len(q), -1, dtype=np.int64)
+        best_d = np.full(len(q), np.inf)
+        open_ = np.arange(len(q))
+        base = self._cells(q)
+        r, r_max = 0, max(self.nx, self.ny)
+        while len(open_) and r <= r_max:
+            for dx, dy in self._ring(r):
+                cx, cy = base[open_, 0] + dx, base[open_, 1] + dy
+                ok = (cx >= 0) & (cx < self.nx) & (cy >= 0) & (cy < self.ny)
+                rows = open_[ok]
+                cid = cy[ok] * self.nx + cx[ok]
+                n = self.start[cid + 1] - self.start[cid]
+                if not n.sum():
+                    continue
+                qi = np.repeat(rows, n)
+                pos = np.repeat(self.start[cid] - (np.cumsum(n) - n), n) + np.arange(n.sum())
+                it = self.items[pos]
+                d = dist_fn(qi, it)
+                # per-query min over candidates
+                o = np.lexsort((d, qi))
+                qi, it, d = qi[o], it[o], d[o]
+                first = np.r_[True, qi[1:] != qi[:-1]]
+                qi, it, d = qi[first], it[first], d[first]
+                better = d < best_d[qi]
+                best[qi[better]], best_d[qi[better]] = it[better], d[better]
+            # anything outside rings 0..r is at least r * cell away
+            open_ = open_[~(best_d[open_] <= r * self.cell)]
+            r += 1
+        return best, best_d
+
+    def nearest_k_many(
+        self, q: np.ndarray, k: int, dist_fn, max_dist: float = np.inf
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Up to k nearest items within max_dist of each query row (point items), as flat
+        aligned (query row, item id, distance) arrays sorted by query then distance.
+        """
+        q = np.asarray(q, float).reshape(-1, 2)
+        qi = it = np.zeros(0, dtype=np.int64)
+        d = np.zeros(0)
+        open_ = np.arange(len(q))
+        base = self._cells(q)
+        r, r_max = 0, max(self.nx, self.ny)
+        while len(open_) and r <= r_max:
+            cx = base[open_, 0][:, None] + self._ring(r)[None, :, 0]
+            cy = base[open_, 1][:, None] + self._ring(r)[None, :, 1]
+            ok = (cx >= 0) & (cx < self.nx) & (cy >= 0) & (cy < self.ny)
+            rows = np.broadcast_to(open_[:, None], ok.shape)[ok]
+            cid = cy[ok] * self.nx + cx[ok]
+            n = self.start[cid + 1] - self.start[cid]
+            new_qi = np.repeat(rows, n)
+            pos = np.repeat(self.start[cid] - (np.cumsum(n) - n), n) + np.arange(n.sum())
+            new_it = self.items[pos]
+            new_d = dist_fn(new_qi, new_it)
+            near = new_d <= max_dist
+            qi = np.concatenate([qi, new_qi[near]])
+            it = np.concatenate([it, new_it[near]])
+            d = np.concatenate([d, new_d[near]])
+            # keep the k best per query
+            o = np.lexsort((d, qi))
+            qi, it, d = qi[o], it[o], d[o]
+            seg = np.flatnonzero(np.r_[True, qi[1:] != qi[:-1]]) if len(qi) else qi
+            rank = np.arange(len(qi)) - np.repeat(seg, np.diff(np.r_[seg, len(qi)]))
+            keep = rank < k
+            qi, it, d, rank = qi[keep], it[keep], d[keep], rank[keep]
+            kth = np.full(len(q), np.inf)
+            kth[qi[rank == k - 1]] = d[rank == k - 1]
+            # anything outside rings 0..r is at least r * cell away
+            reach = r * self.cell
+            open_ = open_[(kth[open_] > reach) & (max_dist > reach)]
+            r += 1
+        return qi, it, d
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "grid_items": self.items,
+            "grid_start": self.start,
+            "grid_meta": np.array([*self.origin, self.cell, self.nx, self.ny], dtype=float),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "GridIndex":
+        self = cls.__new__(cls)
+        ox, oy, cell, nx, ny = arrays["grid_meta"].tolist()
+        self.origin, self.cell, self.nx, self.ny = np.array([ox, oy]), cell, int(nx), int(ny)
+        self.items, self.start = arrays["grid_items"], arrays["grid_start"]
+        return self
+
+
+@dataclass
+class SnapResult:
+    ids: np.ndarray  # (n,) node index (target="node") or edge index (target="edge")
+    xy: np.ndarray  # (n, 2) snapped locations
+    dist_m: np.ndarray  # (n,) straight-line offset from the query point
+
+
+class SnapService:
+    """
+    Snap free points onto the network through a static spatial index.
+      target="node": nearest graph node; target="edge": orthogonal projection onto the
+      nearest edge (needs edge_u/edge_v). index="kdtree" uses scipy's cKDTree (nodes only).
+    Repeated locations hit a bounded cache keyed on coordinates quantized to
+    cache_quantum_m; cached hits may differ from an exact query by < one quantum.
+    """
+
+    def __init__(
+        self,
+        node_xy: np.ndarray,
+        *,
+        edge_u: np.ndarray | None = None,
+        edge_v: np.ndarray | None = None,
+        index: Literal["grid", "kdtree"] = "grid",
+        target: Literal["node", "edge"] = "node",
+        cell_m: float = 250.0,
+        cache_quantum_m: float = 1.0,
+        cache_size: int = 100_000,
+        grid: GridIndex | None = None,
+    ):
+        self.node_xy = np.asarray(node_xy, dtype=float)
+        self.target = target
+        if target == "edge":
+            if edge_u is None or edge_v is None:
+                raise ValueError("edge snapping needs edge_u/edge_v")
+            if index != "grid":
+                raise ValueError("edge snapping supports index='grid' only")
+            self.edge_u, self.edge_v = np.asarray(edge_u), np.asarray(edge_v)
+            a, b = self.node_xy[self.edge_u], self.node_xy[self.edge_v]
+            self._grid = GridIndex(np.minimum(a, b), np.maximum(a, b), cell_m)
+        elif index == "kdtree":
+            try:
+                from scipy.spatial import cKDTree
+            except ImportError as e:  # optional dependency
+                raise ImportError("index='kdtree' requires scipy") from e
+            self._kd = cKDTree(self.node_xy)
+            self._grid = None
+        else:
+            # a prebuilt node index (e.g. stored with the graph) skips the build
+            self._grid = grid if grid is not None else GridIndex.for_points(self.node_xy, cell_m)
+        self.index = index
+        self.q = float(cache_quantum_m)
+        self.cache_size = int(cache_size)
+        self._cache: OrderedDict[tuple[int, int], tuple[int, float, float]] = OrderedDict()
+        self.hits = self.misses = 0
+
+    @classmethod
+    def from_graph(cls, graph, **kw) -> "SnapService":
+        return cls(
+            graph.node_xy,
+            edge_u=getattr(graph, "edge_u", None),
+            edge_v=getattr(graph, "edge_v", None),
+            **kw,
+        )
+
+    # ---- batched queries ----
+
+    def _project(self, q: np.ndarray, e: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        a, b = self.node_xy[self.edge_u[e]], self.node_xy[self.edge_v[e]]
+        ab = b - a
+        L2 = (ab * ab).sum(axis=1)
+        s = np.divide(((q - a) * ab).sum(axis=1), L2, out=np.zeros(len(e)), where=L2 > 0)
+        p = a + np.clip(s, 0.0, 1.0)[:, None] * ab
+        return p, np.hypot(*(p - q).T)
+
+    def snap_many(self, xy: np.ndarray) -> SnapResult:
+        """Snap an (n, 2) array of points in one vectorized pass (no cache)."""
+        q = np.asarray(xy, dtype=float).reshape(-1, 2)
+        if self.target == "edge":
+            ids, _ = self._grid.nearest_many(q, lambda qi, e: self._project(q[qi], e)[1])
+            p, d = self._project(q, ids)
+            return SnapResult(ids, p, d)
+        if self.index == "kdtree":
+            d, ids = self._kd.query(q)
+            ids = np.asarray(ids, dtype=np.int64)
+        else:
+            ids, d = self._grid.nearest_many(
+                q, lambda qi, n: np.hypot(*(self.node_xy[n] - q[qi]).T)
+            )
+        return SnapResult(ids, self.node_xy[ids], d)
+
+    # ---- scalar queries (cached) ----
+
+    def _lookup(self, p: Point) -> tuple[int, float, float]:
+        key = (round(p.x / self.q), round(p.y / self.q))
+        hit = self._cache.get(key)
+        if hit is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return hit
+        self.misses += 1
+        r = self.snap_many(np.array([[p.x, p.y]]))
+        val = (int(r.ids[0]), float(r.xy[0, 0]), float(r.xy[0, 1]))
+        self._cache[key] = val
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return val
+
+    def nearest_node(self, p: Point) -> int:
+        if self.target != "node":
+            raise ValueError("nearest_node needs target='node'")
+        return self._lookup(p)[0]
+
+    def snap(self, p: Point, kind: str = "vehicle") -> tuple[Point, Segment | None]:
+        """Snapped point + walking connector from p (None if already on the network)."""
+        _, x, y = self._lookup(p)
+        q = Point(x, y)
+        L = float(np.hypot(x - p.x, y - p.y))
+        return (q, None if L < 1e-6 else Segment(p, q, L, edge_id=None))
@@ -1,23 +1,123 @@
 # ab_sim/app/policy/travel_time.py
+from collections import OrderedDict
+from typing import Literal, get_args
+
 from ab_sim.app.protocols import Mechanics, TravelTimeService
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.entities.motion import BreakpointPlan, MovePlan, MoveTask
 from ab_sim.domain.state import Driver, TripState
+from ab_sim.sim.clock import SimClock
+
+Leg = Literal["pickup", "dropoff", "reposition"]
+LEGS: tuple[Leg, ...] = get_args(Leg)
+
+
+def _check_leg(leg: str) -> None:
+    if leg not in LEGS:
+        raise ValueError(f"unknown leg {leg!r}; expected one of {LEGS}")
+
+
+def _has_motion(plan: MovePlan | BreakpointPlan) -> bool:
+    if isinstance(plan, BreakpointPlan):
+        return len(plan.t) > 1  # don't materialize tasks just to count them
+    return bool(plan.tasks)
 
 
 class MechanicsTravelTime(TravelTimeService):
-    def __init__(self, mechanics: Mechanics):
+    """
+    method="distance_over_speed": planner distance / one speed draw (cheap, no traversal).
+    method="router_eta": Mechanics.eta_s, i.e. route + traverse at the sampled speeds.
+
+    Router ETAs are memoized on (origin key, dest key, time bucket): keys are graph nodes
+    when the planner routes on a NetworkGraph, else coordinates rounded to quantum_m.
+    A hit reuses the first estimate in its bucket (and skips that call's speed draws);
+    exact=True bypasses the memo for validation runs.
+    """
+
+    def __init__(
+        self,
+        mechanics: Mechanics,
+        *,
+        method: Literal["distance_over_speed", "router_eta"] = "distance_over_speed",
+        min_speed_mps: float = 0.1,
+        clock: SimClock | None = None,
+        exact: bool = False,
+        memo_size: int = 65_536,
+        bucket_s: float = 300.0,
+        quantum_m: float = 25.0,
+    ):
+        self.mechanics = mechanics
         self.speed_sampler = mechanics.speed_sampler
         self.route_planner = mechanics.route_planner
+        self.method, self.min_speed_mps, self.clock = method, float(min_speed_mps), clock
+        self.exact, self.memo_size = exact, int(memo_size)
+        self.bucket_s, self.q = float(bucket_s), float(quantum_m)
+        self._memo: OrderedDict[tuple, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        g = getattr(self.route_planner, "G", None)
+        self._node = getattr(g, "nearest_node", None)
+
+    def leg_plan(
+        self, a: Point, b: Point, now: float, *, leg: Leg, **time_kw
+    ) -> MovePlan | BreakpointPlan:
+        """
+        One route + one traversal; the plan carries arrival time, motion and length.
+        Both ends snapping to the same node give an empty path: that leg becomes a single
+        zero-length task ending at b, so the plan always has a first and last task.
+        """
+        _check_leg(leg)
+        plan = self.mechanics.move_plan(a, b, now, **time_kw)
+        if _has_motion(plan):
+            return plan
+        return MovePlan(
+            tasks=[MoveTask(start=a, end=b, start_t=now, end_t=now)],
+            total_length_m=plan.total_length_m,
+            start_t=now,
+            end_t=now,
+        )
+
+    def _time_kw(self, now: float, kw: dict) -> dict:
+        if kw or self.clock is None:
+            return kw
+        return self.clock.dow_hour_at(now)
 
     def _duration(self, a, b, now: float, **kw) -> float:
-        d = self.route_planner.distance_m(a, b)  # or call your router
+        kw = self._time_kw(now, kw)
+        if self.method == "router_eta":
+            return self.router_eta(a, b, now, **kw)
+        d = self.route_planner.distance_m(a, b)
         v = self.speed_sampler.speed_mps(now, **kw)  # protocol method
-        return d / max(0.1, v)
+        return d / max(self.min_speed_mps, v)
 
-    def duration_to_pickup(self, driver, trip, now: float) -> float:
-        return self._duration(driver.pos, trip.pickup.pos, now)
+    def _key(self, p: Point):
+        if self._node is not None:
+            return self._node(p)
+        return (round(p.x / self.q), round(p.y / self.q))
 
-    def duration_to_dropoff(self, driver, trip, now: float) -> float:
-        return self._duration(trip.pickup.pos, trip.dropoff.pos, now)
+    def router_eta(self, a: Point, b: Point, now: float, **time_kw) -> float:
+        """Seconds from a to b departing at now, via the route planner and path traverser."""
+        # Mechanics.eta_s is the arrival time at b
+        if self.exact:
+            return self.mechanics.eta_s(a, b, now, **time_kw) - now
+        key = (self._key(a), self._key(b), int(now // self.bucket_s))
+        hit = self._memo.get(key)
+        if hit is not None:
+            self.hits += 1
+            self._memo.move_to_end(key)
+            return hit
+        self.misses += 1
+        eta = self.mechanics.eta_s(a, b, now, **time_kw) - now
+        self._memo[key] = eta
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return eta
+
+    def duration_to_pickup(self, driver: Driver, trip: TripState, now: float) -> float:
+        return self._duration(driver.loc, trip.origin, now)
+
+    def duration_to_dropoff(self, driver: Driver, trip: TripState, now: float) -> float:
+        return self._duration(trip.origin, trip.dest, now)
 
     def duration_reposition(self, driver, now: float) -> float:
         # If you have a plan/target, compute to that; else 0.
@@ -45,3 +145,15 @@ class FixedDurationTravelTime(MechanicsTravelTime):
 
     def duration_reposition(self, driver: Driver, now: float) -> float:
         return self.reposition_s
+
+    def leg_plan(self, a: Point, b: Point, now: float, *, leg: Leg, **_) -> MovePlan:
+        """Straight-line plan lasting the fixed leg duration."""
+        _check_leg(leg)
+        dur = {"pickup": self.pickup_s, "dropoff": self.dropoff_s}.get(leg, self.reposition_s)
+        t_arr = now + max(0.0, float(dur))
+        return MovePlan(
+            tasks=[MoveTask(start=a, end=b, start_t=now, end_t=t_arr)],
+            total_length_m=((b.x - a.x) ** 2 + (b.y - a.y) ** 2) ** 0.5,
+            start_t=now,
+            end_t=t_arr,
+        )
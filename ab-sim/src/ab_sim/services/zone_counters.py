@@ -0,0 +1,95 @@
+# ab_sim/services/zone_counters.py
+"""
+Per-zone supply / demand counters kept up to date event by event.
+
+Every count changes by one when a driver enters or leaves the idle pool (registered as a
+WorldState idle watcher) or a request opens or closes (kernel subscriptions), so
+policies read current totals as plain arrays instead of scanning the fleet or the queue.
+Points outside every zone (NONE) are tracked but not counted.
+
+A driver sent on a rebalancing move stays in the idle pool but is counted at its
+destination zone from the moment the move starts (IdleHandler.on_rebalance_tick), so the
+next plan sees the supply already on its way. WorldState.idle_grid keeps the driver at
+its last stop until it arrives; the two agree again once the leg ends.
+"""
+
+import numpy as np
+
+from ab_sim.app.events import (
+    RiderCancel,
+    RiderRequestPlaced,
+    RiderRequeue,
+    RiderTimeout,
+    TripAssigned,
+    TripCompleted,
+)
+from ab_sim.domain.entities.geography import Point
+
+
+class ZoneCounters:
+    def __init__(self, zones):
+        self.zones = zones  # anything with zone_of(Point) -> int and n_zones
+        n = int(zones.n_zones)
+        self.idle = np.zeros(n, dtype=np.int64)  # idle drivers now
+        self.open = np.zeros(n, dtype=np.int64)  # requests waiting for a driver
+        self.requests = np.zeros(n, dtype=np.int64)  # requests placed so far
+        self.idle_ids: list[set[int]] = [set() for _ in range(n)]
+        self._driver_zone: dict[int, int] = {}
+        self._rider_zone: dict[int, int] = {}  # live riders (until completed / dropped)
+        self._open: set[int] = set()
+
+    # ---------- idle pool (WorldState.idle_watchers) ----------
+
+    def add(self, did: int, p: Point) -> None:
+        self.discard(did)
+        z = self.zones.zone_of(p)
+        self._driver_zone[did] = z
+        if z >= 0:
+            self.idle[z] += 1
+            self.idle_ids[z].add(did)
+
+    def discard(self, did: int) -> None:
+        z = self._driver_zone.pop(did, -1)
+        if z >= 0:
+            self.idle[z] -= 1
+            self.idle_ids[z].discard(did)
+
+    # ---------- requests (kernel handlers) ----------
+
+    def _set_open(self, rid: int, is_open: bool) -> None:
+        z = self._rider_zone.get(rid, -1)
+        if is_open == (rid in self._open):
+            return
+        if is_open:
+            self._open.add(rid)
+        else:
+            self._open.discard(rid)
+        if z >= 0:
+            self.open[z] += 1 if is_open else -1
+
+    def on_rider_request(self, ev: RiderRequestPlaced):
+        z = self.zones.zone_of(ev.pickup)
+        self._rider_zone[ev.rider_id] = z
+        if z >= 0:
+            self.requests[z] += 1
+        self._set_open(ev.rider_id, True)
+        return []
+
+    def on_rider_requeue(self, ev: RiderRequeue):
+        if ev.rider_id in self._rider_zone:
+            self._set_open(ev.rider_id, True)
+        return []
+
+    def on_trip_assigned(self, ev: TripAssigned):
+        self._set_open(ev.rider_id, False)
+        return []
+
+    def on_rider_timeout(self, ev: RiderTimeout):
+        if ev.rider_id in self._open:  # still waiting: the request is dropped
+            self.on_rider_gone(ev)
+        return []
+
+    def on_rider_gone(self, ev: RiderCancel | TripCompleted):
+        self._set_open(ev.rider_id, False)
+        self._rider_zone.pop(ev.rider_id, None)
+        return []
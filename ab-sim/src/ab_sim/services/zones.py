@@ -0,0 +1,284 @@
+# ab_sim/services/zones.py
+"""
+Point -> zone classification through a precomputed raster.
+
+Zones (polygons with optional holes, or rectangles) are rasterized once onto a fine
+grid. A cell lying inside one zone and crossed by no zone boundary stores that zone id,
+so most points classify with a single array lookup; only cells a boundary passes
+through keep a short candidate list, resolved by an exact point-in-polygon test.
+Overlapping zones resolve to the lowest zone id.
+"""
+
+import json
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from ab_sim.domain.entities.geography import Point
+from ab_sim.io.graph_format import load_tables, save_tables
+
+NONE = -1  # outside every zone
+MIXED = -2  # boundary cell: resolve through the candidates
+
+
+def zone_rings(zone) -> list[np.ndarray]:
+    """(x0, y0, x1, y1) rectangle, one ring [(x, y), ...] or a list of rings (holes)."""
+    if np.isscalar(zone[0]):
+        x0, y0, x1, y1 = (float(v) for v in zone)
+        return [np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])]
+    if np.isscalar(zone[0][0]):
+        return [np.asarray(zone, dtype=np.float64)]
+    return [np.asarray(r, dtype=np.float64) for r in zone]
+
+
+def ring_edges(rings: Sequence[np.ndarray]) -> np.ndarray:
+    """(E, 4) rows x0, y0, x1, y1 for every ring edge (rings close implicitly)."""
+    out = [np.hstack([r, np.roll(r, -1, axis=0)]) for r in rings if len(r) >= 3]
+    return np.vstack(out) if out else np.zeros((0, 4))
+
+
+def points_in_polygon(xy: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Even-odd rule (holes subtract) for (n, 2) points against (E, 4) edges."""
+    x, y = xy[:, 0], xy[:, 1]
+    inside = np.zeros(len(xy), dtype=bool)
+    for x0, y0, x1, y1 in edges.tolist():
+        if y0 == y1:
+            continue  # horizontal edges never cross the ray
+        cross = (y0 > y) != (y1 > y)
+        inside ^= cross & (x < x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+    return inside
+
+
+class ZoneIndex:
+    """
+    raster[cell]: zone id, NONE, or MIXED (candidates in cand_zone[cand_start[c]:...]).
+    A candidate flagged full covers the whole cell, so it answers without a test.
+    """
+
+    def __init__(
+        self,
+        origin: Sequence[float],
+        cell_m: float,
+        nx: int,
+        ny: int,
+        raster: np.ndarray,
+        cand_start: np.ndarray,
+        cand_zone: np.ndarray,
+        cand_full: np.ndarray,
+        edges: np.ndarray,
+        edge_start: np.ndarray,
+        names: Sequence[str] | None = None,
+    ):
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell, self.nx, self.ny = float(cell_m), int(nx), int(ny)
+        self.raster = raster  # (nx * ny,) int32
+        self.cand_start, self.cand_zone, self.cand_full = cand_start, cand_zone, cand_full
+        self._slot = np.full(self.nx * self.ny, -1, dtype=np.int64)  # cell -> candidate row
+        self._slot[np.flatnonzero(raster == MIXED)] = np.arange(len(cand_start) - 1)
+        self.edges, self.edge_start = edges, edge_start  # zone k: edges[start[k]:start[k+1]]
+        self.n_zones = len(edge_start) - 1
+        self.names = list(names) if names is not None else [str(k) for k in range(self.n_zones)]
+
+    # ---------- build ----------
+
+    @classmethod
+    def build(
+        cls, zones: Sequence, cell_m: float, *, names: Sequence[str] | None = None
+    ) -> "ZoneIndex":
+        rings = [zone_rings(z) for z in zones]
+        edges = [ring_edges(r) for r in rings]
+        pts = np.vstack([np.vstack(r) for r in rings])
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        nx, ny = (max(1, int(np.ceil(s / cell_m + 1e-9))) for s in (hi - lo))
+        idx = cls.__new__(cls)
+        idx.origin, idx.cell, idx.nx, idx.ny = lo, float(cell_m), nx, ny
+
+        cells, zone_of, full = [], [], []
+        for k, e in enumerate(edges):
+            edge_cells = np.unique(np.concatenate([idx._edge_cells(*row) for row in e]))
+            x0, y0 = np.floor((e[:, [0, 1]].min(axis=0) - lo) / cell_m).astype(int)
+            x1, y1 = np.floor((e[:, [0, 1]].max(axis=0) - lo) / cell_m).astype(int)
+            jj, ii = np.mgrid[max(y0, 0) : min(y1, ny - 1) + 1, max(x0, 0) : min(x1, nx - 1) + 1]
+            box = (ii + nx * jj).ravel()
+            box = box[~np.isin(box, edge_cells)]
+            inner = box[points_in_polygon(idx._centers(box), e)]
+            cells += [edge_cells, inner]
+            zone_of += [np.full(len(edge_cells), k), np.full(len(inner), k)]
+            full += [np.zeros(len(edge_cells), bool), np.ones(len(inner), bool)]
+        c, z, f = (np.concatenate(a) for a in (cells, zone_of, full))
+
+        order = np.lexsort((z, c))
+        c, z, f = c[order], z[order], f[order]
+        start = np.r_[0, np.flatnonzero(np.diff(c)) + 1]
+        group = np.repeat(np.arange(len(start)), np.diff(np.r_[start, len(c)]))
+        # keep entries up to (and including) each cell's first full-cover zone
+        fulls = np.cumsum(f)
+        before = fulls - f - np.r_[0, fulls][start][group]
+        keep = before == 0
+        c, z, f, group = c[keep], z[keep], f[keep], group[keep]
+        first = np.r_[0, np.flatnonzero(np.diff(c)) + 1]
+
+        raster = np.full(nx * ny, NONE, dtype=np.int32)
+        uniform = f[first]
+        raster[c[first][uniform]] = z[first][uniform]
+        mixed = np.isin(c, c[first][~uniform])
+        cm, zm, fm = c[mixed], z[mixed], f[mixed]
+        raster[np.unique(cm)] = MIXED
+        counts = np.bincount(np.searchsorted(np.unique(cm), cm), minlength=len(np.unique(cm)))
+        cand_start = np.r_[0, np.cumsum(counts)].astype(np.int64)
+
+        edge_start = np.r_[0, np.cumsum([len(e) for e in edges])].astype(np.int64)
+        return cls(
+            lo,
+            cell_m,
+            nx,
+            ny,
+            raster,
+            cand_start,
+            zm.astype(np.int32),
+            fm,
+            np.vstack(edges),
+            edge_start,
+            names,
+        )
+
+    @classmethod
+    def from_geojson(cls, path, cell_m: float, *, name_property: str | None = None):
+        """Polygon / MultiPolygon features in file order (projected coordinates, meters)."""
+        feats = json.loads(Path(path).read_text())["features"]
+        zones, names = [], []
+        for i, ft in enumerate(feats):
+            geom = ft["geometry"]
+            if geom["type"] == "Polygon":
+                zones.append(geom["coordinates"])
+            elif geom["type"] == "MultiPolygon":
+                zones.append([ring for poly in geom["coordinates"] for ring in poly])
+            else:
+                raise ValueError(f"feature {i}: unsupported geometry {geom['type']!r}")
+            props = ft.get("properties") or {}
+            names.append(str(props.get(name_property, i)) if name_property else str(i))
+        return cls.build(zones, cell_m, names=names)
+
+    def _centers(self, cells: np.ndarray) -> np.ndarray:
+        j, i = np.divmod(cells, self.nx)
+        return self.origin + (np.column_stack([i, j]) + 0.5) * self.cell
+
+    def _edge_cells(self, x0, y0, x1, y1) -> np.ndarray:
+        """Every cell the segment passes through (widened by a hair against rounding)."""
+        eps = 1e-9
+        gx0, gy0 = (x0 - self.origin[0]) / self.cell, (y0 - self.origin[1]) / self.cell
+        gx1, gy1 = (x1 - self.origin[0]) / self.cell, (y1 - self.origin[1]) / self.cell
+        xa, xb = min(gx0, gx1), max(gx0, gx1)
+        cols = np.arange(int(np.floor(xa - eps)), int(np.floor(xb + eps)) + 1)
+        if gx1 == gx0:
+            ylo = np.full(len(cols), min(gy0, gy1))
+            yhi = np.full(len(cols), max(gy0, gy1))
+        else:
+            s = (gy1 - gy0) / (gx1 - gx0)
+            left, right = np.maximum(cols, xa), np.minimum(cols + 1, xb)
+            ya, yb = gy0 + (left - gx0) * s, gy0 + (right - gx0) * s
+            ylo, yhi = np.minimum(ya, yb), np.maximum(ya, yb)
+        r0 = np.floor(ylo - eps).astype(np.int64)
+        r1 = np.floor(yhi + eps).astype(np.int64)
+        ok = (cols >= 0) & (cols < self.nx)
+        cols, r0, r1 = cols[ok], np.clip(r0[ok], 0, self.ny - 1), np.clip(r1[ok], 0, self.ny - 1)
+        n = r1 - r0 + 1
+        rows = np.repeat(r0, n) + np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        return np.repeat(cols, n) + self.nx * rows
+
+    # ---------- lookup ----------
+
+    def cell_of(self, xy: np.ndarray) -> np.ndarray:
+        """Cell id per row, -1 outside the raster."""
+        ij = np.floor((xy - self.origin) / self.cell).astype(np.int64)
+        ok = (ij[:, 0] >= 0) & (ij[:, 0] < self.nx) & (ij[:, 1] >= 0) & (ij[:, 1] < self.ny)
+        return np.where(ok, ij[:, 0] + self.nx * ij[:, 1], -1)
+
+    def zone_of(self, p: Point) -> int:
+        return int(self.classify(np.array([[p.x, p.y]]))[0])
+
+    def classify(self, xy) -> np.ndarray:
+        """(n,) zone id per (x, y) row, NONE outside every zone."""
+        xy = np.atleast_2d(np.asarray(xy, dtype=np.float64))
+        cell = self.cell_of(xy)
+        out = np.where(cell >= 0, self.raster[np.maximum(cell, 0)], NONE).astype(np.int64)
+        todo = np.flatnonzero(out == MIXED)
+        if len(todo) == 0:
+            return out
+        out[todo] = NONE
+        # explode (point, candidate) pairs, then settle zones in id order
+        slot = self._slot[cell[todo]]
+        a, b = self.cand_start[slot], self.cand_start[slot + 1]
+        n = b - a
+        pt = np.repeat(todo, n)
+        cand = np.repeat(a, n) + np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        zone, full = self.cand_zone[cand], self.cand_full[cand]
+        unresolved = np.ones(len(xy), dtype=bool)
+        for k in np.unique(zone).tolist():
+            m = (zone == k) & unresolved[pt]
+            p, f = pt[m], full[m]
+            hit = f.copy()
+            if (~f).any():
+                e = self.edges[self.edge_start[k] : self.edge_start[k + 1]]
+                hit[~f] = points_in_polygon(xy[p[~f]], e)
+            out[p[hit]] = k
+            unresolved[p[hit]] = False
+        return out
+
+    def centroids(self) -> np.ndarray:
+        """(n_zones, 2) mean of the raster cell centers in each zone (vertex mean if none)."""
+        xy = self._centers(np.arange(self.nx * self.ny))
+        z = self.classify(xy)
+        inside = z >= 0
+        n = np.bincount(z[inside], minlength=self.n_zones)
+        out = (
+            np.column_stack(
+                [
+                    np.bincount(z[inside], weights=xy[inside, c], minlength=self.n_zones)
+                    for c in (0, 1)
+                ]
+            )
+            / np.maximum(n, 1)[:, None]
+        )
+        for k in np.flatnonzero(n == 0).tolist():  # smaller than a cell
+            out[k] = self.edges[self.edge_start[k] : self.edge_start[k + 1], :2].mean(axis=0)
+        return out
+
+    # ---------- storage ----------
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "zone_raster": self.raster,
+            "zone_meta": np.array([*self.origin, self.cell, self.nx, self.ny], dtype=float),
+            "zone_cand_start": self.cand_start,
+            "zone_cand_zone": self.cand_zone,
+            "zone_cand_full": self.cand_full,
+            "zone_edges": self.edges,
+            "zone_edge_start": self.edge_start,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray], names=None) -> "ZoneIndex":
+        ox, oy, cell, nx, ny = arrays["zone_meta"].tolist()
+        return cls(
+            (ox, oy),
+            cell,
+            int(nx),
+            int(ny),
+            arrays["zone_raster"],
+            arrays["zone_cand_start"],
+            arrays["zone_cand_zone"],
+            arrays["zone_cand_full"],
+            arrays["zone_edges"],
+            arrays["zone_edge_start"],
+            names,
+        )
+
+    def save(self, path):
+        return save_tables(self.to_arrays(), path, meta={"kind": "zones", "names": self.names})
+
+    @classmethod
+    def load(cls, path, *, mmap: bool = True) -> "ZoneIndex":
+        arrays, meta = load_tables(path, mmap=mmap)
+        return cls.from_arrays(arrays, meta.get("names"))
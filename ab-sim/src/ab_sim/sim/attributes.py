@@ -0,0 +1,86 @@
+# sim/attributes.py
+"""
+Per-entity stochastic attributes (rider boarding time, patience, walk speed, ...).
+
+Values are pre-drawn as NumPy columns in chunks of consecutive entity ids: chunk c of a
+trait in table `name` is the counter-c block of RNGRegistry.draw for key (name, trait).
+An entity's traits therefore depend only on the seed, the table and its id, not on who
+asked first or how often, and memory is one float per trait per entity of the chunks
+touched, with no Generator kept alive per entity.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .rng import RNGKey, RNGRegistry
+
+
+@dataclass(frozen=True)
+class Trait:
+    """One column: Generator method `kind` with `params`, clipped to [lo, hi]."""
+
+    name: str
+    kind: str  # e.g. "exponential", "uniform", "normal", "lognormal", "gamma"
+    params: tuple[float, ...] = ()
+    lo: float = -math.inf
+    hi: float = math.inf
+
+
+class AttributeTable:
+    def __init__(
+        self,
+        rng_registry: RNGRegistry,
+        name: str,
+        traits: Sequence[Trait],
+        *,
+        chunk: int = 4096,
+    ):
+        if not traits:
+            raise ValueError("an attribute table needs at least one trait")
+        self.rng_registry, self.name = rng_registry, name
+        self.traits = tuple(traits)
+        self.col = {t.name: i for i, t in enumerate(self.traits)}
+        if len(self.col) != len(self.traits):
+            raise ValueError("trait names must be unique")
+        self.chunk = max(1, int(chunk))
+        self._chunks: dict[int, np.ndarray] = {}  # chunk index -> (n_traits, chunk)
+
+    def _draw(self, c: int) -> np.ndarray:
+        # one generator per (trait, chunk): adding a column does not reshuffle the others
+        out = np.empty((len(self.traits), self.chunk))
+        for i, t in enumerate(self.traits):
+            key = RNGKey.from_parts(f"attr:{self.name}", t.name)
+            vals = self.rng_registry.draw(key, c, self.chunk, t.kind, *t.params)
+            np.clip(vals, t.lo, t.hi, out=out[i])
+        self._chunks[c] = out
+        return out
+
+    def get(self, trait: str, eid: int) -> float:
+        c, j = divmod(int(eid), self.chunk)
+        arr = self._chunks.get(c)
+        if arr is None:
+            arr = self._draw(c)
+        return float(arr[self.col[trait], j])
+
+    def column(self, trait: str, ids) -> np.ndarray:
+        """Values of one trait for an array of entity ids."""
+        ids = np.asarray(ids, dtype=np.int64)
+        c, j = np.divmod(ids, self.chunk)
+        out = np.empty(len(ids))
+        k = self.col[trait]
+        for ci in np.unique(c).tolist():
+            arr = self._chunks.get(ci)
+            if arr is None:
+                arr = self._draw(ci)
+            m = c == ci
+            out[m] = arr[k, j[m]]
+        return out
+
+    def __len__(self) -> int:
+        """Entities with drawn attributes (whole chunks)."""
+        return len(self._chunks) * self.chunk
@@ -17,6 +17,7 @@ class Kernel:
         self._seq = 0
         self._subs: dict[type[BaseEvent], list[Handler]] = {}
         self._hooks = hooks or NoopHooks()
+        self._cancelled: set[int] = set()  # id() of queued events to drop when popped
 
     @property
     def now(self) -> float:
@@ -30,12 +31,31 @@ class Kernel:
         heapq.heappush(self._q, (ev.t, self._seq, ev))
         self._hooks.schedule(ev, now=self._t, qsize=len(self._q))
 
+    def cancel(self, ev: BaseEvent) -> None:
+        """
+        Drop a scheduled event that has not run yet (running or cancelled ones: caller bug).
+        The entry is skipped when popped; the heap is rebuilt once most of it is cancelled.
+        """
+        self._cancelled.add(id(ev))
+        if len(self._cancelled) > 64 and 2 * len(self._cancelled) > len(self._q):
+            self._q = [e for e in self._q if id(e[2]) not in self._cancelled]
+            heapq.heapify(self._q)
+            self._cancelled.clear()
+
+    @property
+    def pending(self) -> int:
+        """Events still to run (cancelled ones excluded)."""
+        return len(self._q) - len(self._cancelled)
+
     def run(self, until: float | None = None, max_events: int | None = None) -> int:
         t0 = time.perf_counter()
         self._hooks.run_start(until=until, max_events=max_events, qsize=len(self._q))
         processed = 0
         while self._q and (until is None or self._q[0][0] <= until):
             t, _, ev = heapq.heappop(self._q)
+            if self._cancelled and id(ev) in self._cancelled:
+                self._cancelled.discard(id(ev))
+                continue
             if t < self._t - 1e-9:
                 self._hooks.error(
                     ev,
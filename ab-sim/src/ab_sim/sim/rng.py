@@ -1,8 +1,10 @@
 # sim/rng.py
 from __future__ import annotations
 
+import warnings
+from collections import OrderedDict
 from dataclasses import dataclass
-from functools import cache
+from functools import lru_cache
 from zlib import crc32
 
 import numpy as np
@@ -12,10 +14,21 @@ def _u32(x: int) -> int:
     return int(x & 0xFFFFFFFF)
 
 
+def _u64(x: int) -> int:
+    return int(x & 0xFFFFFFFFFFFFFFFF)
+
+
 def _crc32_u32(s: str) -> int:
     return _u32(crc32(s.encode("utf-8")))
 
 
+@lru_cache(maxsize=4096)
+def _philox_key(master: int, scenario: int, worker: int, parts: tuple[int, ...]) -> np.ndarray:
+    """128-bit Philox key hashed from the key path (cached: hashing dominates a draw)."""
+    ss = np.random.SeedSequence(entropy=[master, scenario, worker, *parts])
+    return ss.generate_state(2, dtype=np.uint64)
+
+
 @dataclass(frozen=True)
 class RNGKey:
     """Hierarchical key: stream name + optional ints/strings for substreams."""
@@ -41,38 +54,109 @@ class RNGRegistry:
     """
     Deterministic registry of numpy.random.Generator streams.
     Derivation path: [master_seed, scenario, worker, *key.parts]
+
+    Two ways to draw:
+    - generator(key) / stream / substream: stateful Generators. Named streams (no parts)
+      live as long as the registry; sub-keyed ones sit in an LRU of cache_size entries
+      (0 caches none). One that falls out starts over from its seed when asked for
+      again and repeats the values it already gave, so the registry warns
+      (RuntimeWarning) when it recreates one of the last cache_size streams it evicted
+      (older evictions are forgotten, keeping memory bounded); callers drawing from a
+      sub-keyed stream over time should hold on to the generator or use draw().
+    - draw(key, counter, n): stateless. The n values for (key, counter) come from a
+      Philox generator keyed by the hashed key path and positioned at `counter`, built
+      on the spot, so any (entity, draw index) can be reproduced in any order or worker
+      with nothing stored per key.
+
+    Variance reduction for policy comparisons:
+    - common=True drops the scenario from the derivation path, so two scenarios with the
+      same seed and worker see identical streams (common random numbers).
+    - antithetic=True hands out AntitheticGenerator views: every mirrorable continuous
+      draw x becomes F^-1(1 - F(x)), so a replica pair (False, True) is negatively
+      correlated wherever outputs are monotone in those draws.
     """
 
-    def __init__(self, master_seed: int, *, scenario: str | int = 0, worker: int = 0):
+    def __init__(
+        self,
+        master_seed: int,
+        *,
+        scenario: str | int = 0,
+        worker: int = 0,
+        cache_size: int = 1024,
+        common: bool = False,
+        antithetic: bool = False,
+    ):
         self.master_seed = _u32(master_seed)
-        self.scenario_tag = _crc32_u32(str(scenario))
+        self.scenario_tag = 0 if common else _crc32_u32(str(scenario))
+        self.common, self.antithetic = common, antithetic
         self.worker = _u32(worker)
+        self.cache_size = max(0, int(cache_size))
+        self._streams: dict[tuple[RNGKey, str], np.random.Generator] = {}
+        self._lru: OrderedDict[tuple[RNGKey, str], np.random.Generator] = OrderedDict()
+        self._evicted: OrderedDict[tuple[RNGKey, str], None] = OrderedDict()  # recent only
 
-        # master SeedSequence for this worker
-        self._root_ss = np.random.SeedSequence([self.master_seed, self.scenario_tag, self.worker])
-
-    @cache
     def generator(self, key: RNGKey, *, bitgen: str = "PCG64") -> np.random.Generator:
         """
         Get (and cache) a named generator, optionally sub-keyed.
         Example: gen = reg.generator(RNGKey.from_parts("speeds", driver_id))
         """
-        # Derive a child SeedSequence deterministically from the key path
-        ss = self._root_ss.spawn(1)[
-            0
-        ]  # avoid consuming root state with child-spawn? we can also use spawn(len=1) each time
-        # Better: use SeedSequence with 'spawn_key' directly, no root consumption:
-        ss = np.random.SeedSequence(
-            entropy=[self.master_seed, self.scenario_tag, self.worker, *key.parts]
-        )
+        ck = (key, bitgen)
+        pinned = len(key.parts) == 1  # a plain named stream
+        gen = self._streams.get(ck) if pinned else self._lru.get(ck)
+        if gen is not None:
+            if not pinned:
+                self._lru.move_to_end(ck)
+            return gen
 
+        if self._evicted.pop(ck, False) is None:
+            warnings.warn(
+                f"RNG stream {key.stream!r} {key.parts[1:]} was evicted from the cache and "
+                "restarts from its seed, repeating values already drawn",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        ss = self.seed_sequence(key)
         if bitgen == "PCG64":
             bg = np.random.PCG64(ss)
         elif bitgen == "Philox":
             bg = np.random.Philox(ss)
         else:
             raise ValueError("Unknown bitgen: " + bitgen)
-        return np.random.Generator(bg)
+        gen = np.random.Generator(bg)
+        if self.antithetic:
+            gen = AntitheticGenerator(gen)
+        if pinned:
+            self._streams[ck] = gen
+        elif self.cache_size:
+            self._lru[ck] = gen
+            if len(self._lru) > self.cache_size:
+                self._evicted[self._lru.popitem(last=False)[0]] = None
+                if len(self._evicted) > self.cache_size:
+                    self._evicted.popitem(last=False)
+        return gen
+
+    def draw(
+        self, key: RNGKey | str, counter: int, n: int = 1, kind: str = "random", *params: float
+    ) -> np.ndarray:
+        """
+        n values of Generator method `kind` for (key, counter), e.g.
+        reg.draw(RNGKey.from_parts("boarding", rider_id), 0, 2). Same arguments, same
+        values, whatever was drawn before; distinct counters give independent blocks.
+        """
+        if isinstance(key, str):
+            key = RNGKey.from_parts(key)
+        word = _philox_key(self.master_seed, self.scenario_tag, self.worker, key.parts)
+        ctr = np.array([0, _u64(counter), 0, 0], dtype=np.uint64)
+        gen = np.random.Generator(np.random.Philox(key=word, counter=ctr))
+        if self.antithetic:
+            gen = AntitheticGenerator(gen)
+        return getattr(gen, kind)(*params, size=n)
+
+    def seed_sequence(self, key: RNGKey) -> np.random.SeedSequence:
+        """The SeedSequence generator(key) starts from, for one-off uncached generators."""
+        return np.random.SeedSequence(
+            entropy=[self.master_seed, self.scenario_tag, self.worker, *key.parts]
+        )
 
     # Convenience shorthands
     def stream(self, name: str) -> np.random.Generator:
@@ -80,3 +164,151 @@ class RNGRegistry:
 
     def substream(self, name: str, *parts: object) -> np.random.Generator:
         return self.generator(RNGKey.from_parts(name, *parts))
+
+    def buffered(self, name: str, *parts: object, block: int = 4096) -> BufferedStream:
+        """
+        Block-buffered view of a (sub)stream. Views over the same key share one generator
+        while it is cached; a view made after a sub-keyed stream was evicted replays it.
+        """
+        return BufferedStream(self.generator(RNGKey.from_parts(name, *parts)), block=block)
+
+
+class AntitheticGenerator:
+    """
+    Generator view that mirrors continuous draws through their CDF, x -> F^-1(1 - F(x)):
+    random, uniform, (standard_)normal, lognormal, (standard_)exponential. The mirrored
+    values have the same distribution, and each is the antithetic partner of the draw
+    the wrapped generator would have made. Everything else (integers, poisson, choice,
+    ...) passes through unchanged.
+    """
+
+    def __init__(self, gen: np.random.Generator):
+        self._gen = gen
+
+    def __getattr__(self, name: str):
+        return getattr(self._gen, name)
+
+    def random(self, size=None, **kw):
+        return 1.0 - self._gen.random(size, **kw)
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        return np.add(low, high) - self._gen.uniform(low, high, size)
+
+    def standard_normal(self, size=None, **kw):
+        return -self._gen.standard_normal(size, **kw)
+
+    def normal(self, loc=0.0, scale=1.0, size=None):
+        return np.multiply(2.0, loc) - self._gen.normal(loc, scale, size)
+
+    def lognormal(self, mean=0.0, sigma=1.0, size=None):
+        return np.exp(np.multiply(2.0, mean)) / self._gen.lognormal(mean, sigma, size)
+
+    def standard_exponential(self, size=None, **kw):
+        x = self._gen.standard_exponential(size, **kw)
+        # F(x) = 1 - exp(-x), so F^-1(1 - F(x)) = -log(1 - exp(-x))
+        return -np.log(np.maximum(-np.expm1(-x), np.finfo(float).tiny))
+
+    def exponential(self, scale=1.0, size=None):
+        # Generator.exponential is scale * standard_exponential on the same stream
+        return np.multiply(scale, self.standard_exponential(size))
+
+
+class _Buffer:
+    __slots__ = ("arr", "pos")
+
+    def __init__(self, arr: np.ndarray):
+        self.arr, self.pos = arr, 0
+
+
+class BufferedStream:
+    """
+    Hands out scalars from arrays pre-drawn `block` values at a time.
+    Each (Generator method, params) pair keeps its own buffer, e.g. ("random",),
+    ("standard_normal",), ("standard_gamma", 9.0). Given the same call sequence and block
+    size the handed-out values are identical run to run.
+    """
+
+    def __init__(self, gen: np.random.Generator, block: int = 4096):
+        self.gen = gen
+        self.block = max(1, int(block))
+        self._bufs: dict[tuple, _Buffer] = {}
+
+    def _refill(self, key: tuple) -> _Buffer:
+        kind, *params = key
+        buf = _Buffer(getattr(self.gen, kind)(*params, size=self.block))
+        self._bufs[key] = buf
+        return buf
+
+    def next(self, kind: str = "random", *params: float) -> float:
+        key = (kind, *params)
+        buf = self._bufs.get(key)
+        if buf is None or buf.pos >= self.block:
+            buf = self._refill(key)
+        v = buf.arr[buf.pos]
+        buf.pos += 1
+        return float(v)
+
+    def take(self, n: int, kind: str = "random", *params: float) -> np.ndarray:
+        key = (kind, *params)
+        out = np.empty(n, dtype=float)
+        filled = 0
+        while filled < n:
+            buf = self._bufs.get(key)
+            if buf is None or buf.pos >= self.block:
+                buf = self._refill(key)
+            m = min(n - filled, self.block - buf.pos)
+            out[filled : filled + m] = buf.arr[buf.pos : buf.pos + m]
+            buf.pos += m
+            filled += m
+        return out
+
+    # scalar shorthands
+    def random(self) -> float:
+        return self.next("random")
+
+    def uniform(self, low: float, high: float) -> float:
+        return low + (high - low) * self.next("random")
+
+    def exponential(self, scale: float = 1.0) -> float:
+        return scale * self.next("standard_exponential")
+
+    def normal(self, loc: float = 0.0, scale: float = 1.0) -> float:
+        return loc + scale * self.next("standard_normal")
+
+    def lognormal(self, mean: float = 0.0, sigma: float = 1.0) -> float:
+        return float(np.exp(mean + sigma * self.next("standard_normal")))
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) build, O(1) weighted index draw from one uniform."""
+
+    def __init__(self, weights):
+        w = np.asarray(weights, dtype=float)
+        if w.ndim != 1 or w.size == 0:
+            raise ValueError("alias weights must be a non-empty 1-D sequence")
+        if not np.isfinite(w).all() or (w < 0).any() or w.sum() <= 0:
+            raise ValueError("alias weights must be finite, >= 0 and sum to a positive value")
+        n = w.size
+        scaled = w * (n / w.sum())
+        prob = np.ones(n, dtype=float)
+        alias = np.arange(n, dtype=np.int64)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, g = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], g
+            scaled[g] -= 1.0 - scaled[s]
+            (small if scaled[g] < 1.0 else large).append(g)
+        # leftovers are 1.0 up to rounding
+        self.n, self.prob, self.alias = n, prob, alias
+
+    def sample(self, u: float) -> int:
+        """Map one uniform u in [0, 1) to an index."""
+        x = u * self.n
+        i = min(int(x), self.n - 1)
+        return i if (x - i) < self.prob[i] else int(self.alias[i])
+
+    def sample_many(self, u: np.ndarray) -> np.ndarray:
+        x = np.asarray(u, dtype=float) * self.n
+        i = np.minimum(x.astype(np.int64), self.n - 1)
+        return np.where((x - i) < self.prob[i], i, self.alias[i])
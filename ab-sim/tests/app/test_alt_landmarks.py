@@ -0,0 +1,59 @@
+# tests/app/test_alt_landmarks.py
+import numpy as np
+
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_landmarks import (
+    LandmarkHeuristic,
+    add_landmarks,
+    dijkstra,
+)
+from ab_sim.domain.mechanics.mechanics_route_planners import NetworkRoutePlanner
+from ab_sim.io.graph_format import load_graph, save_graph
+
+
+def _river_city(n=20) -> NetworkGraph:
+    """n x n lattice (100 m) cut by a river between rows n/2-1 and n/2, one bridge at x=0."""
+    xy, u, v = [], [], []
+    for j in range(n):
+        for i in range(n):
+            xy.append((i * 100.0, j * 100.0))
+    for j in range(n):
+        for i in range(n):
+            a = j * n + i
+            if i + 1 < n:
+                u += [a, a + 1]
+                v += [a + 1, a]
+            if j + 1 < n and (j != n // 2 - 1 or i == 0):
+                u += [a, a + n]
+                v += [a + n, a]
+    return NetworkGraph.from_edges(xy, u, v)
+
+
+def test_alt_bound_is_admissible():
+    base = _river_city(10)
+    g = add_landmarks(base, k=4)
+    assert "alt_from" not in base.extras and g.length_m is base.length_m  # shared, not mutated
+    h = LandmarkHeuristic(g)
+    for t in (0, 37, 99):
+        d = dijkstra(g, t, reverse=True)  # d(u, t) for every u
+        assert all(h(u, t) <= d[u] + 1e-6 for u in range(g.n_nodes))
+
+
+def test_alt_matches_euclidean_routes_and_expands_fewer_nodes(tmp_path):
+    g = _river_city()
+    save_graph(g, tmp_path / "g", extras=add_landmarks(g, k=6).extras)
+    g = load_graph(tmp_path / "g")  # landmarks travel with the graph
+    plain = NetworkRoutePlanner(g)
+    alt = NetworkRoutePlanner(g, heuristic="alt")
+
+    a, b = Point(1900.0, 800.0), Point(1900.0, 1100.0)  # across the river, far from the bridge
+    assert alt.distance_m(a, b) == plain.distance_m(a, b) == 1900.0 * 2 + 300.0
+    alt.route(a, b)
+    n_alt = g.last_expanded
+    plain.route(a, b)
+    assert n_alt * 2 < g.last_expanded
+
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        p, q = (Point(*rng.random(2) * 1900) for _ in range(2))
+        assert np.isclose(alt.distance_m(p, q), plain.distance_m(p, q))
@@ -0,0 +1,85 @@
+# tests/app/test_batch_assign.py
+import itertools
+
+import numpy as np
+
+from ab_sim.app.build import build
+from ab_sim.app.events import DriverStartShift, TripAssigned
+from ab_sim.domain.entities.geography import Point
+from ab_sim.policy.assignment import auction_assign
+from ab_sim.services.snapping import GridIndex
+
+
+def _brute(C, mask, U):
+    R, D = C.shape
+    best = np.inf
+    options = [[-1] + [d for d in range(D) if mask[r, d]] for r in range(R)]
+    for a in itertools.product(*options):
+        used = [d for d in a if d >= 0]
+        if len(used) == len(set(used)):
+            best = min(best, sum(C[r, d] if d >= 0 else U for r, d in enumerate(a)))
+    return best
+
+
+def test_auction_matches_brute_force_on_sparse_unbalanced_problems():
+    rng = np.random.default_rng(0)
+    for _ in range(150):
+        R, D = rng.integers(1, 6, size=2)
+        C = rng.integers(0, 100, size=(R, D)).astype(float)
+        mask = rng.random((R, D)) < 0.7
+        U = float(rng.integers(20, 150))
+        rows, cols = np.nonzero(mask)
+        got = auction_assign(rows, cols, C[rows, cols], R, D, unassigned_cost=U, eps_min=0.1)
+        used = got[got >= 0]
+        assert len(used) == len(set(used.tolist()))
+        assert all(mask[r, d] for r, d in enumerate(got) if d >= 0)
+        total = sum(C[r, d] if d >= 0 else U for r, d in enumerate(got))
+        assert total <= _brute(C, mask, U) + R * 0.1 + 1e-9
+
+
+def test_grid_knn_returns_exact_nearest_within_radius():
+    rng = np.random.default_rng(1)
+    q, p = rng.random((40, 2)) * 1000, rng.random((60, 2)) * 1000
+    q[:2] -= 1500  # outside the index box
+    g = GridIndex.for_points(p, cell_m=100.0)
+    qi, it, d = g.nearest_k_many(q, 5, lambda a, b: np.hypot(*(q[a] - p[b]).T), max_dist=400.0)
+    full = np.hypot(*(q[:, None, :] - p[None, :, :]).transpose(2, 0, 1))
+    for i in range(len(q)):
+        ref = np.sort(full[i])[:5]
+        assert np.allclose(d[qi == i], ref[ref <= 400.0])
+        assert np.allclose(full[i, it[qi == i]], d[qi == i])
+
+
+def _run(matching):
+    cfg = {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 3, "duration": 3600},
+        "mechanics": {
+            "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 5_000.0, 5_000.0)]},
+            "route_planner": {"kind": "manhattan"},
+            "speed_sampler": {"kind": "global", "v_mps": 10.0},
+        },
+        "demand": {"kind": "day_ahead", "hourly_rate": [240.0] * 24},
+        "travel_time": {"kind": "mechanics"},
+        "matching": matching,
+    }
+    app = build(cfg, use_logging=False)
+    assigned = []
+    app.kernel.on(TripAssigned, lambda ev: assigned.append(ev) or [])
+    for i in range(6):
+        app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(900.0 * i, 0.0)))
+    app.kernel.run(until=3600)
+    return app, assigned
+
+
+def test_batch_run_assigns_on_ticks_and_honours_soon_idle_reservations():
+    app, assigned = _run(
+        {"kind": "batch_assign", "interval_s": 30.0, "soon_idle_s": 120.0, "speed_mps": 10.0}
+    )
+    assert assigned and any(app.world.trips[ev.rider_id].boarded for ev in assigned)
+    on_tick = [ev for ev in assigned if ev.t % 30.0 == 0.0]
+    # the rest are reservations, served the moment their driver finished a dropoff
+    assert len(on_tick) < len(assigned)
+    # one rider per driver task
+    assert len({(ev.driver_id, ev.task_id) for ev in assigned}) == len(assigned)
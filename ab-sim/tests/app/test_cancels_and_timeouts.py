@@ -110,7 +110,7 @@ def build_app(*, add_driver=True, pickup_s=10.0, dropoff_s=20.0, max_driver_wait
         matching=NearestAssignMatchingPolicy(world),
         clock=clock,
         rng=rng_registry,
-        pricing=ConstantPricingPolicy,
+        pricing=ConstantPricingPolicy(0),
         metrics=Metrics("test"),
     )
     demand = DemandHandler(world=world, rng=rng_registry, mechanics=mechanics)
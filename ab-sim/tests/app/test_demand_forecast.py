@@ -0,0 +1,102 @@
+# tests/app/test_demand_forecast.py
+import math
+
+import numpy as np
+import pytest
+
+from ab_sim.app.build import build
+from ab_sim.app.events import RiderRequestPlaced
+from ab_sim.domain.entities.geography import Point
+from ab_sim.services.demand_forecast import DemandForecaster
+from ab_sim.sim.clock import HOUR, SimClock
+
+
+class _HalfPlanes:
+    """Zone 0 for x < 0, zone 1 otherwise."""
+
+    n_zones = 2
+
+    def zone_of(self, p: Point) -> int:
+        return 0 if p.x < 0 else 1
+
+
+def _request(t, x, rid=0):
+    return RiderRequestPlaced(
+        t=t,
+        rider_id=rid,
+        pickup=Point(x, 0.0),
+        dropoff=Point(0.0, 0.0),
+        max_wait_s=600.0,
+        walk_s=0.0,
+    )
+
+
+def test_steady_rate_is_recovered_and_reads_match_snapshot():
+    f = DemandForecaster(_HalfPlanes(), tau_s=600.0, horizon_s=900.0)
+    # zone 0: one request every 10 s; zone 1: every 60 s
+    for i in range(1, 721):
+        f.on_rider_request(_request(10.0 * i, -1.0))
+        if i % 6 == 0:
+            f.on_rider_request(_request(10.0 * i, 1.0))
+    now = 7200.0
+    assert f.rate(0, now) == pytest.approx(0.1, rel=0.1)
+    assert f.rate(1, now) == pytest.approx(1 / 60, rel=0.2)
+    snap = f.snapshot(now)
+    assert snap.tolist() == pytest.approx([f.expected(z, now) for z in range(2)])
+    assert not snap.flags.writeable
+    assert f.counts.sum(axis=1).tolist() == [720, 120]
+
+
+def test_rate_decays_without_requests():
+    f = DemandForecaster(_HalfPlanes(), tau_s=300.0)
+    for i in range(1, 301):
+        f.record(6.0 * i, 0)
+    r0 = f.rate(0, 1800.0)
+    assert f.rate(0, 2100.0) == pytest.approx(r0 * math.exp(-1.0), rel=1e-2)
+    assert f.rate(1, 2100.0) == 0.0
+
+
+def test_profile_blend_integrates_across_midnight():
+    clock = SimClock.utc_epoch(2025, 1, 1, 23, 0, 0)  # t=0 is 23:00 wall time
+    profile = np.zeros((2, 24))
+    profile[1, 23] = 60.0  # requests/hour
+    profile[1, 0] = 120.0
+    f = DemandForecaster(
+        _HalfPlanes(), clock=clock, horizon_s=HOUR, profile=profile, recent_weight=0.0
+    )
+    # 23:30 -> 00:30: half an hour at 60/h plus half an hour at 120/h
+    assert f.expected(1, 1800.0) == pytest.approx(90.0)
+    assert f.snapshot(1800.0).tolist() == pytest.approx([0.0, 90.0])
+
+
+def test_profile_roundtrip(tmp_path):
+    f = DemandForecaster(_HalfPlanes(), bin_s=HOUR)
+    for i in range(30):
+        f.record(HOUR * 5 + i, 1)
+    f.save_profile(tmp_path / "prof", days=1)
+    profile, bin_s = DemandForecaster.load_profile(tmp_path / "prof")
+    assert bin_s == HOUR
+    assert profile[1, 5] == 30.0 and profile.sum() == 30.0
+    with pytest.raises(ValueError):
+        DemandForecaster(_HalfPlanes(), profile=np.ones((3, 24)))
+
+
+def test_build_wires_forecast_into_rebalancing():
+    cfg = {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 5, "duration": 1800},
+        "mechanics": {
+            "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 5_000.0, 5_000.0)]},
+            "zones": {
+                "zones": [(0.0, 0.0, 2_500.0, 5_000.0), (2_500.0, 0.0, 5_000.0, 5_000.0)],
+                "cell_m": 250.0,
+            },
+        },
+        "demand": {"kind": "day_ahead", "hourly_rate": [120.0] * 24},
+        "rebalancing": {"kind": "zone_flow"},
+        "forecast": {"tau_s": 600.0},
+    }
+    app = build(cfg, use_logging=False)
+    app.kernel.run(until=1800)
+    assert app.forecast.counts.sum() == app.counters.requests.sum() > 0
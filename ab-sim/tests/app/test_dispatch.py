@@ -0,0 +1,79 @@
+# tests/app/test_dispatch.py
+import numpy as np
+
+from ab_sim.app.build import build
+from ab_sim.app.events import DriverStartShift, OfferAccepted, OfferExpired, TripAssigned
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.state import Driver, TripState, WorldState
+from ab_sim.policy.dispatch import TopKDispatchPolicy
+from ab_sim.sim.rng import RNGRegistry
+
+
+def _world(n):
+    w = WorldState()
+    for i in range(n):
+        w.add_driver(Driver(id=i, loc=Point(100.0 * (i + 1), 0.0)))
+    return w
+
+
+def _trip():
+    return TripState(rider_id=0, driver_id=-1, origin=Point(0.0, 0.0), dest=Point(0.0, 500.0))
+
+
+def test_offer_goes_to_k_nearest_and_earliest_acceptor_wins():
+    w = _world(6)
+    rng = RNGRegistry(1).buffered("dispatch", block=64)
+    p = TopKDispatchPolicy(w, rng, k=3, p_accept=1.0, mean_response_s=5.0, timeout_s=1e9)
+    rnd = p.offer(_trip(), 0.0, exclude={1})
+    assert rnd.driver_ids == [0, 2, 3]
+    # replay the same block: the winner is the smallest response delay
+    delays = 5.0 * RNGRegistry(1).buffered("dispatch", block=64).take(3, "standard_exponential")
+    assert rnd.winner == rnd.driver_ids[int(np.argmin(delays))]
+    assert rnd.accept_s == delays.min()
+
+    nobody = TopKDispatchPolicy(w, rng, k=None, p_accept=0.0)
+    rnd = nobody.offer(_trip(), 0.0)
+    assert rnd.winner is None and len(rnd.driver_ids) == 6
+    assert rnd.accept_s == nobody.timeout_s
+    assert p.offer(_trip(), 0.0, exclude=set(range(6))) is None
+
+
+def _cfg(**dispatch):
+    return {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 9, "duration": 3600},
+        "mechanics": {"od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 4_000.0, 4_000.0)]}},
+        "travel_time": {"kind": "mechanics"},
+        "demand": {"kind": "day_ahead", "hourly_rate": [120.0] * 24},
+        "dispatch": {"kind": "top_k", **dispatch},
+    }
+
+
+def _run(cfg, n_drivers=8):
+    app = build(cfg, use_logging=False)
+    seen = {"accepted": 0, "expired": 0, "assigned": 0}
+    app.kernel.on(OfferAccepted, lambda ev: seen.__setitem__("accepted", seen["accepted"] + 1))
+    app.kernel.on(OfferExpired, lambda ev: seen.__setitem__("expired", seen["expired"] + 1))
+    app.kernel.on(TripAssigned, lambda ev: seen.__setitem__("assigned", seen["assigned"] + 1))
+    for i in range(n_drivers):
+        app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(2_000.0, 2_000.0)))
+    app.kernel.run(until=3600)
+    return app, seen
+
+
+def test_offers_assign_trips_and_accepted_rounds_never_expire():
+    app, seen = _run(_cfg(k=3, p_accept=0.5))
+    policy = app.demand.dispatch.policy
+    assert seen["accepted"] > 0
+    # accepted rounds cancel their expiry; withdrawn ones (rider left) cancel both
+    assert seen["assigned"] == seen["accepted"] <= policy.accepted
+    assert seen["expired"] <= app.demand.dispatch._next_offer - policy.accepted
+    assert all(rid in app.world.trips for rid in app.demand.dispatch.pending)
+
+
+def test_nobody_accepts_leaves_riders_queued_and_drivers_idle():
+    app, seen = _run(_cfg(k=2, p_accept=0.0))
+    assert seen["accepted"] == seen["assigned"] == 0
+    assert seen["expired"] > 0
+    assert len(app.world.idle_driver_ids) == 8
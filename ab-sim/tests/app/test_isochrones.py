@@ -0,0 +1,73 @@
+# tests/app/test_isochrones.py
+import numpy as np
+
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.domain.mechanics.mechanics_landmarks import dijkstra
+from ab_sim.domain.mechanics.mechanics_speed_samplers import EdgeAwareSpeedSampler
+from ab_sim.services.isochrones import IsochroneIndex
+from ab_sim.sim.rng import RNGRegistry
+
+
+def _grid(n=12) -> NetworkGraph:
+    xy = [(i * 100.0, j * 100.0) for j in range(n) for i in range(n)]
+    u, v = [], []
+    for a in range(n * n):
+        for b in (a + 1, a + n):
+            if b < n * n and (b != a + 1 or b % n):
+                u += [a, b]
+                v += [b, a]
+    return NetworkGraph.from_edges(xy, u, v)
+
+
+def test_eta_isochrones_never_prune_a_reachable_driver():
+    cfg = {"route_planner": {"kind": "manhattan"}, "speed_sampler": {"kind": "global", "v_mps": 10}}
+    m = build_mechanics(MechanicsModel.model_validate(cfg), rng_registry=RNGRegistry(0))
+    iso = IsochroneIndex.from_eta(m.eta_s, (0, 0), (4000, 4000), 500.0, [120, 300], hours=[0, 9])
+    np.testing.assert_array_equal(iso.bits[0], iso.bits[1])  # constant speed: same at 09:00
+
+    rng = np.random.default_rng(1)
+    drivers = rng.random((300, 2)) * 4000
+    pickup = Point(1200.0, 2600.0)
+    eta = (np.abs(drivers - [pickup.x, pickup.y])).sum(axis=1) / 10.0
+    for thr in (120, 300):
+        keep = iso.can_reach(drivers, pickup, thr, hour=9)
+        assert keep[eta <= thr].all()
+        assert 0 < keep.sum() < len(drivers)
+    assert iso.can_reach(drivers, pickup, 900, hour=9).all()  # beyond stored: no pruning
+
+
+def test_mechanics_builds_or_loads_isochrones(tmp_path):
+    spec = {
+        "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 3000.0, 2000.0)]},
+        "isochrones": {"cell_m": 1000.0, "thresholds_s": [600, 300], "hours": [0, 12]},
+    }
+    m = build_mechanics(MechanicsModel.model_validate(spec), rng_registry=RNGRegistry(0))
+    iso = m.isochrones
+    assert (iso.nx, iso.ny, iso.thresholds_s.tolist()) == (3, 2, [300.0, 600.0])
+
+    iso.save(tmp_path / "iso")
+    spec["isochrones"] = {"path": str(tmp_path / "iso")}
+    m = build_mechanics(MechanicsModel.model_validate(spec), rng_registry=RNGRegistry(0))
+    assert np.array_equal(m.isochrones.bits, iso.bits)
+
+
+def test_graph_isochrones_are_sound_and_share_through_tables(tmp_path):
+    g = _grid()
+    speed = EdgeAwareSpeedSampler(10.0, {"0:8": 0.5}, {})
+    iso = IsochroneIndex.from_graph(g, speed, 300.0, [60, 120], hours=[0, 8, 9], dow=0)
+    assert (iso.bits[0] == iso.bits[2]).all() and (iso.bits[1] != iso.bits[0]).any()
+
+    iso.save(tmp_path / "iso")
+    iso = IsochroneIndex.load(tmp_path / "iso")
+    assert isinstance(iso.bits, np.memmap)
+
+    pick = 5 * 12 + 7
+    to_pick = dijkstra(g, pick, reverse=True) / 10.0  # free-flow seconds
+    kept = []
+    for hour, slow in ((3, 1.0), (8, 2.0)):
+        keep = iso.can_reach(g.node_xy, g.node_point(pick), 60, hour=hour)
+        assert keep[to_pick * slow <= 60].all()
+        kept.append(keep.sum())
+    assert g.n_nodes > kept[0] > kept[1]  # rush hour shrinks the isochrone
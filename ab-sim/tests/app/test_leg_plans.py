@@ -0,0 +1,97 @@
+# tests/app/test_leg_plans.py
+import numpy as np
+import pytest
+
+from ab_sim.app.controllers.trips import TripHandler
+from ab_sim.app.events import BoardingComplete, DriverLegArrive, TripAssigned
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.domain.state import Driver, Rider, TripState, WorldState
+from ab_sim.policy.matching import NearestAssignMatchingPolicy
+from ab_sim.policy.pricing import ConstantPricingPolicy
+from ab_sim.services.travel_time import MechanicsTravelTime
+from ab_sim.sim.clock import SimClock
+from ab_sim.sim.rng import RNGRegistry
+
+
+class _CountingPlanner:
+    def __init__(self, inner):
+        self.inner, self.calls = inner, 0
+
+    def route(self, a, b, t0=None):
+        self.calls += 1
+        return self.inner.route(a, b, t0)
+
+    def distance_m(self, a, b):
+        return self.inner.distance_m(a, b)
+
+
+def _handler():
+    cfg = MechanicsModel.model_validate(
+        {
+            "route_planner": {"kind": "manhattan"},
+            "speed_sampler": {"kind": "global", "v_mps": 10.0},
+        }
+    )
+    m = build_mechanics(cfg, rng_registry=RNGRegistry(0))
+    m.route_planner = planner = _CountingPlanner(m.route_planner)
+    world = WorldState()
+    world.add_driver(Driver(id=1, loc=Point(0.0, 0.0)))
+    world.riders[7] = Rider(7, Point(300.0, 400.0), Point(300.0, 1000.0), 600.0, 0.0)
+    world.trips[7] = TripState(7, 1, Point(300.0, 400.0), Point(300.0, 1000.0))
+    trips = TripHandler(
+        world=world,
+        matching=NearestAssignMatchingPolicy(world),
+        travel_time=MechanicsTravelTime(m),
+        clock=SimClock.utc_epoch(2025, 1, 1),
+        rng=None,
+        pricing=ConstantPricingPolicy(0),
+        metrics=None,
+        mechanics=m,
+    )
+    return trips, world, planner
+
+
+def test_each_leg_routes_once_and_plan_drives_arrival_motion_and_fare():
+    trips, world, planner = _handler()
+    d = world.drivers[1]
+
+    out = trips.on_trip_assigned(TripAssigned(t=100.0, driver_id=1, rider_id=7, task_id=0))
+    arrive = next(e for e in out if isinstance(e, DriverLegArrive))
+    assert planner.calls == 1
+    assert arrive.t == pytest.approx(100.0 + 700.0 / 10.0)  # manhattan path, not straight line
+    assert d.motion.total_length_m == 700.0 and d.motion.end_t == arrive.t
+    assert d.pos_at(100.0 + 30.0) == Point(300.0, 0.0)  # follows the route's corner
+
+    trips.on_driver_leg_arrive(arrive)
+    out = trips.on_boarding_complete(BoardingComplete(t=200.0, rider_id=7, driver_id=1, task_id=0))
+    arrive = next(e for e in out if isinstance(e, DriverLegArrive))
+    assert planner.calls == 2 and arrive.t == pytest.approx(260.0)
+    assert trips.fare_distance_m(world.trips[7]) == 600.0
+    assert planner.calls == 2  # fare reuses the dropoff route
+
+
+@pytest.mark.parametrize("traverser", ["piecewise_const", "vectorized"])
+def test_leg_within_one_node_is_a_single_zero_length_task(traverser):
+    n = 5
+    xy = np.column_stack([np.arange(n) * 10.0, np.zeros(n)])
+    u, v = np.r_[np.arange(n - 1), np.arange(1, n)], np.r_[np.arange(1, n), np.arange(n - 1)]
+    cfg = MechanicsModel.model_validate(
+        {
+            "route_planner": {"kind": "network", "graph": {"by": "name", "name": "city"}},
+            "path_traverser": {"kind": traverser},
+        }
+    )
+    graphs = {"city": NetworkGraph.from_edges(xy, u, v)}
+    m = build_mechanics(cfg, rng_registry=RNGRegistry(0), graphs=graphs)
+    tt = MechanicsTravelTime(m)
+
+    plan = tt.leg_plan(Point(1.0, 1.0), Point(2.0, 1.0), 50.0, leg="pickup")  # both snap to node 0
+    assert len(plan.tasks) == 1 and plan.start_t == plan.end_t == 50.0
+    d = Driver(id=1, loc=Point(1.0, 1.0), motion=plan)
+    assert d.pos_at(60.0) == Point(2.0, 1.0)
+    d.snap_to_plan_end()
+    assert d.loc == Point(2.0, 1.0)
+    with pytest.raises(ValueError, match="unknown leg"):
+        tt.leg_plan(Point(1.0, 1.0), Point(2.0, 1.0), 50.0, leg="detour")
@@ -0,0 +1,156 @@
+# tests/app/test_pooling.py
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from ab_sim.app.build import build
+from ab_sim.app.events import DriverStartShift, TripBoarded, TripCompleted
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.state import WorldState
+from ab_sim.models.capacity import leg_loads, seat_free_until
+from ab_sim.policy.pooling import PoolingInsertionPolicy
+from ab_sim.policy.via_contraints import Schedule, Stop, best_insertion
+
+
+def _eta(a, b, t=0.0):
+    return math.hypot(b.x - a.x, b.y - a.y) / 10.0
+
+
+def _brute(sched: Schedule, p: Stop, d: Stop, cap: int):
+    """Every (i, j) insertion, fully re-timed."""
+    base = sched.end_t
+    best = None
+    n = len(sched.stops)
+    for i, j in itertools.product(range(n + 1), repeat=2):
+        if j < i:
+            continue
+        stops = list(sched.stops)
+        stops.insert(j, d)
+        stops.insert(i, p)
+        trial = Schedule(sched.start, sched.t0, sched.load0, stops, sched.stop_s).refresh(_eta)
+        late = any(a > s.latest_t + 1e-9 for a, s in zip(trial.arr, stops, strict=True))
+        if late or max(trial.loads) > cap:
+            continue
+        cost = trial.end_t - base
+        if best is None or cost < best - 1e-9:
+            best = cost
+    return best
+
+
+def test_capacity_helpers():
+    loads = leg_loads(1, ["pickup", "dropoff", "pickup", "dropoff", "dropoff"])
+    assert loads == [1, 2, 1, 2, 1, 0]
+    assert seat_free_until(loads, 2) == [1, 1, 3, 3, 6, 6]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_best_insertion_matches_exhaustive_search(seed):
+    rng = np.random.default_rng(seed)
+    pts = [Point(*(rng.random(2) * 2000)) for _ in range(12)]
+    cap = int(rng.integers(1, 4))
+    sched = Schedule(pts[0], 0.0, stop_s=float(rng.integers(0, 3)) * 10.0).refresh(_eta)
+    # grow a schedule with the engine itself, then test one more request
+    for r in range(5):
+        p, d = pts[1 + 2 * r], pts[2 + 2 * r]
+        direct = _eta(p, d)
+        ps = Stop("pickup", r, p, float(rng.uniform(100, 400)))
+        ds = Stop("dropoff", r, d, ps.latest_t + 1.5 * direct + 60.0)
+        ins = best_insertion(sched, ps, ds, _eta, capacity=cap)
+        want = _brute(sched, ps, ds, cap)
+        if ins is None:
+            assert want is None
+            continue
+        assert want is not None and ins.cost_s == pytest.approx(want)
+        before = sched.end_t
+        sched.insert(ins, ps, ds, _eta)
+        assert sched.end_t - before == pytest.approx(ins.cost_s)
+        assert all(a <= s.latest_t + 1e-9 for a, s in zip(sched.arr, sched.stops, strict=True))
+        assert max(sched.loads) <= cap
+
+
+def test_pooling_policy_shares_a_vehicle_and_respects_capacity():
+    world = WorldState(capacity=2)
+    pol = PoolingInsertionPolicy(world, _eta, max_wait_s=300.0, max_detour=0.5)
+    pol.add_vehicle(1, Point(0.0, 0.0), 0.0)
+    pol.add_vehicle(2, Point(20_000.0, 0.0), 0.0)  # too far for any pickup below
+
+    a = pol.assign(10, Point(100.0, 0.0), Point(3000.0, 0.0), 0.0)
+    b = pol.assign(11, Point(200.0, 0.0), Point(2900.0, 0.0), 0.0)  # on the way
+    assert a.driver_id == b.driver_id == 1
+    assert [s.rider_id for s in pol.schedules[1].stops] == [10, 11, 11, 10]
+    # two seats taken along the shared stretch: a third rider there cannot board
+    assert pol.assign(12, Point(300.0, 0.0), Point(2800.0, 0.0), 0.0) is None
+
+    # serving stops rebases the schedule and frees seats again
+    for t in (10.0, 20.0, 290.0):
+        pol.served(1, t)
+    assert pol.schedules[1].load0 == 1
+    assert pol.schedules[1].start == Point(2900.0, 0.0)
+
+
+def test_pooling_deadlines_count_from_the_request():
+    pol = PoolingInsertionPolicy(WorldState(capacity=2), _eta, max_wait_s=300.0)
+    pol.add_vehicle(1, Point(0.0, 0.0), 0.0)
+    p, _ = pol.stops_for(10, Point(100.0, 0.0), Point(900.0, 0.0), 50.0, max_wait_s=120.0)
+    assert p.latest_t == 170.0  # the rider's own limit is shorter
+    # a retry at t=400 for a request made at t=0 is already past its pickup deadline
+    assert pol.assign(11, Point(100.0, 0.0), Point(900.0, 0.0), 400.0, requested_t=0.0) is None
+    assert pol.assign(11, Point(100.0, 0.0), Point(900.0, 0.0), 400.0) is not None
+
+
+def test_pickup_waits_for_the_walking_rider_and_holds_retime_the_schedule():
+    pol = PoolingInsertionPolicy(WorldState(capacity=2), _eta, max_wait_s=300.0, max_detour=1.0)
+    pol.add_vehicle(1, Point(0.0, 0.0), 0.0)
+    pol.assign(10, Point(100.0, 0.0), Point(1100.0, 0.0), 0.0, ready_t=60.0)
+    sched = pol.schedules[1]
+    assert sched.arr == [60.0, 160.0]  # 10 s drive, then the rider walks up at t=60
+
+    pol.hold(1, 90.0)  # the rider is late: the vehicle is still waiting at t=90
+    assert sched.arr == [90.0, 190.0]
+    ins = pol.assign(11, Point(1100.0, 0.0), Point(1200.0, 0.0), 95.0)
+    assert ins.pickup_t == 190.0  # planned from the held schedule, not from t=160
+
+
+def test_pooling_dispatch_run_shares_vehicles_end_to_end():
+    cfg = {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 4, "duration": 3600},
+        "world": {"capacity": 2},
+        "mechanics": {
+            "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 4_000.0, 4_000.0)]},
+            "speed_sampler": {"kind": "global", "v_mps": 10.0},
+        },
+        "travel_time": {"kind": "mechanics"},
+        "demand": {"kind": "day_ahead", "hourly_rate": [120.0] * 24, "walk_mean_s": 30.0},
+        "dispatch": {"kind": "pooling", "max_wait_s": 600.0, "max_detour": 1.0},
+    }
+    app = build(cfg, use_logging=False)
+    aboard, peak, done, waited = {}, 0, [], []
+
+    def on_boarded(ev):
+        nonlocal peak
+        waited.append(ev.t - app.world.trips[ev.rider_id].requested_t)
+        aboard[ev.driver_id] = aboard.get(ev.driver_id, 0) + 1
+        peak = max(peak, aboard[ev.driver_id])
+        return []
+
+    def on_completed(ev):
+        aboard[ev.driver_id] -= 1
+        done.append(ev.rider_id)
+        return []
+
+    app.kernel.on(TripBoarded, on_boarded)
+    app.kernel.on(TripCompleted, on_completed)
+    for i in range(4):
+        app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(2_000.0, 2_000.0)))
+    app.kernel.run(until=3600)
+    assert len(done) > 20
+    assert peak == 2  # riders shared a vehicle, never above capacity
+    assert all(n >= 0 for n in aboard.values())
+    assert all(app.world.trips[rid].boarded for rid in done)
+    assert waited and max(waited) <= 600.0 + 1e-6  # retries never extend the wait
+    with pytest.raises(ValueError, match="rebalancing"):
+        build({**cfg, "rebalancing": {"kind": "zone_flow"}}, use_logging=False)
@@ -0,0 +1,74 @@
+# tests/app/test_rider_arrivals.py
+import numpy as np
+import pytest
+
+from ab_sim.app.build import build
+from ab_sim.app.events import RiderRequestPlaced
+from ab_sim.domain.mechanics.mechanics_demand_generators import DayAheadDemandGenerator
+from ab_sim.sim.clock import DAY, HOUR, SimClock
+
+ZONES = [(0.0, 0.0, 1000.0, 1000.0), (1000.0, 0.0, 2000.0, 1000.0)]
+
+
+def _gen(method, rates, seed=0, epoch_hour=0):
+    return DayAheadDemandGenerator(
+        rates=rates,
+        clock=SimClock.utc_epoch(2025, 1, 1, epoch_hour),
+        rng=np.random.default_rng(seed),
+        zones=ZONES,
+        method=method,
+        walk_mean_s=30.0,
+        max_wait_s=(300.0, 600.0),
+    )
+
+
+@pytest.mark.parametrize("method", ["piecewise", "thinning"])
+def test_hourly_rates_give_expected_counts_per_hour(method):
+    rates = np.zeros(24)
+    rates[8], rates[17] = 2000.0, 500.0
+    b = _gen(method, rates).generate(0.0, DAY)
+    assert np.all(np.diff(b.t) >= 0) and b.t.min() >= 0 and b.t.max() < DAY
+    per_hour = np.bincount((b.t // HOUR).astype(int), minlength=24)
+    assert per_hour[8] == pytest.approx(2000, rel=0.1)
+    assert per_hour[17] == pytest.approx(500, rel=0.2)
+    assert per_hour.sum() == per_hour[8] + per_hour[17]
+    assert (b.walk_s >= 0).all() and ((b.max_wait_s >= 300) & (b.max_wait_s <= 600)).all()
+
+
+@pytest.mark.parametrize("method", ["piecewise", "thinning"])
+def test_per_zone_rates_place_origins_in_their_zone(method):
+    rates = np.zeros((2, 24))
+    rates[0, :] = 100.0
+    rates[1, 12] = 1000.0
+    b = _gen(method, rates).generate(0.0, DAY)
+    z1 = b.origin_zone == 1
+    assert z1.sum() == pytest.approx(1000, rel=0.15)
+    assert np.all((b.t[z1] >= 12 * HOUR) & (b.t[z1] < 13 * HOUR))
+    assert np.all(b.origin[z1, 0] >= 1000.0) and np.all(b.origin[~z1, 0] <= 1000.0)
+
+
+def test_hours_follow_clock_epoch():
+    rates = np.zeros(24)
+    rates[8] = 1000.0
+    # epoch at 06:00 -> wall hour 8 is sim [2h, 3h)
+    b = _gen("piecewise", rates, epoch_hour=6).generate(0.0, 6 * HOUR)
+    assert len(b) > 0 and np.all((b.t >= 2 * HOUR) & (b.t < 3 * HOUR))
+
+
+def test_build_feeds_arrivals_lazily():
+    cfg = {
+        "name": "arrivals",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 3, "duration": 7200},
+        "mechanics": {"od_sampler": {"kind": "idealized", "zones": ZONES}},
+        "demand": {"kind": "day_ahead", "hourly_rate": [300.0] * 24},
+    }
+
+    app = build(cfg, use_logging=False)
+    app.kernel.run(until=3600)
+    # one pending arrival at a time, not the whole day
+    pending = [ev for _, _, ev in app.kernel._q if isinstance(ev, RiderRequestPlaced)]
+    assert len(pending) == 1 and pending[0].rider_id == app.arrivals.next_rider_id - 1
+    app.kernel.run(until=7200)
+    assert app.arrivals.next_rider_id == pytest.approx(600, rel=0.2)
+    assert len(app.demand.queue) > 0  # no drivers: everyone queues
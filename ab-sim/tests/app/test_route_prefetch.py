@@ -0,0 +1,88 @@
+# tests/app/test_route_prefetch.py
+from ab_sim.app.build import build
+from ab_sim.app.events import DriverStartShift
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_route_cache import CachedRoutePlanner, RoutePrefetcher
+from ab_sim.domain.mechanics.mechanics_route_planners import NetworkRoutePlanner
+
+
+class _Counting(NetworkRoutePlanner):
+    calls = 0
+
+    def route(self, a, b, t0=None):
+        type(self).calls += 1
+        return super().route(a, b, t0)
+
+
+def _grid(n=15) -> NetworkGraph:
+    xy = [(i * 100.0, j * 100.0) for j in range(n) for i in range(n)]
+    u, v = [], []
+    for a in range(n * n):
+        for b in (a + 1, a + n):
+            if b < n * n and (b != a + 1 or b % n):
+                u += [a, b]
+                v += [b, a]
+    return NetworkGraph.from_edges(xy, u, v)
+
+
+def test_prefetched_route_is_served_from_cache_unchanged():
+    g = _grid()
+    plain = NetworkRoutePlanner(g)
+    cache = CachedRoutePlanner(_Counting(g), size=8)
+    a, b = Point(0.0, 0.0), Point(1400.0, 900.0)
+    with RoutePrefetcher(cache, workers=2) as pf:
+        pf.prefetch(a, b)
+        pf.prefetch(a, b)  # already queued: not searched twice
+        pf.drain()
+        assert pf.submitted == 1 and _Counting.calls == 1
+        path = cache.route(a, b)
+    assert _Counting.calls == 1 and cache.hits == 1
+    assert path.segments == plain.route(a, b).segments
+    assert cache.G is g  # wrapped planner attributes stay reachable
+
+
+def _run(route_cache, planner=None, graphs=None):
+    mech = {
+        "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 5_000.0, 5_000.0)]},
+        "route_planner": planner or {"kind": "manhattan"},
+        "speed_sampler": {"kind": "global", "v_mps": 10.0},
+    }
+    if route_cache:
+        mech["route_cache"] = route_cache
+    cfg = {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 5, "duration": 3600},
+        "mechanics": mech,
+        "demand": {"kind": "day_ahead", "hourly_rate": [120.0] * 24},
+        "travel_time": {"kind": "mechanics"},
+    }
+    with build(cfg, use_logging=False, graphs=graphs) as app:
+        for i in range(5):
+            app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(1000.0 * i, 0.0)))
+        app.kernel.run(until=3600)
+    trips = {
+        k: (t.driver_id, t.boarded, t.route_length_m, t.rider_at_pickup_t)
+        for k, t in app.world.trips.items()
+    }
+    return trips, app.mechanics
+
+
+def test_run_with_prefetch_matches_run_without():
+    base, _ = _run(None)
+    fetched, mech = _run({"workers": 2})
+    assert fetched == base and any(v[1] for v in base.values())
+    assert mech.prefetcher.submitted > 0 and mech.route_planner.hits > 0
+
+
+def test_network_run_prefetches_both_legs_it_routes():
+    planner = {"kind": "network", "graph": {"by": "name", "name": "city"}}
+    graphs = {"city": _grid(51)}  # 100 m blocks over the 5 km demand area
+    base, _ = _run(None, planner, graphs)
+    fetched, mech = _run({"workers": 2}, planner, graphs)
+    assert fetched == base
+    boarded = sum(v[1] for v in base.values())
+    assert boarded > 0
+    # each boarded trip prefetched its pickup and its dropoff leg, and routed both from cache
+    assert mech.prefetcher.submitted >= 2 * boarded
+    assert mech.route_planner.hits >= 2 * boarded
@@ -0,0 +1,59 @@
+# tests/app/test_router_eta.py
+import pytest
+
+from ab_sim.config.models import MechanicsModel, TravelTimeServiceMechanicsModel
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.domain.state import Driver, TripState
+from ab_sim.runtime.services_factory import make_travel_time
+from ab_sim.sim.rng import RNGRegistry
+
+
+def _service(**tt):
+    spec = {
+        "route_planner": {"kind": "manhattan"},
+        "speed_sampler": {"kind": "global", "v_mps": 10},
+    }
+    m = build_mechanics(MechanicsModel.model_validate(spec), rng_registry=RNGRegistry(0))
+    cfg = TravelTimeServiceMechanicsModel(method="router_eta", **tt)
+    return make_travel_time(cfg, mechanics=m), m
+
+
+def test_router_eta_uses_driver_and_trip_locations():
+    tt, _ = _service(exact=True)
+    d = Driver(id=1, loc=Point(0.0, 0.0))
+    trip = TripState(7, 1, Point(300.0, 400.0), Point(300.0, 1000.0))
+    assert tt.duration_to_pickup(d, trip, 0.0) == pytest.approx(70.0)  # routed, not 50 m straight
+    assert tt.duration_to_dropoff(d, trip, 0.0) == pytest.approx(60.0)
+    assert tt.duration_to_pickup(d, trip, 3_600.0) == pytest.approx(70.0)  # seconds, not a time
+
+
+def test_memo_hits_within_bucket_and_evicts_lru():
+    tt, m = _service(memo_size=2, bucket_s=60.0, quantum_m=10.0)
+    calls = []
+    eta = m.eta_s
+    m.eta_s = lambda *a, **k: calls.append(a) or eta(*a, **k)
+    a, b, c = Point(0.0, 0.0), Point(500.0, 0.0), Point(0.0, 800.0)
+
+    assert tt.router_eta(a, b, 0.0) == pytest.approx(50.0)
+    assert tt.router_eta(Point(2.0, 1.0), b, 59.0) == pytest.approx(50.0)  # same cell + bucket
+    assert (tt.hits, tt.misses) == (1, 1)
+    tt.router_eta(a, b, 60.0)  # next bucket
+    tt.router_eta(a, c, 0.0)  # evicts (a, b, 0)
+    tt.router_eta(a, b, 0.0)
+    assert (tt.hits, tt.misses, len(calls)) == (1, 4, 4)
+
+    exact, _ = _service(exact=True)
+    exact.router_eta(a, b, 0.0)
+    exact.router_eta(a, b, 0.0)
+    assert exact.hits == exact.misses == 0
+
+
+def test_memo_keys_on_graph_nodes():
+    g = NetworkGraph.from_edges([(0.0, 0.0), (100.0, 0.0)], [0, 1], [1, 0])
+    _, m = _service()
+    m.route_planner.G = g  # keys come from the planner's graph when it has one
+    tt = make_travel_time(TravelTimeServiceMechanicsModel(method="router_eta"), mechanics=m)
+    tt.router_eta(Point(3.0, 4.0), Point(90.0, 0.0), 0.0)
+    tt.router_eta(Point(-20.0, 0.0), Point(140.0, 10.0), 0.0)
+    assert (tt.hits, next(iter(tt._memo))) == (1, (0, 1, 0))
@@ -0,0 +1,66 @@
+# tests/app/test_shared_graphs.py
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.runtime.shared import SharedRegistry, attach, attached, detach
+from ab_sim.sim.rng import RNGRegistry
+
+
+def _line(n=50) -> NetworkGraph:
+    xy = np.column_stack([np.arange(n) * 10.0, np.zeros(n)])
+    u = np.r_[np.arange(n - 1), np.arange(1, n)]
+    v = np.r_[np.arange(1, n), np.arange(n - 1)]
+    return NetworkGraph.from_edges(xy, u, v)
+
+
+def _route_len(x: float) -> float:
+    cfg = MechanicsModel.model_validate(
+        {"route_planner": {"kind": "network", "graph": {"by": "name", "name": "city"}}}
+    )
+    m = build_mechanics(cfg, rng_registry=RNGRegistry(0), graphs=attached())
+    return m.distance_m(Point(0.0, 0.0), Point(x, 1.0))
+
+
+def test_attach_is_zero_copy_and_read_only():
+    g = _line()
+    with SharedRegistry() as reg:
+        reg.publish_graph("city", g)
+        reg.publish_tables("skims", {"tt_s": np.arange(6.0).reshape(2, 3)})
+        got = attach(reg.manifest())
+        h, skims = got["city"], got["skims"]
+        np.testing.assert_array_equal(h.indices, g.indices)
+        assert not h.length_m.flags.writeable and not h.length_m.flags.owndata
+        assert "grid_items" in h.extras  # node index shipped with the graph
+        assert h.nearest_node(Point(123.0, 4.0)) == 12
+        assert skims["tt_s"][1, 2] == 5.0
+        with pytest.raises(KeyError):
+            reg.publish_tables("skims", {})
+        del got, h, skims
+        detach()
+        assert attached() == {}
+    assert reg.manifest() == {}
+
+
+def test_registry_unlinks_segments_when_collected():
+    reg = SharedRegistry()
+    name = reg.publish_tables("t", {"a": np.zeros(3)}).arrays["a"].shm
+    del reg
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_pool_workers_resolve_graph_by_name():
+    with SharedRegistry() as reg:
+        reg.publish_graph("city", _line())
+        ctx = mp.get_context("fork")
+        with ProcessPoolExecutor(
+            2, mp_context=ctx, initializer=attach, initargs=(reg.manifest(),)
+        ) as ex:
+            assert list(ex.map(_route_len, [100.0, 250.0])) == [100.0, 250.0]
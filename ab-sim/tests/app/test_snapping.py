@@ -0,0 +1,77 @@
+# tests/app/test_snapping.py
+import numpy as np
+import pytest
+
+from ab_sim.app.controllers.demand import DemandHandler
+from ab_sim.app.controllers.fleet import FleetHandler
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.services.snapping import SnapService
+from ab_sim.sim.rng import RNGRegistry
+
+
+class _Grid:
+    """5x5 lattice, 100 m spacing, horizontal + vertical edges."""
+
+    def __init__(self):
+        ij = np.array([(i, j) for j in range(5) for i in range(5)])
+        self.node_xy = ij * 100.0
+        u, v = [], []
+        for j in range(5):
+            for i in range(5):
+                n = j * 5 + i
+                if i < 4:
+                    u.append(n), v.append(n + 1)
+                if j < 4:
+                    u.append(n), v.append(n + 5)
+        self.edge_u, self.edge_v = np.array(u), np.array(v)
+
+
+def test_grid_index_matches_brute_force():
+    rng = np.random.default_rng(0)
+    xy = rng.random((500, 2)) * 5000
+    q = rng.random((200, 2)) * 7000 - 1000  # includes points outside the bbox
+    s = SnapService(xy, cell_m=300.0)
+    r = s.snap_many(q)
+    d = np.hypot(*(q[:, None, :] - xy[None, :, :]).transpose(2, 0, 1))
+    np.testing.assert_allclose(r.dist_m, d.min(axis=1))
+    np.testing.assert_allclose(r.xy, xy[r.ids])
+
+
+def test_edge_target_projects_onto_nearest_edge():
+    g = _Grid()
+    s = SnapService.from_graph(g, target="edge", cell_m=150.0)
+    r = s.snap_many(np.array([[130.0, 20.0], [250.0, 390.0], [-50.0, 205.0]]))
+    np.testing.assert_allclose(r.xy, [[130.0, 0.0], [250.0, 400.0], [0.0, 205.0]])
+    np.testing.assert_allclose(r.dist_m, [20.0, 10.0, 50.0])
+    # node target snaps to the lattice corner instead
+    q, seg = SnapService.from_graph(g).snap(Point(130.0, 20.0))
+    assert (q.x, q.y) == (100.0, 0.0) and seg.length_m == pytest.approx(np.hypot(30, 20))
+
+
+def test_snap_cache_hits_on_quantized_coordinates():
+    s = SnapService(_Grid().node_xy, cache_quantum_m=5.0, cache_size=2)
+    s.snap(Point(101.0, 99.0))
+    q, _ = s.snap(Point(102.0, 98.0))  # same 5 m bucket
+    assert (q.x, q.y) == (100.0, 100.0) and (s.hits, s.misses) == (1, 1)
+    s.snap(Point(300.0, 300.0))
+    s.snap(Point(0.0, 0.0))  # evicts the oldest entry
+    s.snap(Point(101.0, 99.0))
+    assert s.misses == 4 and len(s._cache) == 2
+    q, seg = s.snap(Point(0.0, 0.0))
+    assert seg is None
+
+
+def test_handlers_snap_through_mechanics():
+    cfg = MechanicsModel.model_validate(
+        {"od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 400.0, 400.0)]}}
+    )
+    m = build_mechanics(cfg, rng_registry=RNGRegistry(1))
+    m.snapper = SnapService.from_graph(_Grid())
+    rng = np.random.default_rng(0)
+    o, d, walk = DemandHandler(world=None, rng=rng, mechanics=m).sample_request(0.0, 0, 0)
+    p = FleetHandler(world=None, rng=rng, mechanics=m).spawn_driver_location()
+    for pt in (o, d, p):
+        assert pt.x % 100 == 0 and pt.y % 100 == 0
+    assert walk is None or walk.end == o
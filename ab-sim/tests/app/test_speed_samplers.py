@@ -0,0 +1,52 @@
+# tests/app/test_speed_samplers.py
+import numpy as np
+import pytest
+
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.domain.mechanics.mechanics_speed_samplers import (
+    DistDrawSpeedSampler,
+    EdgeAwareSpeedSampler,
+)
+from ab_sim.sim.rng import RNGRegistry
+
+
+def test_edge_aware_compiles_to_arrays_and_vector_matches_scalar():
+    s = EdgeAwareSpeedSampler(10.0, tfac={"0:8": 0.5, "6:23": 1.2}, efac={3: 0.8})
+    assert s.tfac.shape == (7, 24) and s.tfac[0, 8] == 0.5 and s.tfac[1, 8] == 1.0
+    assert s.efac.shape == (4,)
+
+    eids = np.array([-1, 0, 3, 99])
+    vec = s.speeds_mps(0.0, eids, dow=0, hour=8)
+    ref = [s.speed_mps(0.0, edge_id=None if e < 0 else int(e), dow=0, hour=8) for e in eids]
+    assert np.allclose(vec, ref)
+    assert np.allclose(vec, [5.0, 5.0, 4.0, 5.0])
+
+
+def test_edge_aware_config_rejects_bad_tfac_keys():
+    with pytest.raises(ValueError):
+        MechanicsModel.model_validate({"speed_sampler": {"kind": "edge_aware", "tfac": {"7:1": 1}}})
+
+
+def test_distribution_sampler_uses_numpy_generator_in_blocks():
+    def draws(block):
+        s = DistDrawSpeedSampler(
+            np.random.default_rng(5), "lognormal", {"mu": 2.0, "sigma": 0.2}, 8.0, block
+        )
+        return [s.speed_mps(0.0) for _ in range(7)] + list(s.speeds_mps(0.0, np.zeros(9, int)))
+
+    a, b = draws(4), draws(4)
+    assert a == b  # same block size -> same sequence
+    assert all(v >= 0.1 for v in a)
+
+    g = DistDrawSpeedSampler(np.random.default_rng(1), "gamma", {"k": 9, "theta": 1.0}, 8.0, 64)
+    assert g.speeds_mps(0.0, np.zeros(500, int)).mean() == pytest.approx(9.0, rel=0.1)
+
+
+def test_distribution_sampler_via_factory():
+    cfg = MechanicsModel.model_validate(
+        {"speed_sampler": {"kind": "distribution", "dist": "gamma", "block_size": 16}}
+    )
+    m = build_mechanics(cfg, rng_registry=RNGRegistry(3))
+    assert m.speed_sampler.block_size == 16
+    assert m.speed_sampler.speed_mps(0.0) > 0.0
@@ -0,0 +1,120 @@
+# tests/app/test_surge_pricing.py
+import numpy as np
+import pytest
+
+from ab_sim.app.build import build
+from ab_sim.app.events import DriverStartShift, TripCompleted
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.state import TripState
+from ab_sim.policy.pricing import ConstantPricingPolicy, SurgePricingPolicy
+from ab_sim.services.zone_counters import ZoneCounters
+from ab_sim.services.zones import ZoneIndex
+
+
+def _counters():
+    zones = ZoneIndex.build([(0.0, 0.0, 1000.0, 1000.0), (1000.0, 0.0, 2000.0, 1000.0)], 100.0)
+    return ZoneCounters(zones)
+
+
+def _trip(x, length_m):
+    t = TripState(rider_id=0, driver_id=0, origin=Point(x, 500.0), dest=Point(x, 900.0))
+    t.route_length_m = length_m
+    return t
+
+
+def test_multipliers_follow_rolling_open_to_idle_ratio():
+    c = _counters()
+    p = SurgePricingPolicy(
+        c, base_fare=2.0, per_km=1.0, interval_s=60.0, window_s=120.0, sensitivity=0.5
+    )
+    c.open[:] = [6, 0]
+    c.idle[:] = [2, 3]
+    p.update(60.0)
+    assert p.multipliers.tolist() == pytest.approx([2.0, 1.0])  # 1 + 0.5 * (3 - 1)
+    c.open[:] = [0, 0]
+    p.update(120.0)  # window: (6 + 0) / (2 + 2)
+    assert p.multipliers[0] == pytest.approx(1.25)
+    p.update(180.0)  # the first sample has left the window
+    assert p.multipliers[0] == pytest.approx(1.0)
+
+    c.open[:] = [40, 0]
+    p.update(240.0)
+    p.update(300.0)
+    assert p.multipliers[0] == p.max_multiplier
+    assert p.fare(None, _trip(500.0, 4000.0), 300.0) == pytest.approx(6.0 * 3.0)
+    assert p.fare(None, _trip(1500.0, 4000.0), 300.0) == pytest.approx(6.0)
+    assert p.fare(None, _trip(5000.0, 4000.0), 300.0) == pytest.approx(6.0)  # no zone
+
+
+def test_fare_uses_the_multiplier_quoted_at_assignment():
+    c = _counters()
+    p = SurgePricingPolicy(c, base_fare=2.0, per_km=1.0, interval_s=60.0, window_s=60.0)
+    trip = _trip(500.0, 4000.0)
+    trip.surge_multiplier = p.quote(trip, 0.0)  # quoted before any surge
+    c.open[:] = [10, 0]
+    c.idle[:] = [1, 1]
+    p.update(60.0)  # surge starts while the trip is under way
+    assert p.quote(trip, 60.0) > 1.0
+    assert p.fare(None, trip, 60.0) == pytest.approx(6.0)
+    assert p.fare(None, trip, 60.0, distance_m=2000.0) == pytest.approx(4.0)
+    with pytest.raises(ValueError):
+        p.fare(None, _trip(500.0, None), 60.0)
+
+
+def test_constant_policy_implements_fare():
+    assert ConstantPricingPolicy(7.5).fare(None, _trip(0.0, 10.0), 0.0) == 7.5
+
+
+def test_surge_run_prices_completed_trips():
+    cfg = {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 3, "duration": 3600},
+        "mechanics": {
+            "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 4_000.0, 4_000.0)]},
+            "zones": {"cell_m": 250.0},
+        },
+        "travel_time": {"kind": "mechanics"},
+        "demand": {"kind": "day_ahead", "hourly_rate": [200.0] * 24},
+        "pricing": {"kind": "surge", "interval_s": 60.0, "max_multiplier": 2.0},
+    }
+    app = build(cfg, use_logging=False)
+    fares = []
+    app.kernel.on(TripCompleted, lambda ev: fares.append(ev.fare) or [])
+    for i in range(5):
+        app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(2_000.0, 2_000.0)))
+    app.kernel.run(until=3600)
+    assert fares and all(f >= 2.5 for f in fares)
+    # 5 drivers for 200 requests/hour: the single zone surges
+    assert np.all(app.trips.pricing.multipliers > 1.0)
+
+
+def test_surge_run_charges_the_assignment_quote_when_surge_moves_mid_trip():
+    cfg = {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 3, "duration": 3600},
+        "mechanics": {
+            "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 4_000.0, 4_000.0)]},
+            "zones": {"cell_m": 250.0},
+        },
+        "travel_time": {"kind": "mechanics"},
+        "demand": {"kind": "day_ahead", "hourly_rate": [200.0] * 24},
+        "pricing": {"kind": "surge", "interval_s": 60.0, "window_s": 60.0, "sensitivity": 2.0},
+    }
+    app = build(cfg, use_logging=False)
+    pricing, checked, moved = app.trips.pricing, [], []
+
+    def on_completed(ev):
+        trip = app.world.trips[ev.rider_id]
+        amount = pricing.base_fare + pricing.per_km * app.trips.fare_distance_m(trip) / 1000.0
+        checked.append(ev.fare == pytest.approx(amount * trip.surge_multiplier))
+        moved.append(pricing.quote(trip, ev.t) != trip.surge_multiplier)
+        return []
+
+    app.kernel.on(TripCompleted, on_completed)
+    for i in range(5):
+        app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(2_000.0, 2_000.0)))
+    app.kernel.run(until=3600)
+    assert checked and all(checked)
+    assert any(moved)  # some riders saw surge change between assignment and drop-off
@@ -0,0 +1,75 @@
+# tests/app/test_td_routing.py
+import numpy as np
+import pytest
+
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.domain.mechanics.mechanics_route_planners import NetworkRoutePlanner
+from ab_sim.domain.mechanics.mechanics_speed_samplers import EdgeAwareSpeedSampler
+from ab_sim.domain.mechanics.mechanics_td_weights import TimeDependentWeights
+from ab_sim.io.graph_format import save_graph
+from ab_sim.sim.clock import HOUR, SimClock
+from ab_sim.sim.rng import RNGRegistry
+
+
+def _bypass() -> NetworkGraph:
+    """0 -> 1 direct surface street (1 km, edge 0) or 0 -> 2 -> 1 freeway (2 x 1 km, edges 1, 2)."""
+    xy = [(0.0, 0.0), (1000.0, 0.0), (500.0, 800.0)]
+    return NetworkGraph.from_edges(xy, [0, 0, 2], [1, 2, 1], [1000.0, 1000.0, 1000.0])
+
+
+def test_arrive_integrates_across_bins_and_is_fifo():
+    w = TimeDependentWeights([100.0], [[1.0, 0.5, 0.5]], bin_s=60.0)
+    # 60 s at full speed covers 60%, the last 40% at half speed takes 80 s
+    assert w.arrive(0, 0.0) == pytest.approx(140.0)
+    t = np.linspace(0, 300, 601)
+    arr = np.array([w.arrive(0, x) for x in t])
+    assert np.all(np.diff(arr) >= -1e-9)
+
+
+def test_routes_by_travel_time_when_time_dependent():
+    g = _bypass()
+    speed = EdgeAwareSpeedSampler(10.0, {}, {0: 0.25, 1: 3.0, 2: 3.0})
+    td = TimeDependentWeights.from_speed_sampler(g, speed)
+    planner = NetworkRoutePlanner(g, td_weights=td)
+    a, b = Point(0.0, 0.0), Point(1000.0, 0.0)
+    assert planner.route(a, b).total_length_m == 1000.0  # static: shortest
+    assert planner.route(a, b, t0=0.0).total_length_m == 2000.0  # timed: freeway
+
+
+def test_rush_hour_profile_switches_route():
+    g = _bypass()
+    base_s = np.array([200.0, 50.0, 50.0])  # per CSR slot: surface, freeway, freeway
+    factor = np.ones((2, 4))
+    factor[1, 2] = 0.2  # freeway crawls in bin 2
+    td = TimeDependentWeights(base_s, factor, group=np.array([0, 1, 1]), bin_s=HOUR)
+    planner = NetworkRoutePlanner(g, td_weights=td)
+    a, b = Point(0.0, 0.0), Point(1000.0, 0.0)
+    assert [s.edge_id for s in planner.route(a, b, t0=0.0).segments] == [1, 2]
+    assert [s.edge_id for s in planner.route(a, b, t0=2 * HOUR).segments] == [0]
+
+
+def test_mechanics_wires_clock_aligned_weights(tmp_path):
+    save_graph(_bypass(), tmp_path / "g")
+    cfg = MechanicsModel.model_validate(
+        {
+            "speed_sampler": {
+                "kind": "edge_aware",
+                "base_mps": 10.0,
+                "tfac": {"2:8": 0.5},
+                "efac": {0: 0.25, 1: 3.0, 2: 3.0},
+            },
+            "route_planner": {
+                "kind": "network",
+                "graph": {"by": "path", "file": str(tmp_path / "g"), "fmt": "npy"},
+                "time_dependent": True,
+            },
+        }
+    )
+    clock = SimClock.utc_epoch(2025, 1, 1, 8)  # a Wednesday, 08:00
+    m = build_mechanics(cfg, rng_registry=RNGRegistry(0), clock=clock)
+    td = m.route_planner.td
+    assert td.bin_at(0.0) == (2 * 24 + 8) * 4
+    assert td.tt_s(0, 0.0) == pytest.approx(1000.0 / (10.0 * 0.25 * 0.5))
+    assert m.route(Point(0.0, 0.0), Point(1000.0, 0.0), t0=0.0).total_length_m == 2000.0
@@ -0,0 +1,101 @@
+# tests/app/test_top_k_matching.py
+import math
+
+import numpy as np
+
+from ab_sim.app.build import build
+from ab_sim.app.events import DriverStartShift, TripAssigned
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.state import Driver, IdleGrid, TripState, WorldState
+from ab_sim.policy.matching import TopKMatchingPolicy
+
+
+def test_idle_grid_nearest_is_exact_and_tracks_removals():
+    rng = np.random.default_rng(0)
+    pts = {i: Point(*(rng.random(2) * 3000 - 1000)) for i in range(80)}
+    g = IdleGrid(cell_m=250.0)
+    for i, p in pts.items():
+        g.add(i, p)
+    for i in range(0, 80, 3):
+        g.discard(i)
+        del pts[i]
+    for q in (Point(0.0, 0.0), Point(5000.0, -4000.0), Point(1234.0, 777.0)):
+        ref = sorted((math.hypot(p.x - q.x, p.y - q.y), i) for i, p in pts.items())
+        assert g.nearest(q, 5) == ref[:5]
+        assert g.nearest(q, 5, max_dist=800.0) == [x for x in ref[:5] if x[0] <= 800.0]
+
+
+class _Manhattan:
+    """duration_to_pickup stand-in: L1 distance at 10 m/s, counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def duration_to_pickup(self, d, trip, now):
+        self.calls += 1
+        return (abs(d.loc.x - trip.origin.x) + abs(d.loc.y - trip.origin.y)) / 10.0
+
+
+def _world(*locs):
+    w = WorldState()
+    for i, (x, y) in enumerate(locs):
+        w.add_driver(Driver(id=i, loc=Point(x, y)))
+    return w
+
+
+def test_top_k_picks_fastest_eta_prunes_on_bound_and_respects_cutoff():
+    # driver 0 is nearest in a straight line, driver 1 is faster on the grid
+    w = _world((300.0, 300.0), (0.0, 450.0), (4000.0, 0.0))
+    tt = _Manhattan()
+    pol = TopKMatchingPolicy(w, tt, k=3, max_eta_s=100.0, vmax_mps=10.0)
+    trip = TripState(rider_id=1, driver_id=-1, origin=Point(0.0, 0.0), dest=Point(0.0, 0.0))
+
+    d = pol.select_driver(trip, 0.0)
+    assert d.id == 1 and 1 not in w.idle_driver_ids and len(w.idle_grid) == 2
+    # driver 2 is beyond max_eta_s x vmax: never a candidate, never routed
+    assert tt.calls == 2
+
+    # driver 0 at 60 s is within the cutoff; a 50 s cutoff leaves the rider queued
+    assert (
+        TopKMatchingPolicy(w, tt, k=3, max_eta_s=50.0, vmax_mps=10.0).select_driver(trip, 0.0)
+        is None
+    )
+    assert pol.select_driver(trip, 0.0).id == 0 and w.idle_driver_ids == {2}
+
+
+def test_top_k_prunes_remaining_candidates_once_bound_exceeds_best():
+    w = _world((10.0, 0.0), (0.0, 500.0), (0.0, -600.0))
+    tt = _Manhattan()
+    pol = TopKMatchingPolicy(w, tt, k=3, max_eta_s=600.0, vmax_mps=10.0)
+    trip = TripState(rider_id=1, driver_id=-1, origin=Point(0.0, 0.0), dest=Point(0.0, 0.0))
+    assert pol.select_driver(trip, 0.0).id == 0
+    assert tt.calls == 1 and pol.pruned == 2
+
+
+def test_top_k_run_only_assigns_within_max_eta():
+    cfg = {
+        "name": "t",
+        "run_id": "t-1",
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 4, "duration": 3600},
+        "mechanics": {
+            "od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 5_000.0, 5_000.0)]},
+            "route_planner": {"kind": "manhattan"},
+            "speed_sampler": {"kind": "global", "v_mps": 10.0},
+        },
+        "demand": {"kind": "day_ahead", "hourly_rate": [120.0] * 24},
+        "travel_time": {"kind": "mechanics"},
+        "matching": {"kind": "top_k", "k": 4, "max_eta_s": 300.0, "vmax_mps": 10.0},
+    }
+    app = build(cfg, use_logging=False)
+    etas = []
+
+    def check(ev):
+        d, trip = app.world.drivers[ev.driver_id], app.world.trips[ev.rider_id]
+        etas.append(app.trips.travel_time.duration_to_pickup(d, trip, ev.t))
+        return []
+
+    app.kernel.on(TripAssigned, check)
+    for i in range(5):
+        app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(1000.0 * i, 0.0)))
+    app.kernel.run(until=3600)
+    assert etas and max(etas) <= 300.0
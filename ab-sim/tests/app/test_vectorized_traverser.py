@@ -0,0 +1,70 @@
+# tests/app/test_vectorized_traverser.py
+import numpy as np
+import pytest
+
+from ab_sim.domain.entities.driver import Driver
+from ab_sim.domain.entities.geography import ArrayPath, Path, Point, Segment
+from ab_sim.domain.mechanics.mechanics_path_traversers import (
+    PiecewiseConstSpeedTraverser,
+    VectorizedSpeedTraverser,
+)
+from ab_sim.domain.mechanics.mechanics_speed_samplers import (
+    EdgeAwareSpeedSampler,
+    GlobalSpeedSampler,
+)
+
+
+def _zigzag_path() -> Path:
+    # mix of short (< step) and long segments, a zero-length hop and a walking leg
+    pts = [Point(0, 0), Point(30, 0), Point(30, 30), Point(30, 30), Point(200, 30), Point(200, 260)]
+    eids = [None, 1, 2, 3, 4]
+    segs = []
+    for i, e in enumerate(eids):
+        a, b = pts[i], pts[i + 1]
+        segs.append(Segment(a, b, float(np.hypot(b.x - a.x, b.y - a.y)), edge_id=e))
+    return Path(segs, sum(s.length_m for s in segs))
+
+
+@pytest.fixture(params=["global", "edge_aware"])
+def speed(request):
+    if request.param == "global":
+        return GlobalSpeedSampler(7.5)
+    return EdgeAwareSpeedSampler(9.0, tfac={"2:8": 0.6}, efac={1: 0.5, 4: 1.3})
+
+
+def test_eta_matches_piecewise(speed):
+    path = _zigzag_path()
+    ref = PiecewiseConstSpeedTraverser().eta_s(path, 12.0, speed, dow=2, hour=8)
+    got = VectorizedSpeedTraverser().eta_s(path, 12.0, speed, dow=2, hour=8)
+    assert got == pytest.approx(ref, rel=1e-12)
+
+
+def test_checkpoints_match_piecewise(speed):
+    path = _zigzag_path()
+    ref = list(PiecewiseConstSpeedTraverser().checkpoints(path, 0.0, speed, step_m=25.0))
+    ts, xy = VectorizedSpeedTraverser().checkpoint_arrays(path, 0.0, speed, step_m=25.0)
+    assert len(ts) == len(ref)
+    assert np.allclose(ts, [t for t, _ in ref])
+    assert np.allclose(xy, [(p.x, p.y) for _, p in ref])
+
+
+def test_plan_breakpoints_match_piecewise(speed):
+    path = _zigzag_path()
+    ref = PiecewiseConstSpeedTraverser().plan(path, 5.0, speed, dow=2, hour=8)
+    plan = VectorizedSpeedTraverser().plan(ArrayPath.from_path(path), 5.0, speed, dow=2, hour=8)
+    assert plan.start_t == ref.start_t and plan.end_t == pytest.approx(ref.end_t)
+    assert np.allclose(plan.t[1:], [m.end_t for m in ref.tasks])
+    for t in np.linspace(0.0, ref.end_t + 10.0, 97):
+        a, b = plan.pos(t), ref.pos(t)
+        assert a.x == pytest.approx(b.x) and a.y == pytest.approx(b.y)
+        assert plan.current_task_index(t) == ref.current_task_index(t)
+
+
+def test_breakpoint_plan_drives_driver():
+    path = Path([Segment(Point(0, 0), Point(1000, 0), 1000.0, edge_id=0)], 1000.0)
+    d = Driver(id=1, loc=Point(0, 0))
+    d.motion = VectorizedSpeedTraverser().plan(path, 0.0, GlobalSpeedSampler(10.0))
+    assert d.pos_at(50.0) == Point(500.0, 0.0)
+    assert d.current_move.end_t == pytest.approx(100.0)
+    d.snap_to_plan_end()
+    assert d.loc == Point(1000.0, 0.0)
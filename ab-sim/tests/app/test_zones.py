@@ -0,0 +1,87 @@
+# tests/app/test_zones.py
+import json
+
+import numpy as np
+
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.entities.geography import Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.services.zones import (
+    MIXED,
+    NONE,
+    ZoneIndex,
+    points_in_polygon,
+    ring_edges,
+    zone_rings,
+)
+from ab_sim.sim.rng import RNGRegistry
+
+STAR = [
+    (500 + 400 * np.cos(a) * r, 500 + 400 * np.sin(a) * r)
+    for a, r in zip(np.linspace(0, 2 * np.pi, 11)[:-1], [1, 0.4] * 5, strict=True)
+]
+DONUT = [
+    [(1000.0, 0.0), (2000.0, 0.0), (2000.0, 1000.0), (1000.0, 1000.0)],
+    [(1300.0, 300.0), (1700.0, 300.0), (1700.0, 700.0), (1300.0, 700.0)],  # hole
+]
+RECT = (0.0, 0.0, 1500.0, 400.0)  # overlaps both; lower ids win
+
+
+def _brute(zones, xy):
+    out = np.full(len(xy), NONE)
+    for k in reversed(range(len(zones))):
+        out[points_in_polygon(xy, ring_edges(zones[k]))] = k
+    return out
+
+
+def test_raster_classification_matches_exact_point_in_polygon():
+    zones = [STAR, DONUT, RECT]
+    idx = ZoneIndex.build(zones, cell_m=25.0)
+    xy = np.random.default_rng(0).uniform(-100, 2100, (20_000, 2))
+    got = idx.classify(xy)
+    assert np.array_equal(got, _brute([zone_rings(z) for z in zones], xy))
+    assert idx.zone_of(Point(1500.0, 500.0)) == NONE  # in the hole
+    assert idx.zone_of(Point(1100.0, 200.0)) == 1  # donut beats the rectangle
+    # most of the area is settled by the raster alone
+    assert (idx.raster == MIXED).mean() < 0.25
+
+
+def test_geojson_and_table_roundtrip(tmp_path):
+    fc = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"name": "downtown"},
+                "geometry": {"type": "Polygon", "coordinates": DONUT},
+            },
+            {
+                "type": "Feature",
+                "properties": {"name": "airport"},
+                "geometry": {
+                    "type": "MultiPolygon",
+                    "coordinates": [
+                        [[(3000, 0), (3500, 0), (3500, 500)]],
+                        [[(4000, 0), (4500, 0), (4500, 500)]],
+                    ],
+                },
+            },
+        ],
+    }
+    (tmp_path / "z.geojson").write_text(json.dumps(fc))
+    idx = ZoneIndex.from_geojson(tmp_path / "z.geojson", 50.0, name_property="name")
+    idx.save(tmp_path / "zones")
+    loaded = ZoneIndex.load(tmp_path / "zones")
+    pts = np.array([[1100.0, 100.0], [1500.0, 500.0], [3400.0, 100.0], [4400.0, 100.0], [3800, 10]])
+    assert loaded.classify(pts).tolist() == [0, NONE, 1, 1, NONE]
+    assert loaded.names == ["downtown", "airport"]
+
+
+def test_mechanics_zones_default_to_od_rectangles():
+    spec = {
+        "od_sampler": {"kind": "idealized", "zones": [(0, 0, 1000, 1000), (1000, 0, 2000, 500)]},
+        "zones": {"cell_m": 50.0},
+    }
+    m = build_mechanics(MechanicsModel.model_validate(spec), rng_registry=RNGRegistry(0))
+    xy = np.array([[10.0, 10.0], [1500.0, 100.0], [1500.0, 900.0]])
+    assert m.zones.classify(xy).tolist() == [0, 1, NONE]
@@ -0,0 +1,106 @@
+# tests/io/test_graph_format.py
+import json
+
+import numpy as np
+import pytest
+
+from ab_sim.config.models import MechanicsModel
+from ab_sim.domain.entities.geography import NetworkGraph, Point
+from ab_sim.domain.mechanics.mechanics_factory import build_mechanics
+from ab_sim.io.graph_format import (
+    HEADER,
+    convert,
+    graph_from_edge_list,
+    graph_from_graphml,
+    load_graph,
+    save_graph,
+)
+from ab_sim.sim.rng import RNGRegistry
+
+
+def _square() -> NetworkGraph:
+    # 0 -(100)- 1
+    # |         |
+    # 3 -(100)- 2 ; plus a long diagonal 0 -> 2
+    xy = [(0.0, 0.0), (100.0, 0.0), (100.0, -100.0), (0.0, -100.0)]
+    u = [0, 1, 1, 2, 2, 3, 3, 0, 0]
+    v = [1, 0, 2, 1, 3, 2, 0, 3, 2]
+    L = [100.0] * 8 + [500.0]
+    return NetworkGraph.from_edges(xy, u, v, L, edge_id=np.arange(10, 19))
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    g = _square()
+    save_graph(g, tmp_path / "g", extras={"landmarks": np.array([0, 2])})
+    h = load_graph(tmp_path / "g")
+    assert isinstance(h.indices, np.memmap) and not h.indices.flags.writeable
+    for k in ("node_xy", "indptr", "indices", "length_m", "edge_id"):
+        np.testing.assert_array_equal(getattr(h, k), getattr(g, k))
+    np.testing.assert_array_equal(h.extras["landmarks"], [0, 2])
+    # shortest path avoids the 500 m diagonal
+    nodes = h.astar(0, 2, lambda a, b: 0.0)
+    assert nodes in ([0, 1, 2], [0, 3, 2])
+    data = [d for _, _, d in h.iter_edges(nodes)]
+    assert sum(d["length_m"] for d in data) == 200.0
+    assert all(10 <= d["edge_id"] < 18 for d in data)
+    assert h.nearest_node(Point(90.0, -5.0)) == 1
+
+
+def test_header_version_is_checked(tmp_path):
+    save_graph(_square(), tmp_path / "g")
+    f = tmp_path / "g" / HEADER
+    header = json.loads(f.read_text())
+    header["version"] = 99
+    f.write_text(json.dumps(header))
+    with pytest.raises(ValueError, match="version"):
+        load_graph(tmp_path / "g")
+
+
+def test_graphml_conversion(tmp_path):
+    src = tmp_path / "g.graphml"
+    src.write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="x" attr.type="double"/>
+  <key id="d1" for="node" attr.name="y" attr.type="double"/>
+  <key id="d2" for="edge" attr.name="length" attr.type="double"/>
+  <graph edgedefault="undirected">
+    <node id="a"><data key="d0">0</data><data key="d1">0</data></node>
+    <node id="b"><data key="d0">30</data><data key="d1">40</data></node>
+    <node id="c"><data key="d0">30</data><data key="d1">0</data></node>
+    <edge source="a" target="b"><data key="d2">70</data></edge>
+    <edge source="b" target="c"/>
+  </graph>
+</graphml>"""
+    )
+    g = graph_from_graphml(src)
+    assert (g.n_nodes, g.n_edges) == (3, 4)
+    assert g.length_m[g.edge_slot(0, 1)] == 70.0 and g.length_m[g.edge_slot(2, 1)] == 40.0
+    h = load_graph(convert(src, tmp_path / "out"))
+    np.testing.assert_array_equal(h.indices, g.indices)
+
+
+def test_edge_list_csv_with_node_table(tmp_path):
+    (tmp_path / "nodes.csv").write_text("node_id,x,y\n70,0,0\n5,10,0\n9,10,10\n")
+    (tmp_path / "edges.csv").write_text("u,v,length_m\n70,5,12\n5,9,\n")
+    g = graph_from_edge_list(tmp_path / "edges.csv", nodes=tmp_path / "nodes.csv")
+    # ids renumbered densely in sorted order: 5->0, 9->1, 70->2
+    np.testing.assert_array_equal(g.node_xy, [[10, 0], [10, 10], [0, 0]])
+    assert g.length_m[g.edge_slot(2, 0)] == 12.0 and g.length_m[g.edge_slot(0, 1)] == 10.0
+    with pytest.raises(ValueError, match="unknown node"):
+        (tmp_path / "bad.csv").write_text("u,v\n70,4\n")
+        graph_from_edge_list(tmp_path / "bad.csv", nodes=tmp_path / "nodes.csv")
+
+
+def test_network_route_planner_loads_npy_graph(tmp_path):
+    save_graph(_square(), tmp_path / "g")
+    cfg = MechanicsModel.model_validate(
+        {
+            "route_planner": {
+                "kind": "network",
+                "graph": {"by": "path", "file": str(tmp_path / "g"), "fmt": "npy"},
+            }
+        }
+    )
+    m = build_mechanics(cfg, rng_registry=RNGRegistry(0))
+    assert m.distance_m(Point(1.0, 1.0), Point(99.0, -99.0)) == 200.0
@@ -0,0 +1,64 @@
+# tests/io/test_preprocess.py
+import numpy as np
+
+from ab_sim.io.graph_format import load_graph
+from ab_sim.io.preprocess import dense_edge_factors, largest_scc, preprocess, preprocess_edges
+
+
+def _two_way(pairs):
+    u = [a for a, b in pairs] + [b for a, b in pairs]
+    v = [b for a, b in pairs] + [a for a, b in pairs]
+    return np.array(u), np.array(v)
+
+
+def test_largest_scc_drops_one_way_spur():
+    # 0 <-> 1 <-> 2 strongly connected; 3 only reachable (2 -> 3)
+    u, v = np.array([0, 1, 1, 2, 2]), np.array([1, 0, 2, 1, 3])
+    np.testing.assert_array_equal(largest_scc(4, u, v), [True, True, True, False])
+
+
+def test_contracts_degree2_chain_with_geometry():
+    # two intersections (0, 4) joined by a bent two-way chain 0-1-2-3-4, plus a
+    # direct residential edge 0-4; node 5 hangs off node 4 one-way (pruned)
+    xy = [(0, 0), (10, 0), (10, 10), (20, 10), (30, 10), (40, 10)]
+    u, v = _two_way([(0, 1), (1, 2), (2, 3), (3, 4), (0, 4)])
+    u, v = np.r_[u, 4], np.r_[v, 5]
+    L = np.r_[np.full(4, 10.0), 50.0, np.full(4, 10.0), 50.0, 10.0]
+    cls = ["primary"] * 4 + ["residential"] + ["primary"] * 4 + ["residential"] + ["primary"]
+    g, rep = preprocess_edges(xy, u, v, L, cls)
+
+    assert (rep.n_nodes_pruned, rep.n_nodes_contracted) == (1, 3)
+    assert (g.n_nodes, g.n_edges) == (2, 4)
+    np.testing.assert_array_equal(g.edge_id, np.arange(4))  # dense, == CSR slot
+    primary = g.meta["road_classes"].index("primary")
+    k = next(s for s in range(4) if g.extras["road_class"][s] == primary and g.edge_u[s] == 0)
+    assert g.length_m[k] == 40.0
+    ptr, gxy = g.extras["geom_indptr"], g.extras["geom_xy"]
+    np.testing.assert_array_equal(gxy[ptr[k] : ptr[k + 1]], [xy[i] for i in range(5)])
+    # each raw row maps onto the edge that absorbed it; the spur is gone
+    r2d = g.extras["raw_to_dense"]
+    assert set(r2d[:4]) == {k} and r2d[-1] == -1
+
+    # harmonic, length-weighted factor preserves the chain's travel time
+    f = np.ones(len(u))
+    f[0] = 0.5  # 0->1 at half speed: 20 s + 3 x 10 s = 50 s over 40 m
+    efac = dense_edge_factors(g, f)
+    assert efac.shape == (g.n_edges,) and np.isclose(efac[k], 40.0 / 50.0)
+
+
+def test_ring_of_degree2_nodes_keeps_an_anchor():
+    xy = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    u, v = _two_way([(0, 1), (1, 2), (2, 3), (3, 0)])
+    g, _ = preprocess_edges(xy, u, v, np.full(8, 10.0))
+    assert g.n_edges == 2 and sorted(g.length_m.tolist()) == [40.0, 40.0]
+
+
+def test_preprocess_writes_graph_format(tmp_path):
+    (tmp_path / "nodes.csv").write_text("node_id,x,y\n10,0,0\n11,100,0\n12,200,0\n")
+    (tmp_path / "edges.csv").write_text(
+        "u,v,length_m,road_class\n10,11,,a\n11,10,,a\n11,12,,a\n12,11,,a\n"
+    )
+    out, rep = preprocess(tmp_path / "edges.csv", tmp_path / "nodes.csv", tmp_path / "g")
+    g = load_graph(out)
+    assert rep.n_nodes_contracted == 1 and g.n_edges == 2
+    assert g.length_m.tolist() == [200.0, 200.0]
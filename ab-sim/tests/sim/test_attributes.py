@@ -0,0 +1,48 @@
+# tests/sim/test_attributes.py
+import numpy as np
+import pytest
+
+from ab_sim.policy.dwell import ExpBoardingAlightingPolicy
+from ab_sim.sim.attributes import AttributeTable, Trait
+from ab_sim.sim.rng import RNGRegistry
+
+TRAITS = [
+    Trait("patience_s", "uniform", (300.0, 900.0)),
+    Trait("walk_mps", "normal", (1.3, 0.2), lo=0.5, hi=2.0),
+]
+
+
+def test_values_depend_on_entity_not_access_order():
+    a = AttributeTable(RNGRegistry(7), "riders", TRAITS, chunk=16)
+    b = AttributeTable(RNGRegistry(7), "riders", TRAITS, chunk=16)
+    ids = [3, 40, 17, 3, 1000]
+    fwd = [a.get("patience_s", i) for i in ids]
+    rev = [b.get("patience_s", i) for i in reversed(ids)][::-1]
+    assert fwd == rev
+    assert fwd[0] == fwd[3]
+    assert b.column("patience_s", ids).tolist() == fwd
+    w = a.column("walk_mps", np.arange(64))
+    assert w.min() >= 0.5 and w.max() <= 2.0
+    assert len(a) == 16 * 5  # chunks 0-3 and 62
+
+
+def test_columns_and_tables_are_independent():
+    reg = RNGRegistry(7)
+    one = AttributeTable(reg, "riders", TRAITS[:1], chunk=16)
+    both = AttributeTable(reg, "riders", TRAITS, chunk=16)
+    other = AttributeTable(reg, "drivers", TRAITS, chunk=16)
+    ids = np.arange(20)
+    assert np.array_equal(one.column("patience_s", ids), both.column("patience_s", ids))
+    assert not np.allclose(both.column("patience_s", ids), other.column("patience_s", ids))
+    with pytest.raises(ValueError):
+        AttributeTable(reg, "x", [TRAITS[0], TRAITS[0]])
+
+
+def test_dwell_times_are_per_rider():
+    p1 = ExpBoardingAlightingPolicy(RNGRegistry(1), block_size=32)
+    p2 = ExpBoardingAlightingPolicy(RNGRegistry(1), block_size=32)
+    seq1 = [p1.boarding_delay(r, 0) for r in range(50)]
+    seq2 = [p2.boarding_delay(r, 99) for r in reversed(range(50))][::-1]
+    assert seq1 == seq2
+    assert all(1.0 <= x <= 60.0 for x in seq1)
+    assert p1.alighting_delay(5, 0) == p2.alighting_delay(5, 1)
@@ -91,3 +91,26 @@ def test_kernel():
         assert False, "expected RuntimeError for past scheduling"
     except RuntimeError:
         pass
+
+
+def test_cancelled_events_never_run_and_are_compacted():
+    k = Kernel()
+    seen: list[str] = []
+    k.on(Timer, lambda ev: seen.append(ev.label))
+    keep, drop = Timer(t=1.0, label="keep"), Timer(t=0.5, label="drop")
+    k.schedule(keep)
+    k.schedule(drop)
+    k.cancel(drop)
+    assert k.pending == 1
+    assert k.run() == 1
+    assert seen == ["keep"]
+
+    # mass cancellation rebuilds the heap instead of keeping dead entries around
+    evs = [Timer(t=2.0 + i, label=str(i)) for i in range(200)]
+    for ev in evs:
+        k.schedule(ev)
+    for ev in evs[:150]:
+        k.cancel(ev)
+    assert k.pending == 50 and len(k._q) < 200
+    k.run()
+    assert seen[1:] == [str(i) for i in range(150, 200)]
@@ -1,7 +1,8 @@
 # tests/sim/test_rng_registry.py
 import numpy as np
+import pytest
 
-from ab_sim.sim.rng import RNGRegistry
+from ab_sim.sim.rng import AliasTable, RNGKey, RNGRegistry
 
 
 def test_named_streams_are_deterministic():
@@ -37,3 +38,56 @@ def test_worker_shards_are_disjoint():
     a = reg0.stream("demand").random(10)
     b = reg1.stream("demand").random(10)
     assert not np.allclose(a, b)
+
+
+def test_buffered_stream_same_block_same_sequence():
+    def draws(block):
+        bs = RNGRegistry(7).buffered("demand", block=block)
+        return [bs.random() for _ in range(5)] + list(bs.take(11)) + [bs.exponential(2.0)]
+
+    assert draws(4) == draws(4)
+    # scalars come straight off the generator's block draws
+    bs = RNGRegistry(7).buffered("demand", block=8)
+    gen_copy = RNGRegistry(7).stream("demand").random(8)
+    assert np.allclose([bs.random() for _ in range(8)], gen_copy)
+
+
+def test_alias_table_matches_weights():
+    w = np.array([0.5, 0.0, 3.0, 1.5])
+    table = AliasTable(w)
+    idx = table.sample_many(np.random.default_rng(0).random(200_000))
+    freq = np.bincount(idx, minlength=4) / idx.size
+    assert np.allclose(freq, w / w.sum(), atol=0.01)
+    assert freq[1] == 0.0
+    assert all(
+        table.sample(u) == i for u, i in zip([0.1, 0.9], table.sample_many([0.1, 0.9]), strict=True)
+    )
+
+
+def test_counter_draws_are_stateless_and_random_access():
+    reg = RNGRegistry(123, scenario="A")
+    key = RNGKey.from_parts("boarding", 17)
+    first = reg.draw(key, 0, 4)
+    reg.draw(key, 5, 100)  # other counters and keys do not move anything
+    reg.draw(RNGKey.from_parts("boarding", 18), 0, 4)
+    assert np.array_equal(reg.draw(key, 0, 4), first)
+    assert np.array_equal(RNGRegistry(123, scenario="A").draw(key, 0, 4), first)
+    assert not np.allclose(reg.draw(key, 1, 4), first)
+    assert not np.allclose(RNGRegistry(123, worker=1).draw(key, 0, 4), first)
+    assert reg.draw("demand", 3, 5, "exponential", 2.0).shape == (5,)
+
+
+def test_substream_cache_is_bounded_but_named_streams_stay():
+    reg = RNGRegistry(123, cache_size=4)
+    demand = reg.stream("demand")
+    for i in range(100):
+        reg.substream("speeds", i)
+    assert len(reg._lru) == 4
+    assert reg.stream("demand") is demand
+    assert reg.substream("speeds", 99) is reg.substream("speeds", 99)
+    # a recently evicted substream restarts from its seed, and says so
+    fresh = RNGRegistry(123).substream("speeds", 94).random(3)
+    with pytest.warns(RuntimeWarning, match="evicted"):
+        again = reg.substream("speeds", 94)
+    assert np.allclose(again.random(3), fresh)
+    assert len(reg._evicted) == 4  # only the last cache_size evictions are remembered
@@ -0,0 +1,95 @@
+# tests/sim/test_variance.py
+import math
+
+import numpy as np
+import pytest
+
+from ab_sim.app.events import DriverStartShift, TripCompleted
+from ab_sim.domain.entities.geography import Point
+from ab_sim.runtime.compare import run_paired
+from ab_sim.sim.rng import RNGKey, RNGRegistry
+from ab_sim.sim.variance import paired_comparison
+
+
+def test_common_random_numbers_ignore_the_scenario():
+    a = RNGRegistry(5, scenario="nearest", common=True).stream("arrivals").random(4)
+    b = RNGRegistry(5, scenario="top_k", common=True).stream("arrivals").random(4)
+    c = RNGRegistry(5, scenario="top_k").stream("arrivals").random(4)
+    assert np.array_equal(a, b)
+    assert not np.allclose(a, c)
+
+
+def test_antithetic_replicas_mirror_continuous_draws():
+    plain, anti = RNGRegistry(5), RNGRegistry(5, antithetic=True)
+    u, u2 = plain.stream("u").random(1000), anti.stream("u").random(1000)
+    assert np.allclose(u + u2, 1.0)
+    z, z2 = plain.stream("z").normal(3.0, 2.0, 1000), anti.stream("z").normal(3.0, 2.0, 1000)
+    assert np.allclose(z + z2, 6.0)
+    e, e2 = plain.stream("e").exponential(4.0, 1000), anti.stream("e").exponential(4.0, 1000)
+    assert np.allclose(np.exp(-e / 4.0) + np.exp(-e2 / 4.0), 1.0)  # survival functions
+    assert np.corrcoef(e, e2)[0, 1] < -0.5
+    assert e2.mean() == pytest.approx(4.0, rel=0.1)
+    # stateless draws and buffered streams are mirrored too; discrete draws are shared
+    key = RNGKey.from_parts("boarding", 3)
+    assert np.allclose(plain.draw(key, 0, 8) + anti.draw(key, 0, 8), 1.0)
+    assert anti.buffered("b", block=4).random() == pytest.approx(1.0 - plain.stream("b").random())
+    assert np.array_equal(plain.stream("p").poisson(3.0, 50), anti.stream("p").poisson(3.0, 50))
+
+
+def test_paired_report_counts_saved_replications():
+    rng = np.random.default_rng(0)
+    common = rng.normal(100.0, 10.0, 40)  # shared noise
+    a = common + rng.normal(0.0, 1.0, 40) + 1.0
+    b = common + rng.normal(0.0, 1.0, 40)
+    r = paired_comparison(a, b)
+    assert r.ci[0] < r.mean_diff < r.ci[1]
+    assert r.reduction > 20
+    assert r.replications_saved == pytest.approx(40 * (r.reduction - 1))
+    assert "pairs" in r.summary()
+
+    anti = paired_comparison(a, b, a_anti=a, b_anti=b)
+    assert anti.runs_per_replication == 2
+    with pytest.raises(ValueError):
+        paired_comparison(a, b, a_anti=a)
+
+
+def _cfg(name, matching):
+    return {
+        "name": name,
+        "run_id": name,
+        "sim": {"epoch": [2025, 1, 1, 0, 0, 0], "seed": 0, "duration": 1800},
+        "mechanics": {"od_sampler": {"kind": "idealized", "zones": [(0.0, 0.0, 4_000.0, 4_000.0)]}},
+        "travel_time": {"kind": "mechanics"},
+        "demand": {"kind": "day_ahead", "hourly_rate": [90.0] * 24},
+        "matching": matching,
+    }
+
+
+def _setup(app):
+    app.completed = 0
+
+    def done(ev):
+        app.completed += 1
+
+    app.kernel.on(TripCompleted, done)
+    for i in range(6):
+        app.kernel.schedule(DriverStartShift(t=0.0, driver_id=i, loc=Point(2_000.0, 2_000.0)))
+
+
+def test_identical_policies_on_common_numbers_differ_by_exactly_zero():
+    same = {"kind": "nearest_assign"}
+    r = run_paired(
+        _cfg("a", same), _cfg("b", same), lambda app: app.completed, [1, 2, 3], setup=_setup
+    )
+    assert r.mean_diff == 0.0 and r.ci == (0.0, 0.0)
+    assert r.var_independent == 0.0 or math.isinf(r.reduction)
+
+    r = run_paired(
+        _cfg("a", same),
+        _cfg("b", {"kind": "top_k", "k": 4}),
+        lambda app: app.completed,
+        [1, 2],
+        antithetic=True,
+        setup=_setup,
+    )
+    assert r.n == 2 and r.runs_per_replication == 2